@@ -0,0 +1,32 @@
+"""Micro-benchmark of the application of new docstrings to a file.
+
+Run with `python benchmarks/bench_apply_diff.py`.
+"""
+
+import timeit
+
+from synthetic import make_module
+
+from docstripy.difference import apply_diff
+from docstripy.file_parser import parse_ranges
+
+
+def main() -> None:
+    """Time apply_diff on synthetic modules of increasing size."""
+    for n_functions in (2_000, 8_000, 20_000):
+        old_lines = make_module(n_functions)
+        ranges, _ = parse_ranges(old_lines)
+        lines = ['    """New docstring."""\n'] * len(ranges)
+        n_runs = 5
+        duration = (
+            timeit.timeit(lambda: apply_diff(ranges, lines, old_lines), number=n_runs)
+            / n_runs
+        )
+        print(
+            f"{len(old_lines):>8} lines, {len(ranges):>6} docstrings: "
+            f"{duration * 1e3:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark of the "lines" and "ast" range engines.
+
+Time the search of the definition/docstring ranges and their matching
+(the stage that differs between the engines) and the whole docstring parsing.
+
+Run with `python benchmarks/bench_engines.py [FILE.py ...]` (synthetic modules
+are used when no file is given).
+"""
+
+import sys
+import timeit
+from typing import Callable, List
+
+from synthetic import make_module
+
+from docstripy.file_parser import parse_ranges, parse_ranges_ast
+from docstripy.parse_doc.main_parser import parse_docstring
+from docstripy.parse_doc.signature import find_range_matching
+
+
+def find_ranges_lines(lines: List[str]) -> None:
+    """Find and match the ranges with the line heuristics."""
+    ranges_docstr, ranges_def = parse_ranges(lines)
+    find_range_matching(ranges_def=ranges_def, ranges_docstr=ranges_docstr, lines=lines)
+
+
+def time_func(func: Callable[[], object], n_runs: int = 5) -> float:
+    """Return the mean duration of a function in seconds."""
+    return timeit.timeit(func, number=n_runs) / n_runs
+
+
+def main() -> None:
+    """Compare the engines on synthetic modules or on the given files."""
+    if len(sys.argv) > 1:
+        sources = {}
+        for path in sys.argv[1:]:
+            with open(path, encoding="utf-8") as file:
+                sources[path] = file.readlines()
+    else:
+        sources = {
+            f"synthetic ({n_functions} functions)": make_module(n_functions)
+            for n_functions in (500, 2_000, 8_000)
+        }
+    for name, lines in sources.items():
+        print(f"{name}: {len(lines)} lines")
+        durations = {
+            "ranges lines": time_func(lambda: find_ranges_lines(lines)),
+            "ranges ast": time_func(lambda: parse_ranges_ast(lines)),
+            "parse lines": time_func(lambda: parse_docstring(lines, engine="lines")),
+            "parse ast": time_func(lambda: parse_docstring(lines, engine="ast")),
+        }
+        for stage, duration in durations.items():
+            print(
+                f"  {stage:<13} {duration * 1e3:9.2f} ms "
+                f"({len(lines) / duration / 1e6:.2f} M lines/s)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Micro-benchmark of the line breaking of docstrings.
+
+Run with `python benchmarks/bench_line_break.py`.
+"""
+
+import random
+import timeit
+from typing import List
+
+from docstripy.line_break import line_break
+
+WORDS = ["lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing"]
+
+
+def make_text(n_bytes: int, *, seed: int = 0) -> List[str]:
+    """Make docstring lines of about n_bytes characters.
+
+    The text is made of paragraphs of 40 lines of random sentences.
+    """
+    rng = random.Random(seed)
+    lines: List[str] = []
+    size = 0
+    while size < n_bytes:
+        if len(lines) % 41 == 40:
+            line = "\n"
+        else:
+            n_words = rng.randint(3, 12)
+            line = " ".join(rng.choice(WORDS) for _ in range(n_words))
+            line = line.capitalize() + rng.choice([".", ",", ""]) + "\n"
+        lines.append(line)
+        size += len(line)
+    return lines
+
+
+def main() -> None:
+    """Time line_break on texts of increasing size."""
+    for n_bytes in (1_000, 10_000, 100_000, 1_000_000):
+        for name, lines in [
+            ("paragraphs", make_text(n_bytes)),
+            ("single line", ["".join(make_text(n_bytes)).replace("\n", " ")]),
+        ]:
+            n_runs = max(1, 100_000 // n_bytes)
+            duration = (
+                timeit.timeit(lambda: line_break(lines, 88), number=n_runs) / n_runs
+            )
+            print(
+                f"{n_bytes:>8} B {name:<12} {duration * 1e3:9.2f} ms "
+                f"({n_bytes / duration / 1e6:.2f} MB/s)"
+            )
+
+
+if __name__ == "__main__":
+    main()
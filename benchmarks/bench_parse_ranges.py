@@ -0,0 +1,26 @@
+"""Micro-benchmark of the docstring and definition ranges scanner.
+
+Run with `python benchmarks/bench_parse_ranges.py`.
+"""
+
+import timeit
+
+from synthetic import make_module
+
+from docstripy.file_parser import parse_ranges
+
+
+def main() -> None:
+    """Time parse_ranges on synthetic modules of increasing size."""
+    for n_functions in (500, 2_000, 8_000):
+        lines = make_module(n_functions)
+        n_runs = 5
+        duration = timeit.timeit(lambda: parse_ranges(lines), number=n_runs) / n_runs
+        print(
+            f"{len(lines):>8} lines: {duration * 1e3:8.2f} ms "
+            f"({len(lines) / duration / 1e6:.2f} M lines/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
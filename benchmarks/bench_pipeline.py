@@ -0,0 +1,183 @@
+"""End-to-end benchmark of docstripy on a synthetic corpus.
+
+A deterministic corpus of python files is generated offline (see
+`synthetic.make_corpus`) and the whole pipeline (reading, parsing, building
+and writing the files) is run on it. The throughput (files/s, docstrings/s,
+MB/s) and the peak memory are reported, optionally as JSON to compare the
+results across versions.
+
+Run with `python benchmarks/bench_pipeline.py [--files 200] [--json out.json]`
+(see `--help` for all the options).
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from typing import Optional
+
+from synthetic import make_corpus
+
+from docstripy.cache import get_version
+from docstripy.memo import DOCSTRING_MEMO
+from docstripy.write import write_files_recursive
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore
+
+
+def get_peak_rss_mb() -> Optional[float]:
+    """Return the peak resident memory of the process and its children in MB."""
+    if resource is None:
+        return None
+    peak_rss = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # Bytes on macOS, kilobytes on Linux
+    return peak_rss / 1e6 if sys.platform == "darwin" else peak_rss / 1e3
+
+
+def parse_args() -> argparse.Namespace:
+    """Command line parser of the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--files", help="Number of files.", type=int, default=200)
+    parser.add_argument(
+        "--functions", help="Number of functions per file.", type=int, default=50
+    )
+    parser.add_argument(
+        "--params",
+        help="Mean number of parameters per function.",
+        type=int,
+        default=3,
+    )
+    parser.add_argument(
+        "--input_styles",
+        help="Comma separated styles of the docstrings of the corpus.",
+        type=str,
+        default="numpy,google,rest",
+    )
+    parser.add_argument(
+        "--line_length",
+        help="Length of the text lines of the docstrings of the corpus.",
+        type=int,
+        default=88,
+    )
+    parser.add_argument("--seed", help="Seed of the corpus.", type=int, default=0)
+    parser.add_argument(
+        "-s", "--style", help="Output style(s).", type=str, default="numpy"
+    )
+    parser.add_argument(
+        "-l", "--length", help="Maximum line length.", type=int, default=88
+    )
+    parser.add_argument(
+        "-j", "--jobs", help="Number of processes.", type=int, default=1
+    )
+    parser.add_argument(
+        "--engine", help="Engine ('lines' or 'ast').", type=str, default="lines"
+    )
+    parser.add_argument(
+        "--repeat",
+        help="Number of runs (the fastest one is reported).",
+        type=int,
+        default=3,
+    )
+    parser.add_argument(
+        "--json",
+        help="Path of the JSON results ('-' for the standard output).",
+        type=str,
+        default="",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Generate the corpus, run docstripy on it and report the results."""
+    args = parse_args()
+    docstr_config = {
+        "style": args.style,
+        "max_len": args.length,
+        "indent": 4,
+        "add_missing": True,
+        "include_type": True,
+        "engine": args.engine,
+    }
+    tmp_dir = tempfile.mkdtemp(prefix="docstripy_bench_")
+    try:
+        corpus_dir = os.path.join(tmp_dir, "corpus")
+        out_dir = os.path.join(tmp_dir, "out", "{style}" if "," in args.style else "")
+        corpus = make_corpus(
+            corpus_dir,
+            n_files=args.files,
+            n_functions=args.functions,
+            n_params=args.params,
+            styles=args.input_styles.split(","),
+            line_length=args.line_length,
+            seed=args.seed,
+        )
+        durations = []
+        for _ in range(args.repeat):
+            # Each run starts without cached docstrings nor output files
+            DOCSTRING_MEMO.clear()
+            shutil.rmtree(os.path.join(tmp_dir, "out"), ignore_errors=True)
+            start = time.perf_counter()
+            write_files_recursive(
+                corpus_dir,
+                out_dir,
+                overwrite=False,
+                docstr_config=docstr_config,
+                jobs=args.jobs,
+            )
+            durations.append(time.perf_counter() - start)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    duration = min(durations)
+    results = {
+        "version": get_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": {
+            "files": args.files,
+            "functions": args.functions,
+            "params": args.params,
+            "input_styles": args.input_styles,
+            "line_length": args.line_length,
+            "seed": args.seed,
+            "docstrings": corpus["n_docstrings"],
+            "bytes": corpus["n_bytes"],
+        },
+        "config": {**docstr_config, "jobs": args.jobs},
+        "duration_s": duration,
+        "durations_s": durations,
+        "files_per_s": corpus["n_files"] / duration,
+        "docstrings_per_s": corpus["n_docstrings"] / duration,
+        "mb_per_s": corpus["n_bytes"] / 1e6 / duration,
+        "peak_rss_mb": get_peak_rss_mb(),
+    }
+    if args.json == "-":
+        print(json.dumps(results, indent=2))
+        return
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    print(
+        f"{args.files} files, {corpus['n_docstrings']} docstrings, "
+        f"{corpus['n_bytes'] / 1e6:.2f} MB in {duration:.2f} s "
+        f"(best of {args.repeat})"
+    )
+    print(
+        f"  {results['files_per_s']:.1f} files/s, "
+        f"{results['docstrings_per_s']:.0f} docstrings/s, "
+        f"{results['mb_per_s']:.2f} MB/s, "
+        f"peak RSS {results['peak_rss_mb'] or float('nan'):.0f} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
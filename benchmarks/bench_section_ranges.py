@@ -0,0 +1,43 @@
+"""Micro-benchmark of the section detection of docstrings.
+
+Run with `python benchmarks/bench_section_ranges.py [FILE.py ...]`
+(a synthetic module is used when no file is given).
+"""
+
+import sys
+import timeit
+
+from synthetic import make_module
+
+from docstripy.file_parser import parse_ranges
+from docstripy.parse_doc.section_ranges import parse_sections_ranges
+
+
+def main() -> None:
+    """Time parse_sections_ranges on all the docstrings of the files."""
+    if len(sys.argv) > 1:
+        lines = []
+        for path in sys.argv[1:]:
+            with open(path, encoding="utf-8") as file:
+                lines += file.readlines()
+    else:
+        lines = make_module(2_000)
+    ranges_docstr, _ = parse_ranges(lines)
+    docstrings = [lines[start:end] for start, end in ranges_docstr]
+    n_lines = sum(len(docstring) for docstring in docstrings)
+    n_runs = 5
+    duration = (
+        timeit.timeit(
+            lambda: [parse_sections_ranges(docstring) for docstring in docstrings],
+            number=n_runs,
+        )
+        / n_runs
+    )
+    print(
+        f"{len(docstrings)} docstrings ({n_lines} lines): {duration * 1e3:.2f} ms "
+        f"({len(docstrings) / duration:.0f} docstrings/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
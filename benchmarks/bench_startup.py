@@ -0,0 +1,50 @@
+"""Benchmark of the import time of the command line interface.
+
+Run with `python benchmarks/bench_startup.py [N_RUNS]` (5 runs by default).
+The import time is measured with `python -X importtime` and excludes the
+imports of the interpreter startup.
+"""
+
+import subprocess
+import sys
+
+
+def get_top_imports(args: list) -> dict:
+    """Return the cumulative import time of the top-level imports in us."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        check=False,
+    ).stderr
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  "):  # Top-level import
+            imports[name.strip()] = int(cumulative)
+    return imports
+
+
+def main() -> None:
+    """Print the best import time of `docstripy --help` over several runs."""
+    n_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    import_times = []
+    for _ in range(n_runs):
+        startup_imports = get_top_imports(["-c", "pass"])
+        imports = get_top_imports(["-m", "docstripy.main", "--help"])
+        import_times.append(
+            sum(
+                cumulative
+                for name, cumulative in imports.items()
+                if name not in startup_imports
+            )
+        )
+    print(
+        f"Import time of the command line interface: {min(import_times) / 1e3:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
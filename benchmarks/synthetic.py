@@ -0,0 +1,216 @@
+"""Generation of synthetic python sources for the benchmarks."""
+
+import os
+import random
+from typing import Dict, List, Optional, Tuple
+
+
+def make_function(name: str, n_params: int, rng: random.Random) -> List[str]:
+    """Make the lines of a documented function with some code."""
+    params = [f"param{i}: int = {i}" for i in range(n_params)]
+    lines = [f"def {name}(\n"]
+    lines += [f"    {param},\n" for param in params]
+    lines += [") -> int:\n"]
+    lines += ['    """Compute something.\n', "\n"]
+    lines += ["    Parameters\n", "    ----------\n"]
+    for i in range(n_params):
+        lines += [f"    param{i} : int\n", f"        Parameter number {i}.\n"]
+    lines += ['    """\n']
+    lines += [f"    result = {rng.randint(0, 100)}  # Some comment\n"]
+    lines += [f"    result += param{i}\n" for i in range(n_params)]
+    lines += ["    return result\n", "\n", "\n"]
+    return lines
+
+
+def make_module(n_functions: int, n_params: int = 3, seed: int = 0) -> List[str]:
+    """Make the lines of a module containing many documented functions."""
+    rng = random.Random(seed)
+    lines = ['"""Synthetic module."""\n', "\n"]
+    for i in range(n_functions):
+        lines += make_function(f"function_{i}", n_params, rng)
+    return lines
+
+
+WORDS = [
+    "compute",
+    "the",
+    "value",
+    "of",
+    "a",
+    "tensor",
+    "given",
+    "input",
+    "model",
+    "layer",
+    "with",
+    "optional",
+    "batch",
+    "size",
+    "weights",
+    "returned",
+    "by",
+    "function",
+    "when",
+    "parameter",
+]
+TYPES = [
+    "int",
+    "str",
+    "float",
+    "bool",
+    "List[int]",
+    "Dict[str, float]",
+    "Tuple[int, int]",
+]
+DEFAULTS = {"int": "0", "str": '"a, b"', "float": "1.0", "bool": "False"}
+
+
+def make_sentence(rng: random.Random, n_words: int) -> str:
+    """Make a random sentence."""
+    words = [rng.choice(WORDS) for _ in range(n_words)]
+    return " ".join(words).capitalize() + "."
+
+
+def make_text(
+    rng: random.Random,
+    n_chars: int,
+    line_length: int,
+    indent: str,
+) -> List[str]:
+    """Make random text lines of about n_chars characters."""
+    words = make_sentence(rng, max(1, n_chars // 6)).split()
+    lines, line = [], indent
+    for word in words:
+        if len(line) + len(word) + 1 > line_length and line.strip():
+            lines.append(line.rstrip() + "\n")
+            line = indent
+        line += word + " "
+    lines.append(line.rstrip() + "\n")
+    return lines
+
+
+def make_docstring(
+    style: str,
+    params: List[Tuple[str, str]],
+    rng: random.Random,
+    line_length: int,
+) -> List[str]:
+    """Make the lines of a function docstring in the given style."""
+    indent = "    "
+    lines = ['    """' + make_sentence(rng, rng.randint(3, 8)) + "\n", "\n"]
+    lines += make_text(rng, rng.randint(20, 3 * line_length), line_length, indent)
+    lines.append("\n")
+    if style == "numpy":
+        lines += [indent + "Parameters\n", indent + "----------\n"]
+        for name, type_ in params:
+            lines.append(f"{indent}{name} : {type_}\n")
+            lines += make_text(rng, rng.randint(10, 150), line_length, 2 * indent)
+        lines += ["\n", indent + "Returns\n", indent + "-------\n", indent + "int\n"]
+        lines += make_text(rng, rng.randint(10, 80), line_length, 2 * indent)
+    elif style == "google":
+        lines.append(indent + "Args:\n")
+        for name, type_ in params:
+            text = make_text(rng, rng.randint(10, 150), line_length, 3 * indent)
+            lines.append(f"{2 * indent}{name} ({type_}): {text[0].lstrip()}")
+            lines += text[1:]
+        lines += ["\n", indent + "Returns:\n"]
+        text = make_text(rng, rng.randint(10, 80), line_length, 3 * indent)
+        lines.append(f"{2 * indent}int: {text[0].lstrip()}")
+        lines += text[1:]
+    else:
+        for name, type_ in params:
+            text = make_text(rng, rng.randint(10, 150), line_length, 2 * indent)
+            lines.append(f"{indent}:param {name}: {text[0].lstrip()}")
+            lines += text[1:]
+            lines.append(f"{indent}:type {name}: {type_}\n")
+        text = make_text(rng, rng.randint(10, 80), line_length, 2 * indent)
+        lines.append(f"{indent}:return: {text[0].lstrip()}")
+        lines += text[1:]
+        lines.append(f"{indent}:rtype: int\n")
+    lines.append('    """\n')
+    return lines
+
+
+def make_corpus_module(
+    n_functions: int,
+    n_params: int,
+    styles: List[str],
+    line_length: int,
+    rng: random.Random,
+) -> Tuple[List[str], int]:
+    """Make the lines of a module and its number of functions with docstrings.
+
+    The functions have from 0 to 2 * n_params parameters, docstrings in a
+    random style among the given styles and text lines of about line_length
+    characters. About one function out of ten has no docstring.
+    """
+    lines = [
+        '"""Synthetic module."""\n',
+        "\n",
+        "from typing import Dict, List, Tuple\n",
+    ]
+    n_docstrings = 0
+    for i_func in range(n_functions):
+        params = []  # (name, type, default)
+        for i_param in range(rng.randint(0, 2 * n_params)):
+            type_ = rng.choice(TYPES)
+            default = DEFAULTS.get(type_, "") if rng.random() < 0.5 else ""
+            params.append((f"param{i_param}", type_, default))
+        # Parameters with a default value at the end
+        params.sort(key=lambda param: param[2] != "")
+        signature_params = [
+            f"{name}: {type_} = {default}" if default else f"{name}: {type_}"
+            for name, type_, default in params
+        ]
+        lines += ["\n", "\n", f"def function_{i_func}(\n"]
+        lines += [f"    {param},\n" for param in signature_params]
+        lines.append(") -> int:\n")
+        if rng.random() < 0.9:
+            lines += make_docstring(
+                rng.choice(styles),
+                [(name, type_) for name, type_, _ in params],
+                rng,
+                line_length,
+            )
+        n_docstrings += 1  # Missing docstrings are added
+        lines += [f"    result = {rng.randint(0, 100)}  # Some comment\n"]
+        lines.append("    return result\n")
+    return lines, n_docstrings
+
+
+def make_corpus(
+    dir_path: str,
+    *,
+    n_files: int,
+    n_functions: int,
+    n_params: int = 3,
+    styles: Optional[List[str]] = None,
+    line_length: int = 88,
+    seed: int = 0,
+) -> Dict[str, int]:
+    """Write a deterministic corpus of python files in a directory.
+
+    The files are spread over sub-directories of 50 files.
+
+    Returns
+    -------
+    stats : Dict[str, int]
+        Number of files, docstrings and bytes of the corpus.
+    """
+    rng = random.Random(seed)
+    styles = styles or ["numpy", "google", "rest"]
+    stats = {"n_files": n_files, "n_docstrings": 0, "n_bytes": 0}
+    for i_file in range(n_files):
+        lines, n_docstrings = make_corpus_module(
+            n_functions, n_params, styles, line_length, rng
+        )
+        sub_dir = os.path.join(dir_path, f"package_{i_file // 50}")
+        os.makedirs(sub_dir, exist_ok=True)
+        content = "".join(lines)
+        with open(
+            os.path.join(sub_dir, f"module_{i_file}.py"), "w", encoding="utf-8"
+        ) as file:
+            file.write(content)
+        stats["n_docstrings"] += n_docstrings
+        stats["n_bytes"] += len(content.encode("utf-8"))
+    return stats
@@ -4,3 +4,16 @@
 Support Nympydoc, Google and ReStructuredText as output styles.
 The input style should be either Numpy, Google, ReST or even a mix of both.
 """
+
+from typing import Any
+
+__all__ = ["Config", "format_many", "format_source"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the library API when used (keeps the startup of the CLI fast)."""
+    if name in __all__:
+        from docstripy import api
+
+        return getattr(api, name)
+    raise AttributeError(f"module 'docstripy' has no attribute {name!r}")
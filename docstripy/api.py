@@ -0,0 +1,155 @@
+"""Library API to format python sources in memory."""
+
+import io
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Iterable, List, Optional, Tuple
+
+from docstripy.build_doc.main_builder import BUILD_FUNCS
+from docstripy.write import generate_new_files, make_line_ranges, map_jobs
+
+ENGINES = ("lines", "ast")
+
+
+@dataclass(frozen=True)
+class Config:
+    """Docstring configuration.
+
+    The configuration is immutable and hashable, so it can be created once
+    and reused for many calls of :func:`format_source`.
+
+    Parameters
+    ----------
+    style : str, optional
+        Style of the docstrings, one of "numpy", "google" or "rest".
+        By default, "numpy".
+    max_len : int, optional
+        Maximum length of the docstring lines (-1 for no limit).
+        By default, -1.
+    indent : int, optional
+        Base indentation size. By default, 4.
+    add_missing : bool, optional
+        Whether to add the missing docstrings. By default, True.
+    include_type : bool, optional
+        Whether to indicate the types of the parameters. By default, True.
+    engine : str, optional
+        Engine used to find the definitions and the docstrings, either "lines"
+        (line heuristics) or "ast" (abstract syntax tree, the code must be
+        valid python). By default, "lines".
+
+    Raises
+    ------
+    ValueError
+        If the style or the engine is unknown.
+    """
+
+    style: str = "numpy"
+    max_len: int = -1
+    indent: int = 4
+    add_missing: bool = True
+    include_type: bool = True
+    engine: str = "lines"
+    # Configurations passed to the parsing and building functions (computed once)
+    docstr_configs: List[dict] = field(
+        init=False, repr=False, compare=False, hash=False
+    )
+
+    def __post_init__(self) -> None:
+        """Check the options and precompute the docstring configurations."""
+        if self.style not in BUILD_FUNCS:
+            raise ValueError(
+                f"Unknown style: {self.style} (expected one of "
+                f"{', '.join(repr(style) for style in BUILD_FUNCS)})."
+            )
+        if self.engine not in ENGINES:
+            raise ValueError(
+                f"Unknown engine: {self.engine} (expected 'lines' or 'ast')."
+            )
+        object.__setattr__(self, "docstr_configs", [self.to_dict()])
+
+    def to_dict(self) -> dict:
+        """Return the docstring configuration used by :mod:`docstripy.write`."""
+        return {
+            "style": self.style,
+            "max_len": self.max_len,
+            "indent": self.indent,
+            "add_missing": self.add_missing,
+            "include_type": self.include_type,
+            "engine": self.engine,
+        }
+
+    @classmethod
+    def from_dict(cls, docstr_config: dict) -> "Config":
+        """Create a configuration from a docstring configuration dictionary."""
+        return cls(**docstr_config)
+
+
+DEFAULT_CONFIG = Config()
+
+
+def format_source(
+    text: str,
+    config: Config = DEFAULT_CONFIG,
+    *,
+    lines: Optional[Iterable[Tuple[int, int]]] = None,
+) -> str:
+    """Format the docstrings of a python source.
+
+    Parameters
+    ----------
+    text : str
+        Python source code.
+    config : Config, optional
+        Docstring configuration. By default, the default configuration.
+    lines : Iterable[Tuple[int, int]] or None, optional
+        If not None, only the docstrings whose definition or docstring
+        overlaps one of these ranges of lines (1-indexed, end included) are
+        formatted, e.g. ``[(10, 12)]`` for the lines 10 to 12. The other
+        docstrings are neither parsed nor built. By default, None.
+
+    Returns
+    -------
+    new_text : str
+        Source code with the new docstrings.
+
+    Raises
+    ------
+    ValueError
+        If the source could not be parsed or a range of lines is invalid.
+    """
+    line_ranges = None if lines is None else make_line_ranges(lines)
+    file_lines = io.StringIO(text).readlines()
+    return "".join(
+        generate_new_files(file_lines, config.docstr_configs, line_ranges)[0]
+    )
+
+
+def format_many(
+    texts: Iterable[str],
+    config: Config = DEFAULT_CONFIG,
+    *,
+    jobs: int = 1,
+) -> List[str]:
+    """Format the docstrings of several python sources.
+
+    Parameters
+    ----------
+    texts : Iterable[str]
+        Python source codes.
+    config : Config, optional
+        Docstring configuration. By default, the default configuration.
+    jobs : int, optional
+        Number of worker processes. If 1, the sources are processed in the
+        current process. By default, 1.
+
+    Returns
+    -------
+    new_texts : List[str]
+        Source codes with the new docstrings, in the order of the inputs.
+
+    Raises
+    ------
+    ValueError
+        If a source could not be parsed.
+    """
+    return map_jobs(partial(format_source, config=config), list(texts), jobs=jobs)
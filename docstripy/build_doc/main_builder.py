@@ -1,12 +1,26 @@
 """Global docstring building functions."""
 
-from typing import List
+import importlib
+from functools import lru_cache
+from typing import Callable, List
 
 from docstripy.build_doc.preprocessing import preprocess_title_build
-from docstripy.google.build_doc import build_doc_google
 from docstripy.line_break import line_break
-from docstripy.numpy.build_doc import build_doc_numpy
-from docstripy.rest.build_doc import build_doc_rest
+
+# Module and function building the docstrings of each style (imported when
+# the style is used)
+BUILD_FUNCS = {
+    "numpy": ("docstripy.numpy.build_doc", "build_doc_numpy"),
+    "google": ("docstripy.google.build_doc", "build_doc_google"),
+    "rest": ("docstripy.rest.build_doc", "build_doc_rest"),
+}
+
+
+@lru_cache(maxsize=None)
+def get_build_func(style: str) -> Callable[..., List[str]]:
+    """Return the function building the docstrings of a style."""
+    module_name, func_name = BUILD_FUNCS[style]
+    return getattr(importlib.import_module(module_name), func_name)
 
 
 def build_docstring(
@@ -18,11 +32,6 @@ def build_docstring(
     style = docstr_config["style"]
     max_len = docstr_config["max_len"]
     indent = docstr_config["indent"]
-    build_fn = {
-        "numpy": build_doc_numpy,
-        "google": build_doc_google,
-        "rest": build_doc_rest,
-    }
     sections["_title"] = preprocess_title_build(
         sections["_title"],
         max_len=max_len - indent_base,
@@ -35,7 +44,7 @@ def build_docstring(
         if len(docstring) == 1:  # already one-line docstring after break
             docstring[0] = docstring[0][:-1] + '"""\n'
             return docstring
-    docstring = build_fn[style](
+    docstring = get_build_func(style)(
         current_docstring=docstring,
         sections_dict=sections,
         max_len=max_len - indent_base,
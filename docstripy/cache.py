@@ -0,0 +1,238 @@
+"""On-disk caches of the files and docstrings already processed by docstripy."""
+
+import hashlib
+import json
+import os
+import os.path as osp
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+
+def get_version() -> str:
+    """Return the installed version of docstripy."""
+    # Imported here as the caches are optional (slow import)
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("docstripy")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+@lru_cache(maxsize=None)
+def get_code_version() -> str:
+    """Return the installed version of docstripy and a hash of its sources.
+
+    The hash invalidates the caches when the code changes without a new
+    version (e.g. in a source checkout, where the version is "unknown").
+    """
+    package_dir = osp.dirname(osp.abspath(__file__))
+    code_hash = hashlib.blake2b(digest_size=16)
+    for dir_path, dir_names, file_names in os.walk(package_dir):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            if file_name.endswith(".py"):
+                path = osp.join(dir_path, file_name)
+                code_hash.update(osp.relpath(path, package_dir).encode("utf-8"))
+                with open(path, "rb") as file:
+                    code_hash.update(file.read())
+    return f"{get_version()}+{code_hash.hexdigest()}"
+
+
+def hash_config(docstr_config: dict) -> str:
+    """Hash the docstring configuration and the docstripy code version."""
+    config_str = json.dumps(docstr_config, sort_keys=True) + get_code_version()
+    return hashlib.blake2b(config_str.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def hash_file(path: str) -> str:
+    """Hash the content of a file."""
+    with open(path, "rb") as file:
+        return hashlib.blake2b(file.read(), digest_size=16).hexdigest()
+
+
+class FileCache:
+    """Cache of the files that docstripy leaves unchanged (fixed points).
+
+    A file is a cache hit when its size and modification time (or its content
+    hash if the modification time changed), the docstring configuration, the
+    stream mode and the docstripy code are the same as the last time it was
+    found unchanged.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory where the cache is stored.
+    docstr_config : dict
+        Docstring configuration of the run.
+    stream : bool, optional
+        Whether the .py files are processed by blocks, which can give another
+        output. By default, False.
+
+    Attributes
+    ----------
+    hits : int
+        Number of files found in the cache.
+    misses : int
+        Number of files not found in the cache.
+    """
+
+    file_name = "files.json"
+
+    def __init__(
+        self, cache_dir: str, docstr_config: dict, *, stream: bool = False
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.config_hash = hash_config({**docstr_config, "stream": stream})
+        self.entries: Dict[str, dict] = {}
+        self.hits = 0
+        self.misses = 0
+        cache_path = osp.join(cache_dir, self.file_name)
+        if osp.isfile(cache_path):
+            try:
+                with open(cache_path, encoding="utf-8") as file:
+                    self.entries = json.load(file)
+            except (OSError, ValueError):
+                self.entries = {}  # Corrupted cache: start from scratch
+
+    def is_unchanged(self, path: str) -> bool:
+        """Return whether the file is known to be left unchanged by docstripy."""
+        entry = self.entries.get(osp.abspath(path))
+        is_hit = False
+        if entry is not None and entry["config"] == self.config_hash:
+            stat = os.stat(path)
+            if stat.st_size == entry["size"]:
+                if stat.st_mtime_ns == entry["mtime"]:
+                    is_hit = True
+                elif hash_file(path) == entry["hash"]:
+                    # File touched but not modified
+                    entry["mtime"] = stat.st_mtime_ns
+                    is_hit = True
+        if is_hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return is_hit
+
+    def add_unchanged(self, path: str) -> None:
+        """Record a file that docstripy left unchanged."""
+        stat = os.stat(path)
+        self.entries[osp.abspath(path)] = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "hash": hash_file(path),
+            "config": self.config_hash,
+        }
+
+    def save(self) -> None:
+        """Save the cache on disk."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cache_path = osp.join(self.cache_dir, self.file_name)
+        tmp_path = cache_path + f".{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self.entries, file)
+        os.replace(tmp_path, cache_path)
+
+
+class SectionStore:
+    """On-disk store of the parsed sections of the docstrings.
+
+    The sections parsed from a docstring and its definition do not depend on
+    the docstring configuration, so they are reused by the runs with another
+    style or line length that only need to build the docstrings again.
+    The sections are stored as compact JSON in a SQLite database and are
+    addressed by a hash of the docstring and definition lines (and of the
+    docstripy version).
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory where the store is saved.
+
+    Attributes
+    ----------
+    hits : int
+        Number of docstrings found in the store.
+    misses : int
+        Number of docstrings not found in the store.
+    """
+
+    file_name = "sections.sqlite3"
+
+    def __init__(self, cache_dir: str) -> None:
+        # Imported here as the store is optional (slow import)
+        import sqlite3
+
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        # Several worker processes can use the store at the same time
+        self.connection = sqlite3.connect(
+            osp.join(cache_dir, self.file_name), timeout=60
+        )
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS sections (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self.connection.commit()
+        self.version = get_code_version()
+        self.pending: List[Tuple[str, str]] = []
+        self.hits = 0
+        self.misses = 0
+
+    def get_key(self, lines_docstr: List[str], lines_def: Optional[List[str]]) -> str:
+        """Hash the lines of a docstring and of its definition."""
+        content = json.dumps([self.version, lines_docstr, lines_def])
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, dict]:
+        """Return the stored sections of the keys found in the store."""
+        found: Dict[str, dict] = {}
+        # Stay below the maximum number of variables of a query
+        for ind in range(0, len(keys), 500):
+            chunk = keys[ind : ind + 500]
+            rows = self.connection.execute(
+                "SELECT key, value FROM sections "
+                f"WHERE key IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            for key, value in rows:
+                found[key] = json.loads(value)
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put(self, key: str, sections: dict) -> None:
+        """Add parsed sections to the store (written on disk by `flush`)."""
+        self.pending.append((key, json.dumps(sections, separators=(",", ":"))))
+
+    def flush(self) -> None:
+        """Write the sections added since the last flush on disk."""
+        if self.pending:
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO sections VALUES (?, ?)", self.pending
+                )
+            self.pending = []
+
+    def close(self) -> None:
+        """Flush the pending sections and close the store."""
+        self.flush()
+        self.connection.close()
+
+
+# Section store of the current process (None if disabled)
+SECTION_STORE: Optional[SectionStore] = None
+
+
+def set_section_store(cache_dir: str) -> None:
+    """Open the section store of the current process ("" to disable it)."""
+    global SECTION_STORE
+    SECTION_STORE = SectionStore(cache_dir) if cache_dir else None
+
+
+def close_section_store() -> None:
+    """Close the section store of the current process (if any)."""
+    global SECTION_STORE
+    if SECTION_STORE is not None:
+        SECTION_STORE.close()
+        SECTION_STORE = None
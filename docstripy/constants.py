@@ -0,0 +1,12 @@
+"""Constants of the optional modes imported by the command line parser.
+
+This module has no import so that the parser can use the constants without
+loading the modules of the optional modes (see `docstripy.daemon`).
+"""
+
+# Address of the formatting daemon
+DEFAULT_HOST = "localhost"
+DEFAULT_PORT = 45484
+# Environment variable of the daemon URL used by the client
+DAEMON_URL_ENV = "DOCSTRIPY_DAEMON_URL"
+DEFAULT_URL = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}"
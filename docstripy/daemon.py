@@ -0,0 +1,234 @@
+"""Formatting daemon keeping docstripy loaded between invocations.
+
+The daemon listens on localhost over HTTP. Each POST request contains a
+python source in its body and the docstring configuration in its headers
+(see `CONFIG_HEADERS`). The response contains the formatted source (status
+200), nothing if the source is unchanged (status 204) or the error message
+(status 400 for an invalid configuration, 500 if the source could not be
+parsed). The caches of the built docstrings stay warm between the requests.
+"""
+
+import argparse
+import os
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Dict, List, Optional
+
+from docstripy.api import Config, format_source
+from docstripy.constants import (
+    DAEMON_URL_ENV,
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    DEFAULT_URL,
+)
+from docstripy.memo import DEFAULT_MEMO_SIZE, set_memo_size
+from docstripy.write import (
+    get_style_paths,
+    split_styles,
+    write_file_atomic,
+    write_file_if_different,
+)
+
+# Timeout of the client requests in seconds
+DAEMON_TIMEOUT = 60
+# Header of each configuration option
+CONFIG_HEADERS = {
+    "style": "X-Style",
+    "max_len": "X-Max-Len",
+    "indent": "X-Indent",
+    "add_missing": "X-Add-Missing",
+    "include_type": "X-Include-Type",
+    "engine": "X-Engine",
+}
+
+
+def parse_config_headers(headers: Dict[str, str]) -> Config:
+    """Create the configuration of a request from its headers.
+
+    The missing headers keep the default values. Raise a ValueError if a
+    header is invalid.
+    """
+    kwargs: dict = {}
+    for key, header in CONFIG_HEADERS.items():
+        value = headers.get(header)
+        if value is None:
+            continue
+        if key in ("max_len", "indent"):
+            try:
+                kwargs[key] = int(value)
+            except ValueError as err:
+                raise ValueError(
+                    f"Header {header} must be an integer (found {value!r})."
+                ) from err
+        elif key in ("add_missing", "include_type"):
+            if value not in ("0", "1"):
+                raise ValueError(f"Header {header} must be 0 or 1 (found {value!r}).")
+            kwargs[key] = value == "1"
+        else:
+            kwargs[key] = value
+    return Config(**kwargs)
+
+
+def make_config_headers(docstr_config: dict) -> Dict[str, str]:
+    """Create the headers of a docstring configuration."""
+    headers = {}
+    for key, header in CONFIG_HEADERS.items():
+        value = docstr_config[key]
+        headers[header] = str(int(value)) if isinstance(value, bool) else str(value)
+    return headers
+
+
+class DaemonHandler(BaseHTTPRequestHandler):
+    """Handler of the formatting requests."""
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Format the source in the request body."""
+        length = int(self.headers.get("Content-Length", 0))
+        text = self.rfile.read(length).decode("utf-8")
+        try:
+            config = parse_config_headers(dict(self.headers.items()))
+        except ValueError as err:
+            self.send_text(400, str(err))
+            return
+        try:
+            new_text = format_source(text, config)
+        except Exception as err:
+            # Any error is reported to the client (that would otherwise see a
+            # closed connection and process the file locally)
+            message = str(err)
+            if not isinstance(err, ValueError):
+                message = f"{type(err).__name__}: {message}"
+            if err.__cause__ is not None:
+                message += f"\n{type(err.__cause__).__name__}: {err.__cause__}"
+            self.send_text(500, message)
+            return
+        if new_text == text:
+            self.send_text(204, "")
+        else:
+            self.send_text(200, new_text)
+
+    def send_text(self, status: int, text: str) -> None:
+        """Send a response with a text body."""
+        body = text.encode("utf-8")
+        self.send_response(status)
+        if status != 204:
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 204:
+            self.wfile.write(body)
+
+
+def format_with_daemon(text: str, docstr_config: dict, url: str) -> Optional[str]:
+    """Format a source with a running daemon.
+
+    Return None if the daemon is not reachable and raise a ValueError if the
+    daemon could not format the source.
+    """
+    request = urllib.request.Request(
+        url,
+        data=text.encode("utf-8"),
+        headers=make_config_headers(docstr_config),
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=DAEMON_TIMEOUT) as response:
+            if response.status == 204:
+                return text
+            return response.read().decode("utf-8")
+    except urllib.error.HTTPError as err:
+        raise ValueError(
+            f"docstripy-daemon error: {err.read().decode('utf-8')}"
+        ) from err
+    except OSError:
+        # Not reachable (URLError, ConnectionError) or no response in time
+        # (TimeoutError)
+        return None
+
+
+def write_file_py_daemon(
+    in_path: str,
+    out_path: str,
+    *,
+    overwrite: bool,
+    docstr_config: dict,
+    url: str,
+) -> Optional[bool]:
+    """Write new docstrings on a file with a running daemon.
+
+    Return whether the content changed or None if the daemon is not reachable
+    (nothing is written then).
+    """
+    if out_path and not out_path.endswith(".py"):
+        raise ValueError(f"Output file must be a .py file (found {out_path}).")
+    docstr_configs = split_styles(docstr_config)
+    out_paths = get_style_paths(out_path, docstr_configs, overwrite=overwrite)
+    with open(in_path, encoding="utf-8") as file:
+        text = file.read()
+    new_texts: List[str] = []
+    for config in docstr_configs:
+        new_text = format_with_daemon(text, config, url)
+        if new_text is None:
+            return None
+        new_texts.append(new_text)
+    changed = any(new_text != text for new_text in new_texts)
+    if overwrite:
+        if changed:
+            write_file_atomic(in_path, new_texts[0])
+    else:
+        for style_out_path, new_text in zip(out_paths, new_texts):
+            write_file_if_different(style_out_path, new_text)
+    return changed
+
+
+def get_daemon_url() -> str:
+    """Return the URL of the daemon used by the client."""
+    return os.environ.get(DAEMON_URL_ENV, DEFAULT_URL)
+
+
+def parse_args() -> argparse.Namespace:
+    """Command line parser for docstripy-daemon."""
+    parser = argparse.ArgumentParser(
+        description="Formatting daemon of docstripy (see `docstripy --daemon`)."
+    )
+    parser.add_argument(
+        "--bind_host",
+        help=f"Address to listen on. By default, '{DEFAULT_HOST}'.",
+        type=str,
+        default=DEFAULT_HOST,
+    )
+    parser.add_argument(
+        "--bind_port",
+        help=f"Port to listen on. By default, {DEFAULT_PORT}.",
+        type=int,
+        default=DEFAULT_PORT,
+    )
+    parser.add_argument(
+        "--cache_size",
+        help=(
+            "Maximum number of built docstrings kept in memory to reuse them "
+            f"for identical docstrings (0 to disable). By default, {DEFAULT_MEMO_SIZE}."
+        ),
+        type=int,
+        default=DEFAULT_MEMO_SIZE,
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the formatting daemon until interrupted."""
+    args = parse_args()
+    set_memo_size(args.cache_size)
+    server = HTTPServer((args.bind_host, args.bind_port), DaemonHandler)
+    print(f"docstripy-daemon listening on {args.bind_host}:{args.bind_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
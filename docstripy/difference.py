@@ -1,38 +1,6 @@
 """Classes and functions to manage difference between files."""
 
-from typing import List, Tuple, Union
-
-
-def satenize_ranges(
-    ranges: List[List[int]],
-    to_insert_list: List[bool],
-) -> List[List[int]]:
-    """Check if the ranges are overlapping."""
-    for i, range1 in enumerate(ranges):
-        for j, range2 in enumerate(ranges[i + 1 :]):
-            if (
-                not to_insert_list[i]
-                and not to_insert_list[j]
-                and (
-                    range1[0] <= range2[0] < range1[1]
-                    or range2[0] <= range1[0] < range2[1]
-                )
-            ):
-                raise ValueError("Found overlapping docstring line ranges.")
-    return ranges
-
-
-def order_lists(
-    ranges: List[List[int]],
-    lines: List[str],
-    to_insert: List[bool],
-) -> Tuple[List[List[int]], List[str], List[bool]]:
-    """Order the ranges in descending order and lines accordingly."""
-    sort_indices = sorted(range(len(ranges)), key=lambda i: ranges[i])
-    ranges = [ranges[i] for i in sort_indices[::-1]]
-    lines = [lines[i] for i in sort_indices[::-1]]
-    to_insert = [to_insert[i] for i in sort_indices[::-1]]
-    return ranges, lines, to_insert
+from typing import List, Union
 
 
 def split_line(line: str) -> List[str]:
@@ -65,18 +33,34 @@ def apply_diff(
         If a list is given, it should have the same
         length as ranges. Otherwise, the same value will be used for all ranges.
         By default, False.
+
+    Returns
+    -------
+    new_lines : List[str]
+        New lines of the file.
+
+    Raises
+    ------
+    ValueError
+        If a range overlaps a range to overwrite.
     """
     if isinstance(to_insert, bool):
         to_insert_list = [to_insert] * len(ranges)
     else:
         to_insert_list = to_insert
-    ranges, lines, to_insert_list = order_lists(ranges, lines, to_insert_list)
-    ranges = satenize_ranges(ranges, to_insert_list)
-    new_lines = old_lines.copy()
-    for i, line in enumerate(lines):
-        start, end = ranges[i]
-        to_insert_line = to_insert_list[i]
-        if not to_insert_line:
-            del new_lines[start:end]
-        new_lines[start:start] = split_line(line)
+    # Sort the edits once: insertions before an overwrite of the same range
+    # (stable sort to keep the order of the lines inserted at the same line)
+    edits = sorted(
+        zip(ranges, to_insert_list, lines),
+        key=lambda edit: (edit[0], not edit[1]),
+    )
+    new_lines: List[str] = []
+    pos = 0  # First line of old_lines not copied (nor removed) yet
+    for (start, end), to_insert_line, line in edits:
+        if start < pos:
+            raise ValueError("Found overlapping docstring line ranges.")
+        new_lines.extend(old_lines[pos:start])
+        new_lines.extend(split_line(line))
+        pos = start if to_insert_line else end
+    new_lines.extend(old_lines[pos:])
     return new_lines
@@ -1,11 +1,47 @@
 """File parsing functions."""
 
-from typing import List, Tuple
+import ast
+import re
+import tokenize
+from bisect import bisect_right
+from itertools import accumulate
+from operator import add
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+DOCSTRING_STARTERS = ('"""', "'''", 'r"""', "r'''")
+# Tokens of the lines that can change the state of the scanner outside of
+# definitions depending on the closing quotes of the current docstring (if any):
+# (tokens anywhere in the line, tokens at the start of the line)
+NEXT_LINE_TOKENS = {
+    "": ((), ("def ", '"""', "'''")),
+    '"""': (('"""',), ("def ", "class ")),
+    "'''": (("'''",), ("def ", "class ")),
+}
+# Tokens changing the state of the block scanner outside of strings: comments,
+# triple quotes, (complete or unclosed) one-line strings, brackets and
+# line continuations
+BLOCK_TOKENS_REGEX = re.compile(
+    r"""#|\"\"\"|'''|"(?:\\.|[^"\\\n])*"?|'(?:\\.|[^'\\\n])*'?|[()\[\]{}]|\\\r?\n"""
+)
+# End of the triple quoted strings (from the position following the opening quotes)
+TRIPLE_QUOTES_END_REGEX = {
+    '"""': re.compile(r'(?:[^"\\]|\\.|"(?!""))*"""', re.DOTALL),
+    "'''": re.compile(r"(?:[^'\\]|\\.|'(?!''))*'''", re.DOTALL),
+}
+# First characters of the lines that do not start a statement
+NON_STATEMENT_STARTS = ("", " ", "\t", "\f", "\n", "\r", "#")
+# Statements that cannot start a block (they continue the previous statement)
+CONTINUATION_KEYWORDS = ("else", "elif", "except", "finally")
 
 
 def parse_ranges(lines: List[str]) -> Tuple[List[List[int]], List[List[int]]]:
     """Parse source code lines ranges.
 
+    The lines are scanned in a single pass. Outside of definitions, the
+    scanner directly jumps to the next line that can change its state
+    (start of a docstring or a definition, end of a docstring) with
+    string searches on the whole text.
+
     Parameters
     ----------
     lines : List[str]
@@ -20,85 +56,76 @@ def parse_ranges(lines: List[str]) -> Tuple[List[List[int]], List[List[int]]]:
     """
     ranges_docstr: List[List[int]] = []
     ranges_def: List[List[int]] = []
-    current_docstr_range: List[int] = []
-    current_def_range: List[int] = []
-    in_docstr, double_quotes, in_def = False, None, False
-    states = {
-        "ranges_docstr": ranges_docstr,
-        "ranges_def": ranges_def,
-        "current_docstr_range": current_docstr_range,
-        "current_def_range": current_def_range,
-        "in_docstr": in_docstr,
-        "double_quotes": double_quotes,
-        "in_def": in_def,
-    }
-    for ind_line, line in enumerate(lines):
-        states = docstring_parse_range(
-            line=line,
-            ind_line=ind_line,
-            states=states,
-        )
-        if not in_docstr:
-            states = def_parse_range(
-                line=line,
-                ind_line=ind_line,
-                states=states,
+    # Each line is preceded by an extra new line (even when the previous
+    # line does not end with a new line). The line starts are the positions
+    # of those extra new lines.
+    text = "\n" + "\n".join(lines)
+    line_starts = list(
+        map(add, accumulate(map(len, lines[:-1]), initial=0), range(len(lines)))
+    )
+    next_token_pos: Dict[str, int] = {}
+    docstr_start, def_start = -1, -1
+    closing_quotes = ""  # Quotes closing the current docstring (if any)
+    in_def = False
+    ind_line = 0
+    while ind_line < len(lines):
+        if not in_def:
+            # Jump to the next line that can change the state
+            tokens, line_start_tokens = NEXT_LINE_TOKENS[closing_quotes]
+            ind_line = find_next_line(
+                text,
+                line_starts,
+                ind_line,
+                tokens=tokens,
+                line_start_tokens=line_start_tokens,
+                next_token_pos=next_token_pos,
             )
-    ranges_docstr = states["ranges_docstr"]  # type: ignore
-    ranges_def = states["ranges_def"]  # type: ignore
-    return ranges_docstr, ranges_def
-
-
-def docstring_parse_range(
-    line: str,
-    ind_line: int,
-    states: dict,
-) -> dict:
-    """Parse docstring lines range from source code."""
-    ranges = states["ranges_docstr"]
-    current_range = states["current_docstr_range"]
-    in_docstr = states["in_docstr"]
-    double_quotes = states["double_quotes"]
-    docstring_starters = ('"""', "'''", 'r"""', "r'''")
-    strip_line = line.strip()
-    strip_wo_comment = line.rsplit("#", maxsplit=1)[0].strip()
-    if strip_line.startswith(docstring_starters) and line.startswith(" "):
-        # Case one-line docstring
-        if (
-            strip_line.count('"""') > 1 or strip_line.count("'''") > 1
-        ) and not in_docstr:
-            ranges.append([ind_line, ind_line + 1])
-        else:
-            # Case multi-line docstring
-            if not in_docstr:
-                current_range = [ind_line]
-                in_docstr = True
-                double_quotes = strip_line.startswith(('"""', 'r"""'))
-            elif (double_quotes and strip_wo_comment.endswith('"""')) or (
-                not double_quotes and strip_wo_comment.endswith("'''")
+            if ind_line == len(lines):
+                break
+        line = lines[ind_line]
+        strip_line = line.strip()
+        # Stripped line without comment
+        strip_wo_comment = (
+            line.rsplit("#", maxsplit=1)[0].strip() if "#" in line else strip_line
+        )
+        # Docstring ranges
+        if strip_line.startswith(DOCSTRING_STARTERS) and line.startswith(" "):
+            if not closing_quotes and (
+                strip_line.count('"""') > 1 or strip_line.count("'''") > 1
             ):
-                current_range.append(ind_line + 1)
-                ranges.append(current_range)
-                in_docstr = False
-                double_quotes = None
-    elif in_docstr and (
-        (double_quotes and strip_wo_comment.endswith('"""'))
-        or (not double_quotes and strip_wo_comment.endswith("'''"))
-    ):
-        current_range.append(ind_line + 1)
-        ranges.append(current_range)
-        in_docstr = False
-        double_quotes = None
-    elif in_docstr and is_def_line(strip_line):
-        # Probably not in a docstring
-        in_docstr = False
-        double_quotes = None
-        current_range = []
-    states["ranges_docstr"] = ranges
-    states["current_docstr_range"] = current_range
-    states["in_docstr"] = in_docstr
-    states["double_quotes"] = double_quotes
-    return states
+                # Case one-line docstring
+                ranges_docstr.append([ind_line, ind_line + 1])
+            elif not closing_quotes:
+                # Case multi-line docstring
+                docstr_start = ind_line
+                closing_quotes = (
+                    '"""' if strip_line.startswith(('"""', 'r"""')) else "'''"
+                )
+            elif strip_wo_comment.endswith(closing_quotes):
+                ranges_docstr.append([docstr_start, ind_line + 1])
+                closing_quotes = ""
+        elif closing_quotes:
+            if strip_wo_comment.endswith(closing_quotes):
+                ranges_docstr.append([docstr_start, ind_line + 1])
+                closing_quotes = ""
+            elif is_def_line(strip_line):
+                # Probably not in a docstring
+                closing_quotes = ""
+        # Definition ranges
+        if in_def:
+            if strip_wo_comment.endswith(":"):
+                ranges_def.append([def_start, ind_line + 1])
+                in_def = False
+        elif strip_wo_comment.startswith("def "):
+            if strip_wo_comment.endswith(":"):
+                # Case one-line def
+                ranges_def.append([ind_line, ind_line + 1])
+            else:
+                # Case multi-line def
+                def_start = ind_line
+                in_def = True
+        ind_line += 1
+    return ranges_docstr, ranges_def
 
 
 def is_def_line(strip_line: str) -> bool:
@@ -110,29 +137,276 @@ def is_def_line(strip_line: str) -> bool:
     )
 
 
-def def_parse_range(
-    line: str,
+def find_next_line(
+    text: str,
+    line_starts: List[int],
     ind_line: int,
-    states: dict,
-) -> dict:
-    """Parse signature lines range from source code."""
-    ranges = states["ranges_def"]
-    current_range = states["current_def_range"]
-    in_def = states["in_def"]
-    strip_line = line.rsplit("#", maxsplit=1)[0].strip()
-    if not in_def and strip_line.startswith("def "):
-        if strip_line.endswith(":"):
-            # Case one-line def
-            ranges.append([ind_line, ind_line + 1])
-        else:
-            # Case multi-line def
-            current_range = [ind_line]
-            in_def = True
-    elif in_def and strip_line.endswith(":"):
-        current_range.append(ind_line + 1)
-        ranges.append(current_range)
-        in_def = False
-    states["ranges_def"] = ranges
-    states["current_def_range"] = current_range
-    states["in_def"] = in_def
-    return states
+    tokens: Tuple[str, ...],
+    line_start_tokens: Tuple[str, ...],
+    next_token_pos: Dict[str, int],
+) -> int:
+    """Find the index of the next line containing one of the tokens.
+
+    Parameters
+    ----------
+    text : str
+        Lines joined with new lines and starting with a new line.
+    line_starts : List[int]
+        Position of the new line preceding each line in the text.
+    ind_line : int
+        Index of the first line to search.
+    tokens : Tuple[str, ...]
+        Tokens to search anywhere in the lines.
+    line_start_tokens : Tuple[str, ...]
+        Tokens to search at the start of the lines (only preceded by spaces
+        or by a "r" prefix).
+    next_token_pos : Dict[str, int]
+        Position of the last occurrence found for each token (prefixed by "^"
+        for the line start tokens). Updated in place so that the text is
+        scanned only once for each token across the calls.
+
+    Returns
+    -------
+    ind_next_line : int
+        Index of the next line found (or the number of lines if not found).
+    """
+    pos = line_starts[ind_line]
+    ind_next_line = len(line_starts)
+    for token in tokens + line_start_tokens:
+        at_line_start = token in line_start_tokens
+        # The occurrences that are not at a line start are skipped only
+        # for the line start tokens
+        cache_key = "^" + token if at_line_start else token
+        token_pos = next_token_pos.get(cache_key, -1)
+        if token_pos == len(text):
+            continue
+        if token_pos < pos:
+            token_pos = text.find(token, pos)
+        while token_pos != -1:
+            ind_token_line = bisect_right(line_starts, token_pos) - 1
+            if ind_token_line >= ind_next_line:
+                break
+            if not at_line_start or text[
+                line_starts[ind_token_line] + 1 : token_pos
+            ].strip() in ("", "r"):
+                ind_next_line = ind_token_line
+                break
+            token_pos = text.find(token, token_pos + 1)
+        # Not found tokens are never searched again
+        next_token_pos[cache_key] = len(text) if token_pos == -1 else token_pos
+    return ind_next_line
+
+
+def parse_ranges_ast(
+    lines: List[str],
+) -> Tuple[List[List[int]], List[List[int]], List[List[int]]]:
+    """Parse definition and docstring ranges from the abstract syntax tree.
+
+    Unlike :func:`parse_ranges`, the docstrings are directly matched with their
+    function (or class) definition. Functions whose body or docstring starts
+    on the definition line are ignored.
+
+    Parameters
+    ----------
+    lines : List[str]
+        List of lines to parse.
+
+    Returns
+    -------
+    ranges_def : List[List[int]]
+        Ranges of lines containing function definitions.
+    corresp_ranges_docstr : List[List[int]]
+        Range of the docstring of each function definition ([-1, -1] if
+        the function has no docstring). For an `__init__` method without
+        docstring, it is the range of the class docstring if any.
+    ranges_class_docstr : List[List[int]]
+        Ranges of the other class docstrings.
+
+    Raises
+    ------
+    ValueError
+        If the lines are not valid python code.
+    """
+    try:
+        tree = ast.parse("".join(lines))
+    except SyntaxError as err:
+        raise ValueError(f"Invalid python syntax at line {err.lineno}.") from err
+    def_docstr_ranges: List[Tuple[List[int], List[int]]] = []
+    ranges_class_docstr: List[List[int]] = []
+    init_class_docstr: Dict[ast.AST, List[int]] = {}
+    for node in iter_def_nodes(tree):
+        if isinstance(node, ast.ClassDef):
+            range_docstr = get_docstring_range(lines, node, node.lineno)
+            if range_docstr is None or range_docstr == [-1, -1]:
+                continue
+            init_node = next(
+                (
+                    child
+                    for child in node.body
+                    if isinstance(child, ast.FunctionDef) and child.name == "__init__"
+                ),
+                None,
+            )
+            range_init = None if init_node is None else get_def_range(lines, init_node)
+            if (
+                init_node is not None
+                and range_init is not None
+                and get_docstring_range(lines, init_node, range_init[1]) == [-1, -1]
+            ):
+                init_class_docstr[init_node] = range_docstr
+            else:
+                ranges_class_docstr.append(range_docstr)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            range_def = get_def_range(lines, node)
+            if range_def is None:
+                continue
+            range_docstr = get_docstring_range(lines, node, range_def[1])
+            if range_docstr is None:
+                continue
+            if range_docstr == [-1, -1] and node in init_class_docstr:
+                range_docstr = init_class_docstr[node]
+            def_docstr_ranges.append((range_def, range_docstr))
+    def_docstr_ranges.sort()
+    ranges_def = [range_def for range_def, _ in def_docstr_ranges]
+    corresp_ranges_docstr = [range_docstr for _, range_docstr in def_docstr_ranges]
+    return ranges_def, corresp_ranges_docstr, sorted(ranges_class_docstr)
+
+
+def iter_def_nodes(tree: ast.AST) -> Iterator[ast.AST]:
+    """Iterate over the function and class nodes, parents before children.
+
+    Only the statements are visited (definitions cannot be expressions),
+    which is much faster than visiting all the nodes with `ast.walk`.
+    """
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            yield node
+        for field in ("body", "orelse", "finalbody", "handlers", "cases"):
+            stack.extend(reversed(getattr(node, field, [])))
+
+
+def get_def_range(
+    lines: List[str],
+    node: Union[ast.FunctionDef, ast.AsyncFunctionDef],
+) -> Optional[List[int]]:
+    """Get the range of the signature lines of a function node.
+
+    Return None if the body of the function starts on the signature lines.
+    """
+    start = node.lineno - 1
+    body_start = node.body[0].lineno - 1
+    # Find the colon ending the signature
+    depth = 0
+    tokens = tokenize.generate_tokens(iter(lines[start : body_start + 1]).__next__)
+    for token in tokens:
+        if token.type != tokenize.OP:
+            continue
+        if token.string in ("(", "[", "{"):
+            depth += 1
+        elif token.string in (")", "]", "}"):
+            depth -= 1
+        elif token.string == ":" and depth == 0:
+            end = start + token.end[0]
+            return [start, end] if end <= body_start else None
+    return None
+
+
+def get_docstring_range(
+    lines: List[str],
+    node: Union[ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef],
+    first_line: int,
+) -> Optional[List[int]]:
+    """Get the range of the docstring of a function or class node.
+
+    Return [-1, -1] if the node has no docstring and None if the docstring
+    cannot be rewritten (not starting with triple quotes, starting before
+    `first_line` or sharing its lines with other statements).
+    """
+    first_node = node.body[0]
+    if not (
+        isinstance(first_node, ast.Expr)
+        and isinstance(first_node.value, ast.Constant)
+        and isinstance(first_node.value.value, str)
+    ):
+        return [-1, -1]
+    start, end = first_node.lineno - 1, first_node.end_lineno
+    if (
+        start < first_line
+        or end is None
+        or not lines[start].strip().startswith(DOCSTRING_STARTERS)
+        or (len(node.body) > 1 and node.body[1].lineno <= end)
+    ):
+        return None
+    return [start, end]
+
+
+def iter_blocks(lines: Iterable[str], min_lines: int) -> Iterator[List[str]]:
+    """Iterate over blocks of consecutive top-level statements.
+
+    The lines are consumed lazily: only the current block is kept in memory.
+    A block starts at a statement at the beginning of a line (not in a string,
+    a bracket or a line continuation) that does not continue a compound
+    statement or a decorator, so that each block can be processed as a file
+    on its own.
+
+    Parameters
+    ----------
+    lines : Iterable[str]
+        Lines of the file (e.g. the opened file).
+    min_lines : int
+        Minimum number of lines of a block (except the last one). Larger
+        blocks reduce the overhead of processing each block.
+
+    Yields
+    ------
+    block : List[str]
+        Lines of the block.
+    """
+    block: List[str] = []
+    closing_quotes = ""  # Quotes closing the current string (if any)
+    depth = 0  # Bracket depth
+    continued = False  # Whether the previous line ends with a backslash
+    after_decorator = False
+    for line in lines:
+        if (
+            not closing_quotes
+            and depth == 0
+            and not continued
+            and line[:1] not in NON_STATEMENT_STARTS
+        ):
+            # Start of a top-level statement
+            if (
+                len(block) >= min_lines
+                and not after_decorator
+                and not line.startswith(CONTINUATION_KEYWORDS)
+            ):
+                yield block
+                block = []
+            after_decorator = line.startswith("@")
+        block.append(line)
+        continued = False
+        pos = 0
+        while True:
+            if closing_quotes:
+                match = TRIPLE_QUOTES_END_REGEX[closing_quotes].match(line, pos)
+                if match is None:
+                    break
+                closing_quotes = ""
+                pos = match.end()
+            match = BLOCK_TOKENS_REGEX.search(line, pos)
+            if match is None or match.group() == "#":
+                break
+            token = match.group()
+            pos = match.end()
+            if token in ('"""', "'''"):
+                closing_quotes = token
+            elif token in ("(", "[", "{"):
+                depth += 1
+            elif token in (")", "]", "}"):
+                depth = max(depth - 1, 0)
+            elif token[0] == "\\":
+                continued = True
+    if block:
+        yield block
@@ -0,0 +1,90 @@
+"""Files and lines changed according to the local git repository."""
+
+import os.path as osp
+import re
+import subprocess
+from typing import List, Optional, Set, Tuple
+
+# Header of a diff hunk: start and length of the new lines
+HUNK_HEADER_REGEX = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@", re.MULTILINE)
+
+
+def run_git(args: List[str], cwd: str) -> str:
+    """Run a git command and return its output (ValueError if it fails)."""
+    try:
+        process = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            check=False,
+        )
+    except FileNotFoundError as err:
+        raise ValueError("git is not installed.") from err
+    if process.returncode != 0:
+        raise ValueError(f"`git {' '.join(args)}` failed: {process.stderr.strip()}")
+    return process.stdout
+
+
+def get_diff_args(changed_since: str, *, staged: bool) -> Optional[List[str]]:
+    """Return the arguments of `git diff` (None if no git option is used)."""
+    if staged:
+        return ["--cached", changed_since] if changed_since else ["--cached"]
+    if changed_since:
+        return [changed_since]
+    return None
+
+
+def get_changed_files(in_path: str, diff_args: List[str]) -> Set[str]:
+    """Return the real paths of the files changed under a file or directory.
+
+    The files are the existing files of the diff and, when the working tree
+    is compared (not `--cached`), the untracked files not ignored by git.
+    """
+    in_path = osp.realpath(in_path)
+    cwd = in_path if osp.isdir(in_path) else osp.dirname(in_path)
+    root = run_git(["rev-parse", "--show-toplevel"], cwd).strip()
+    names = run_git(
+        ["diff", "--name-only", "--diff-filter=ACMR", "-z", *diff_args, "--", in_path],
+        root,
+    ).split("\0")
+    if "--cached" not in diff_args:
+        names += run_git(
+            ["ls-files", "--others", "--exclude-standard", "-z", "--", in_path],
+            root,
+        ).split("\0")
+    return {osp.realpath(osp.join(root, name)) for name in names if name}
+
+
+def get_changed_lines(
+    path: str, diff_args: List[str]
+) -> Optional[List[Tuple[int, int]]]:
+    """Return the ranges of the lines of a file changed in the diff.
+
+    The ranges are 0-indexed and the end is excluded. A deletion marks the
+    lines around it. Return None if the file is untracked (all lines are new).
+    The ranges are lines of the working tree file, even for the staged files
+    (`--cached`): the working tree is then compared with the reference (HEAD
+    by default) so that the unstaged changes do not shift the ranges.
+    """
+    cwd = osp.dirname(osp.realpath(path))
+    name = osp.basename(path)
+    if not run_git(["ls-files", "--", name], cwd):
+        return None
+    if "--cached" in diff_args:
+        diff_args = [arg for arg in diff_args if arg != "--cached"] or ["HEAD"]
+    diff = run_git(
+        ["diff", "-U0", "--no-color", "--no-ext-diff", *diff_args, "--", name],
+        cwd,
+    )
+    ranges = []
+    for match in HUNK_HEADER_REGEX.finditer(diff):
+        start = int(match.group(1))
+        length = 1 if match.group(2) is None else int(match.group(2))
+        if length == 0:
+            # Lines deleted after line `start` (1-indexed)
+            ranges.append((max(start - 1, 0), start + 1))
+        else:
+            ranges.append((start - 1, start - 1 + length))
+    return ranges
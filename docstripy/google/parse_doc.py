@@ -1,9 +1,21 @@
 """Parser for Google style docstrings."""
 
 import re
-from typing import Dict, List
+from typing import List
 
-from docstripy.lines_routines import find_prefix, remove_indent
+from docstripy.lines_routines import remove_indent
+
+# Prefixes of the section headers
+SECTION_PREFIXES = {
+    "_parameters": ("Arg:", "Args:", "Param:", "Params:"),
+    "_raises": ("Raise:", "Raises:"),
+    "_returns": ("Return:", "Returns:"),
+    "_yields": ("Yields:", "Yield:"),
+    "_attributes": ("Attributes:", "Attribute:"),
+}
+# Lower case names of the sections that are not wild sections
+KNOWN_SECTIONS = ["parameter", "return", "raise", "arg", "attribute", "yield"]
+KNOWN_SECTIONS += [f"{name}s" for name in KNOWN_SECTIONS]  # variations with s
 
 
 def parse_params(lines: List[str], section_name: str) -> List[dict]:
@@ -67,47 +79,6 @@ def parse_params(lines: List[str], section_name: str) -> List[dict]:
     return params_list
 
 
-def parse_sections_ranges(lines: List[str]) -> Dict:
-    """Parse google sections of a docstring."""
-    params_start, _ = find_prefix(
-        lines, ("Arg:", "Args:", "Param:", "Params:"), ("\n", " ")
-    )
-    raises_start, _ = find_prefix(lines, ("Raise:", "Raises:"), ("\n", " "))
-    returns_start, _ = find_prefix(lines, ("Return:", "Returns:"), ("\n", " "))
-    yields_start, _ = find_prefix(lines, ("Yields:", "Yield:"), ("\n", " "))
-    attr_start, _ = find_prefix(lines, ("Attributes:", "Attribute:"), ("\n", " "))
-    return {
-        "_parameters": [params_start, -1],
-        "_raises": [raises_start, -1],
-        "_returns": [returns_start, -1],
-        "_yields": [yields_start, -1],
-        "_attributes": [attr_start, -1],
-    }
-
-
-def parse_wild_sections_ranges(lines: List[str]) -> Dict:
-    """Parse wild sections of a docstring from google format."""
-    sec_ranges = {}
-    known_sections = [
-        "parameter",
-        "return",
-        "raise",
-        "arg",
-        "attribute",
-        "yield",
-    ]
-    known_sections += [f"{name}s" for name in known_sections]  # variations with s
-    for i, line in enumerate(lines):
-        if is_define_section(line):
-            section_name = line[:-2].strip()
-            if section_name.lower() not in known_sections:
-                sec_ranges[section_name] = [i]
-    for section_name in sec_ranges:
-        start, _ = find_prefix(lines, (section_name,), ())
-        sec_ranges.update({f"{section_name}": [start, -1]})
-    return sec_ranges
-
-
 def is_define_section(line: str) -> bool:
     """Check if a line define a Google wild section or not."""
     if not line or not line.endswith(":\n"):
@@ -1,14 +1,20 @@
 """Line break function."""
 
-from typing import List
+import re
+from typing import List, Optional
 
 from docstripy.lines_routines import (
     add_eol,
     clean_trailing_empty,
     clean_trailing_spaces,
 )
+from docstripy.profiling import timed
 
+# New line followed by a letter and not preceded by another new line
+JOIN_LINES_PATTERN = re.compile(r"(?<!\n)\n(?=[A-Za-z])")
 
+
+@timed
 def line_break(
     lines: List[str], max_line_length: int, num_add_char: int = 0
 ) -> List[str]:
@@ -30,31 +36,21 @@ def line_break(
     new_lines = clean_trailing_spaces(new_lines)
     new_lines[0] = num_add_char * " " + new_lines[0]  # Will be removed at the end
     flat_line = "".join(new_lines)
-    list_flat = []
-    for i, char in enumerate(flat_line):
-        if char != "\n":
-            list_flat.append(char)
-        else:
-            if i > 0 and flat_line[i - 1] == "\n":
-                list_flat.append("\n")
-            elif i < len(flat_line) - 1:
-                next_chr_i = ord(flat_line[i + 1])
-                next_is_alpha = 65 <= next_chr_i <= 90 or 97 <= next_chr_i <= 122
-                if next_is_alpha:
-                    list_flat.append(" ")
-                else:
-                    list_flat.append("\n")
-            else:
-                list_flat.append("\n")
-    new_lines = "".join(list_flat).split("\n")
-    sentences = [line.split(". ") for line in new_lines]
-    for paragraph in sentences:
-        for i, line_par in enumerate(paragraph):
-            line_par += "." if i < len(paragraph) - 1 else ""
-            paragraph[i] = line_par
-    sentences = [break_sentences(sentence, max_line_length) for sentence in sentences]
-    sentences = [add_eol(sentence) for sentence in sentences]
-    new_lines = [line for sublist in sentences for line in sublist]
+    # Join the lines continuing with a letter (except after an empty line)
+    paragraphs = JOIN_LINES_PATTERN.sub(" ", flat_line).split("\n")
+    new_lines = []
+    for paragraph in paragraphs:
+        if len(paragraph) <= max_line_length and (
+            ". " not in paragraph or len(paragraph) < 0.75 * max_line_length
+        ):
+            # Fast path: the sentences of the paragraph are all merged on
+            # a single line
+            new_lines.append(paragraph + "\n")
+            continue
+        sentences = paragraph.split(". ")
+        for i in range(len(sentences) - 1):
+            sentences[i] += "."
+        new_lines.extend(add_eol(break_sentences(sentences, max_line_length)))
     # Remove leading padding symbol
     new_lines[0] = new_lines[0][num_add_char:]
     new_lines = clean_trailing_empty(new_lines)
@@ -62,23 +58,40 @@ def line_break(
 
 
 def break_sentences(sentences: List[str], max_line_length: int) -> List[str]:
-    """Break sentences at a given length."""
-    if not sentences:
-        return sentences
-    if len(sentences[0]) <= max_line_length:
-        if len(sentences[0]) >= 0.75 * max_line_length or len(sentences) == 1:
-            # We avoid breaking few words after a dot
-            return [sentences[0]] + break_sentences(sentences[1:], max_line_length)
-        # We can continue the line with the next sentence
-        sentences[1] = sentences[0] + " " + sentences[1]
-        return break_sentences(sentences[1:], max_line_length)
-    word_split = sentences[0].split(" ")
-    line = word_split[0]
-    i_word = 1
-    if len(word_split) == 1:
-        return [line] + break_sentences(sentences[1:], max_line_length)
-    while len(line) + len(word_split[i_word]) + 1 <= max_line_length:
-        line += " " + word_split[i_word]
-        i_word += 1
-    remaining_line = " ".join(word_split[i_word:])
-    return [line] + break_sentences([remaining_line] + sentences[1:], max_line_length)
+    """Break sentences at a given length.
+
+    The sentences shorter than 3/4 of the maximum length are continued with
+    the next sentence (to avoid breaking few words after a dot) and the longer
+    sentences are broken between words.
+    """
+    new_lines = []
+    line: Optional[str] = None  # Line continued by the next sentence (if any)
+    for i_sentence, sentence in enumerate(sentences):
+        if line is not None:
+            sentence = line + " " + sentence
+            line = None
+        if len(sentence) > max_line_length:
+            words = sentence.split(" ")
+            i_word = 0
+            remaining_len = len(sentence)  # Length of the remaining words
+            while remaining_len > max_line_length and i_word < len(words) - 1:
+                # Fill a line with as many words as possible (at least one)
+                line_len = len(words[i_word])
+                end_word = i_word + 1
+                while line_len + len(words[end_word]) + 1 <= max_line_length:
+                    line_len += len(words[end_word]) + 1
+                    end_word += 1
+                new_lines.append(" ".join(words[i_word:end_word]))
+                remaining_len -= line_len + 1
+                i_word = end_word
+            sentence = " ".join(words[i_word:])
+            if remaining_len > max_line_length:
+                # Single word longer than the maximum length
+                new_lines.append(sentence)
+                continue
+        if len(sentence) >= 0.75 * max_line_length or i_sentence == len(sentences) - 1:
+            new_lines.append(sentence)
+        else:
+            # We can continue the line with the next sentence
+            line = sentence
+    return new_lines
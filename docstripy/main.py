@@ -1,17 +1,47 @@
 """Main functions for parsing and building docstrings."""
 
 import argparse
+import os
 import os.path as osp
+import sys
+from typing import List, Optional, Tuple
 
-from docstripy.write import write_file_ipynb, write_file_py, write_files_recursive
+from docstripy.cache import close_section_store, set_section_store
+from docstripy.constants import DAEMON_URL_ENV, DEFAULT_URL
+from docstripy.git_diff import get_changed_files, get_diff_args
+from docstripy.memo import DEFAULT_MEMO_SIZE, set_memo_size
+from docstripy.profiling import file_stage, print_profile, set_profiler, write_trace
+from docstripy.write import (
+    get_style_paths,
+    make_line_ranges,
+    split_styles,
+    write_file_ipynb,
+    write_file_py,
+    write_file_py_stream,
+    write_files_recursive,
+)
 
 
 def parse_args() -> dict:
     """Command line parser for docstripy."""
     parser = argparse.ArgumentParser()
-    parser.add_argument("in_path", help="File path or root directory path.", type=str)
     parser.add_argument(
-        "-s", "--style", help="Style of the docstring", type=str, default="numpy"
+        "in_path",
+        help="File path or root directory path (not used with `--worker`).",
+        type=str,
+        nargs="?",
+        default="",
+    )
+    parser.add_argument(
+        "-s",
+        "--style",
+        help=(
+            "Style of the docstring. Multiple comma separated styles "
+            "(e.g. 'numpy,google,rest') can be used with an output path "
+            "containing '{style}'."
+        ),
+        type=str,
+        default="numpy",
     )
     parser.add_argument(
         "-o",
@@ -46,46 +76,317 @@ def parse_args() -> dict:
         help="Prevent indicating the types of parameters.",
         action="store_true",
     )
+    parser.add_argument(
+        "--engine",
+        help=(
+            "Engine used to find the functions and docstrings: 'lines' "
+            "(line heuristics) or 'ast' (abstract syntax tree, requires valid "
+            "python code). By default, 'lines'."
+        ),
+        type=str,
+        choices=["lines", "ast"],
+        default="lines",
+    )
+    parser.add_argument(
+        "--stream",
+        help=(
+            "Process the .py files by blocks of top-level statements to bound "
+            "the memory used by very large files."
+        ),
+        action="store_true",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help=(
+            "Number of processes used to process a directory or the cells of "
+            "a notebook ('auto' to use all CPUs). By default, 1."
+        ),
+        type=parse_jobs,
+        default=1,
+    )
+    parser.add_argument(
+        "--cache",
+        help=(
+            "Skip the files found unchanged by previous runs (directories only) "
+            "and reuse the docstrings parsed by previous runs."
+        ),
+        action="store_true",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        help="Cache directory used with `--cache`. By default, '.docstripy_cache'.",
+        type=str,
+        default=".docstripy_cache",
+    )
+    parser.add_argument(
+        "--cache_size",
+        help=(
+            "Maximum number of built docstrings kept in memory to reuse them "
+            "for identical docstrings (0 to disable). By default, 4096."
+        ),
+        type=int,
+        default=DEFAULT_MEMO_SIZE,
+    )
+    parser.add_argument(
+        "--profile",
+        help=(
+            "Time the processing stages and print a summary table with the "
+            "slowest files and docstrings."
+        ),
+        action="store_true",
+    )
+    parser.add_argument(
+        "--profile_json",
+        help="Path of the JSON report of `--profile` (enables `--profile`).",
+        type=str,
+        default="",
+    )
+    parser.add_argument(
+        "--trace",
+        help=(
+            "Path of a trace of the run in the Chrome trace event format, with "
+            "a span per file and per processing stage in each process (to "
+            "open in chrome://tracing or https://ui.perfetto.dev)."
+        ),
+        type=str,
+        default="",
+    )
+    parser.add_argument(
+        "--daemon",
+        help=(
+            "Forward a single .py file to a running `docstripy-daemon` (at "
+            f"${DAEMON_URL_ENV} or {DEFAULT_URL}) and process it locally if the "
+            "daemon is not reachable."
+        ),
+        action="store_true",
+    )
+    parser.add_argument(
+        "--changed_since",
+        help=(
+            "Only process the files changed since a git reference (commit, "
+            "branch, tag...), including the untracked files."
+        ),
+        type=str,
+        default="",
+    )
+    parser.add_argument(
+        "--staged",
+        help=(
+            "Only process the files staged in git (compared to HEAD or to the "
+            "reference of `--changed_since`)."
+        ),
+        action="store_true",
+    )
+    parser.add_argument(
+        "--changed_lines_only",
+        help=(
+            "With `--changed_since` or `--staged`, only update the docstrings "
+            "of the .py files whose definition or docstring overlaps a changed "
+            "line."
+        ),
+        action="store_true",
+    )
+    parser.add_argument(
+        "--lines",
+        help=(
+            "Only update the docstrings whose definition or docstring overlaps "
+            "the lines START to END (1-indexed, included) of a single .py file. "
+            "Can be repeated."
+        ),
+        type=parse_line_range,
+        action="append",
+        metavar="START:END",
+    )
+    parser.add_argument(
+        "--worker",
+        help=(
+            "Process JSON-lines requests read from the standard input and write "
+            "the JSON-lines responses on the standard output until the end of "
+            "the input (see `docstripy.worker`). Use `-j` to process the "
+            "requests concurrently."
+        ),
+        action="store_true",
+    )
     args = parser.parse_args()
+    if args.worker:
+        return {"worker": True, "jobs": args.jobs, "cache_size": args.cache_size}
+    if not args.in_path:
+        parser.error("the following arguments are required: in_path")
     docstr_config = {
         "style": args.style,
         "max_len": args.length,
         "indent": args.indent,
         "add_missing": not args.noadd,
         "include_type": not args.notype,
+        "engine": args.engine,
     }
     if args.out_path and args.overwrite:
         raise ValueError(
             "Cannot use both `--out_path`/`-o` and `--overwrite`/`-w` options."
         )
+    diff_args = get_diff_args(args.changed_since, staged=args.staged)
+    if args.changed_lines_only and diff_args is None:
+        raise ValueError(
+            "`--changed_lines_only` requires `--changed_since` or `--staged`."
+        )
+    if args.lines and (
+        args.changed_lines_only
+        or not osp.isfile(args.in_path)
+        or osp.splitext(args.in_path)[1] != ".py"
+    ):
+        raise ValueError(
+            "`--lines` requires a single .py file and cannot be used with "
+            "`--changed_lines_only`."
+        )
     if not args.out_path and not args.overwrite:
         raise ValueError(
             "You must specify an output path with `--out_path`/`-o` "
             "or overwrite file(s) with `--overwrite`/`-w` instead."
         )
+    # Check the output path when using multiple styles
+    get_style_paths(
+        args.out_path, split_styles(docstr_config), overwrite=args.overwrite
+    )
     return {
         "in_path": args.in_path,
         "out_path": args.out_path,
         "docstr_config": docstr_config,
         "overwrite": args.overwrite,
+        "jobs": args.jobs,
+        "cache_dir": args.cache_dir if args.cache else "",
+        "cache_size": args.cache_size,
+        "stream": args.stream,
+        "profile": args.profile or bool(args.profile_json),
+        "profile_json": args.profile_json,
+        "trace": args.trace,
+        "daemon": args.daemon,
+        "worker": False,
+        "diff_args": diff_args,
+        "changed_lines_only": args.changed_lines_only,
+        "line_ranges": args.lines,
     }
 
 
+def parse_jobs(jobs: str) -> int:
+    """Parse the number of jobs from the command line ('auto' or an integer)."""
+    if jobs == "auto":
+        return os.cpu_count() or 1
+    try:
+        n_jobs = int(jobs)
+    except ValueError as err:
+        raise argparse.ArgumentTypeError(
+            f"Number of jobs must be 'auto' or an integer (found {jobs})."
+        ) from err
+    if n_jobs < 1:
+        raise argparse.ArgumentTypeError(
+            f"Number of jobs must be at least 1 (found {jobs})."
+        )
+    return n_jobs
+
+
+def parse_line_range(line_range: str) -> Tuple[int, int]:
+    """Parse a range of lines 'START:END' (1-indexed, end included).
+
+    Return the 0-indexed range with the end excluded.
+    """
+    try:
+        start, end = (int(line) for line in line_range.split(":"))
+        return make_line_ranges([(start, end)])[0]
+    except ValueError as err:
+        raise argparse.ArgumentTypeError(
+            "Range of lines must be 'START:END' with 1 <= START <= END "
+            f"(found {line_range})."
+        ) from err
+
+
 def main() -> None:
     """Rewrite file(s) docstrings main function."""
     cli_args = parse_args()
+    jobs = cli_args.pop("jobs")
+    if cli_args.pop("worker"):
+        # Imported here to keep the startup of the other modes fast
+        from docstripy.worker import run_worker
+
+        set_memo_size(cli_args["cache_size"])
+        run_worker(sys.stdin, sys.stdout, jobs=jobs)
+        return
+    cache_dir = cli_args.pop("cache_dir")
+    stream = cli_args.pop("stream")
+    profile = cli_args.pop("profile")
+    profile_json = cli_args.pop("profile_json")
+    trace_path = cli_args.pop("trace")
+    cache_size = cli_args.pop("cache_size")
+    diff_args = cli_args.pop("diff_args")
+    # Arguments of the diff of the changed lines (if only those are processed)
+    lines_diff_args = diff_args if cli_args.pop("changed_lines_only") else None
+    line_ranges = cli_args.pop("line_ranges")
+    in_path = cli_args["in_path"]
+    paths = None if diff_args is None else get_changed_files(in_path, diff_args)
+    if paths is not None and osp.isfile(in_path) and osp.realpath(in_path) not in paths:
+        return  # File not changed
+    # Single file formatted by the daemon (if running) unless profiled locally
+    if (
+        cli_args.pop("daemon")
+        and not (stream or profile or trace_path or lines_diff_args or line_ranges)
+        and osp.isfile(in_path)
+        and osp.splitext(in_path)[1] == ".py"
+    ):
+        # Imported here to keep the startup of the other modes fast
+        from docstripy.daemon import get_daemon_url, write_file_py_daemon
+
+        if write_file_py_daemon(**cli_args, url=get_daemon_url()) is not None:
+            return
+    set_profiler(enabled=profile or bool(trace_path), trace=bool(trace_path))
+    set_memo_size(cache_size)
+    set_section_store(cache_dir)
+    try:
+        if osp.isfile(in_path):
+            with file_stage(in_path):
+                write_file(
+                    cli_args,
+                    jobs=jobs,
+                    stream=stream,
+                    diff_args=lines_diff_args,
+                    line_ranges=line_ranges,
+                )
+        write_files_recursive(
+            **cli_args,
+            jobs=jobs,
+            cache_dir=cache_dir,
+            stream=stream,
+            paths=paths,
+            diff_args=lines_diff_args,
+        )
+    finally:
+        close_section_store()
+    if profile:
+        print_profile(profile_json)
+    if trace_path:
+        write_trace(trace_path)
+
+
+def write_file(
+    cli_args: dict,
+    *,
+    jobs: int,
+    stream: bool,
+    diff_args: Optional[List[str]],
+    line_ranges: Optional[List[Tuple[int, int]]],
+) -> None:
+    """Write new docstrings on a single file depending on its extension."""
     in_path = cli_args["in_path"]
-    if osp.isfile(in_path):
-        if osp.splitext(in_path)[1] == ".py":
-            write_file_py(**cli_args)
-        elif osp.splitext(in_path)[1] == ".ipynb":
-            write_file_ipynb(**cli_args)
-        else:
-            raise ValueError(
-                f"File extension not supported: {in_path} "
-                "(only .py and .ipynb are supported)"
-            )
-    write_files_recursive(**cli_args)
+    if osp.splitext(in_path)[1] == ".py" and stream:
+        write_file_py_stream(**cli_args, diff_args=diff_args, line_ranges=line_ranges)
+    elif osp.splitext(in_path)[1] == ".py":
+        write_file_py(**cli_args, diff_args=diff_args, line_ranges=line_ranges)
+    elif osp.splitext(in_path)[1] == ".ipynb":
+        write_file_ipynb(**cli_args, jobs=jobs)
+    else:
+        raise ValueError(
+            f"File extension not supported: {in_path} "
+            "(only .py and .ipynb are supported)"
+        )
 
 
 if __name__ == "__main__":
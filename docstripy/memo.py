@@ -0,0 +1,113 @@
+"""In-memory cache of the docstrings already built by docstripy."""
+
+import sys
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+DEFAULT_MEMO_SIZE = 4096
+
+
+class LRUMemo:
+    """Bounded least recently used cache of built docstrings.
+
+    The values are the finished docstring texts. As strings are immutable,
+    the cached values cannot be altered by the parsing and building functions
+    that modify their inputs in place.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        Maximum number of cached docstrings (0 to disable the cache).
+        By default, 4096.
+
+    Attributes
+    ----------
+    hits : int
+        Number of docstrings found in the cache.
+    misses : int
+        Number of docstrings not found in the cache.
+    n_bytes : int
+        Approximate memory used by the cached keys and values in bytes.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MEMO_SIZE) -> None:
+        self.max_size = max_size
+        self.entries: "OrderedDict[Hashable, Tuple[str, int]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.n_bytes = 0
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """Return the cached docstring of a key (None if not cached)."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: Hashable, value: str) -> None:
+        """Cache a docstring, evicting the least recently used ones if full."""
+        if self.max_size <= 0:
+            return
+        if key in self.entries:
+            self.n_bytes -= self.entries.pop(key)[1]
+        size = get_size(key) + sys.getsizeof(value)
+        self.entries[key] = (value, size)
+        self.n_bytes += size
+        self.evict()
+
+    def resize(self, max_size: int) -> None:
+        """Change the maximum number of cached docstrings."""
+        self.max_size = max_size
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used docstrings above the maximum size."""
+        while len(self.entries) > max(self.max_size, 0):
+            _, (_, size) = self.entries.popitem(last=False)
+            self.n_bytes -= size
+
+    def clear(self) -> None:
+        """Remove all the cached docstrings and reset the counters."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.n_bytes = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Proportion of the lookups found in the cache."""
+        n_lookups = self.hits + self.misses
+        return self.hits / n_lookups if n_lookups else 0.0
+
+    def stats(self) -> dict:
+        """Return the counters of the cache."""
+        return {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "n_bytes": self.n_bytes,
+        }
+
+
+def get_size(obj: object) -> int:
+    """Approximate memory size of nested tuples of strings in bytes."""
+    if isinstance(obj, tuple):
+        return sys.getsizeof(obj) + sum(get_size(item) for item in obj)
+    return sys.getsizeof(obj)
+
+
+# Cache shared by all the files processed in the current process
+DOCSTRING_MEMO = LRUMemo()
+
+
+def set_memo_size(max_size: int) -> None:
+    """Set the maximum size of the docstring cache of the current process.
+
+    Also used as initializer of the worker processes.
+    """
+    DOCSTRING_MEMO.resize(max_size)
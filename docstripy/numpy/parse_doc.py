@@ -1,9 +1,21 @@
 """Parser for Numpy style docstrings."""
 
 import re
-from typing import Dict, List
+from typing import List
 
-from docstripy.lines_routines import find_prefix, remove_indent
+from docstripy.lines_routines import remove_indent
+
+# Prefixes of the section headers (followed by a dash line)
+SECTION_PREFIXES = {
+    "_parameters": ("Parameters", "Parameter"),
+    "_raises": ("Raises", "Raise"),
+    "_returns": ("Returns", "Return"),
+    "_yields": ("Yields", "Yield"),
+    "_attributes": ("Attributes", "Attribute"),
+}
+# Lower case names of the sections that are not wild sections
+KNOWN_SECTIONS = ["parameter", "return", "raise", "arg", "attribute", "yield"]
+KNOWN_SECTIONS += [f"{name}s" for name in KNOWN_SECTIONS]  # add 's'
 
 
 def parse_params(lines: List[str], section_name: str = "param") -> List[dict]:
@@ -55,46 +67,3 @@ def parse_params(lines: List[str], section_name: str = "param") -> List[dict]:
                 param_dict["name"] = param_dict["type"]
                 param_dict["type"] = type_p
     return params_list
-
-
-def parse_sections_ranges(lines: List[str]) -> Dict:
-    """Parse numpy sections of a docstring."""
-    params_start, _ = find_prefix(lines, ("Parameters", "Parameter"), (), dash=True)
-    raises_start, _ = find_prefix(lines, ("Raises", "Raise"), (), dash=True)
-    returns_start, _ = find_prefix(lines, ("Returns", "Return"), (), dash=True)
-    yields_start, _ = find_prefix(lines, ("Yields", "Yield"), (), dash=True)
-    attr_start, _ = find_prefix(lines, ("Attributes", "Attribute"), (), dash=True)
-    return {
-        "_parameters": [params_start, -1],
-        "_raises": [raises_start, -1],
-        "_returns": [returns_start, -1],
-        "_yields": [yields_start, -1],
-        "_attributes": [attr_start, -1],
-    }
-
-
-def parse_wild_sections_ranges(lines: List[str]) -> Dict:
-    """Parse wild sections of a docstring from numpy format."""
-    sec_ranges = {}
-    known_sections = [
-        "parameter",
-        "return",
-        "raise",
-        "arg",
-        "attribute",
-        "yield",
-    ]
-    known_sections += [f"{name}s" for name in known_sections]  # add 's'
-    for i, line in enumerate(lines):
-        if (
-            not line.startswith(" ")
-            and len(lines) > i + 1
-            and lines[i + 1].startswith("---")
-        ):
-            section_name = line[:-1].strip()
-            if section_name.lower() not in known_sections:
-                sec_ranges[section_name] = [i]
-    for section_name in sec_ranges:
-        start, _ = find_prefix(lines, (section_name,), ())
-        sec_ranges.update({f"{section_name}": [start, -1]})
-    return sec_ranges
@@ -1,8 +1,8 @@
 """Global docstring parsing functions."""
 
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
-from docstripy.file_parser import parse_ranges
+from docstripy.file_parser import parse_ranges, parse_ranges_ast
 from docstripy.lines_routines import (
     clean_leading_empty,
     clean_trailing_empty,
@@ -13,12 +13,14 @@ from docstripy.parse_doc.parse_params import parse_params_all
 from docstripy.parse_doc.postprocessing import postprocess_title_parse
 from docstripy.parse_doc.section_ranges import parse_sections_ranges
 from docstripy.parse_doc.signature import find_range_matching, merge_docstr_signature
+from docstripy.profiling import stage
 
 
 def parse_docstring(
     lines: List[str],
     *,
     add_missing: bool = True,
+    engine: str = "lines",
 ) -> Tuple[List[List[int]], List[dict], List[bool]]:
     """Docstring parser.
 
@@ -28,6 +30,10 @@ def parse_docstring(
         Lines of the file.
     add_missing : bool, optional
         Whether to add missing docstrings, by default True.
+    engine : str, optional
+        Engine used to find the definitions and the docstrings, either "lines"
+        (line heuristics) or "ast" (abstract syntax tree, the code must be
+        valid python). By default "lines".
 
     Returns
     -------
@@ -38,15 +44,70 @@ def parse_docstring(
     to_insert : List[bool]
         Whether to insert a new docstring or overwrite the existing one.
     """
-    ranges_docstr, ranges_def = parse_ranges(lines)
+    out_rng_docstr, docstr_jobs, to_insert = find_docstrings(
+        lines, add_missing=add_missing, engine=engine
+    )
+    sections_list = [
+        parse_single_docstring(lines_docstr, lines_def)
+        for lines_docstr, lines_def in docstr_jobs
+    ]
+    return out_rng_docstr, sections_list, to_insert
+
+
+def find_docstrings(
+    lines: List[str],
+    *,
+    add_missing: bool = True,
+    engine: str = "lines",
+) -> Tuple[List[List[int]], List[Tuple[List[str], Optional[List[str]]]], List[bool]]:
+    """Find the docstrings to parse and their definition.
+
+    Parameters
+    ----------
+    lines : List[str]
+        Lines of the file.
+    add_missing : bool, optional
+        Whether to add missing docstrings, by default True.
+    engine : str, optional
+        Engine used to find the definitions and the docstrings, either "lines"
+        or "ast". By default "lines".
+
+    Returns
+    -------
+    ranges_docstr : List[List[int]]
+        Ranges of the docstrings.
+    docstr_jobs : List[Tuple[List[str], Optional[List[str]]]]
+        Lines of each docstring and lines of the corresponding function
+        definition (None for the class docstrings).
+    to_insert : List[bool]
+        Whether to insert a new docstring or overwrite the existing one.
+    """
+    if engine == "ast":
+        with stage("parse_ranges_ast"):
+            ranges_def, corresp_ranges_docstr, ranges_class_docstr = parse_ranges_ast(
+                lines
+            )
+    elif engine == "lines":
+        with stage("parse_ranges"):
+            ranges_docstr, ranges_def = parse_ranges(lines)
+        with stage("find_range_matching"):
+            corresp_ranges_docstr = find_range_matching(
+                ranges_def=ranges_def,
+                ranges_docstr=ranges_docstr,
+                lines=lines,
+            )
+        matched_ranges = {tuple(range_docstr) for range_docstr in corresp_ranges_docstr}
+        ranges_class_docstr = [
+            range_docstr
+            for range_docstr in ranges_docstr
+            if tuple(range_docstr) not in matched_ranges
+            and "class" in lines[range_docstr[0] - 1]
+        ]
+    else:
+        raise ValueError(f"Unknown engine: {engine} (expected 'lines' or 'ast').")
     out_rng_docstr = []  # output docstring ranges
-    sections_list = []
+    docstr_jobs: List[Tuple[List[str], Optional[List[str]]]] = []
     to_insert = []
-    corresp_ranges_docstr = find_range_matching(
-        ranges_def=ranges_def,
-        ranges_docstr=ranges_docstr,
-        lines=lines,
-    )
     for rng_def, rng_docstr in zip(ranges_def, corresp_ranges_docstr):
         if rng_docstr == [-1, -1]:
             if add_missing:
@@ -60,23 +121,27 @@ def parse_docstring(
             lines_docstr = lines[rng_docstr[0] : rng_docstr[1]]
             out_rng_docstr.append(rng_docstr)
             to_insert.append(False)
-        lines_def = lines[rng_def[0] : rng_def[1]]
-        sections = parse_all(lines_docstr)
-        sections = merge_docstr_signature(sections, lines_def)
-        sections_list.append(sections)
+        docstr_jobs.append((lines_docstr, lines[rng_def[0] : rng_def[1]]))
     # Case class docstring
-    for range_docstr in ranges_docstr:
-        if (
-            range_docstr not in corresp_ranges_docstr
-            and "class" in lines[range_docstr[0] - 1]
-        ):
-            lines_docstr = lines[range_docstr[0] : range_docstr[1]]
-            out_rng_docstr.append(range_docstr)
-            to_insert.append(False)
-            sections = parse_all(lines_docstr)
-            sections_list.append(sections)
-    clean_empty_sections(sections_list)
-    return out_rng_docstr, sections_list, to_insert
+    for range_docstr in ranges_class_docstr:
+        out_rng_docstr.append(range_docstr)
+        to_insert.append(False)
+        docstr_jobs.append((lines[range_docstr[0] : range_docstr[1]], None))
+    return out_rng_docstr, docstr_jobs, to_insert
+
+
+def parse_single_docstring(
+    lines_docstr: List[str],
+    lines_def: Optional[List[str]],
+) -> dict:
+    """Parse a docstring and merge it with its definition (if any)."""
+    with stage("parse_all"):
+        sections = parse_all(lines_docstr)
+    if lines_def is not None:
+        with stage("merge_docstr_signature"):
+            sections = merge_docstr_signature(sections, lines_def)
+    clean_empty_sections([sections])
+    return sections
 
 
 def parse_all(lines_docstr: List[str]) -> dict:
@@ -1,7 +1,8 @@
 """Parameter section parsing functions."""
 
+import re
 from functools import partial
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from docstripy.google.parse_doc import parse_params as parse_params_google
 from docstripy.numpy.parse_doc import parse_params as parse_params_numpy
@@ -11,6 +12,47 @@ from docstripy.parse_doc.postprocessing import (
 )
 from docstripy.rest.parse_doc import parse_params as parse_params_rest
 
+DEFAULT_PATTERNS = [
+    "default is ",
+    "Default is ",
+    "defaults to ",
+    "default to ",
+    "Defaults to ",
+    "Default to ",
+    "by default ",
+    "By default ",
+    "defaults : ",
+    "Defaults : ",
+    "default : ",
+    "Default : ",
+    "defaults: ",
+    "Defaults: ",
+    "default: ",
+    "Default: ",
+]
+# Markers of the default values by decreasing priority
+DEFAULT_MARKERS = (
+    [pattern[:-1] + ", " for pattern in DEFAULT_PATTERNS]
+    + [", " + pattern for pattern in DEFAULT_PATTERNS]
+    + DEFAULT_PATTERNS
+)
+DEFAULT_MARKERS_PRIORITY = {marker: i for i, marker in enumerate(DEFAULT_MARKERS)}
+# At a given position, the alternation matches the marker with the highest priority
+DEFAULT_MARKERS_REGEX = re.compile(
+    "|".join(re.escape(marker) for marker in DEFAULT_MARKERS)
+)
+# All the markers contain "efault" at most at this offset
+EFAULT_MAX_OFFSET = max(marker.index("efault") for marker in DEFAULT_MARKERS)
+# Parsing function of each style for the ReST type patterns "type" and "rtype"
+PARSE_PARAMS_FUNCS = {
+    pattern_type_rest: {
+        "rest": partial(parse_params_rest, pattern_type=pattern_type_rest),
+        "google": parse_params_google,
+        "numpy": parse_params_numpy,
+    }
+    for pattern_type_rest in ("type", "rtype")
+}
+
 
 def parse_params_all(
     lines: List[str],
@@ -66,16 +108,7 @@ def parse_params_all(
         ],
     """
     pattern_type_rest = "rtype" if section_name in ("return", "yield") else "type"
-    parse_params_rest_patterns = partial(
-        parse_params_rest,
-        pattern_type=pattern_type_rest,
-    )
-    parse_funcs = {
-        "rest": parse_params_rest_patterns,
-        "google": parse_params_google,
-        "numpy": parse_params_numpy,
-    }
-    parse_func = parse_funcs[style]
+    parse_func = PARSE_PARAMS_FUNCS[pattern_type_rest][style]
     params_list = parse_func(lines=lines, section_name=section_name)  # type: ignore
 
     for param_dict in params_list:
@@ -99,40 +132,42 @@ def extract_default_value(lines: List[str]) -> Tuple[List[str], str]:
     """Extract default value from description."""
     # Lines merging
     line = "".join(lines)
-    patterns = [
-        "default is ",
-        "Default is ",
-        "defaults to ",
-        "default to ",
-        "Defaults to ",
-        "Default to ",
-        "by default ",
-        "By default ",
-        "defaults : ",
-        "Defaults : ",
-        "default : ",
-        "Default : ",
-        "defaults: ",
-        "Defaults: ",
-        "default: ",
-        "Default: ",
-    ]
-    patterns_comma1 = [", " + pattern for pattern in patterns]
-    patterns_comma2 = [pattern[:-1] + ", " for pattern in patterns]
-    patterns = patterns_comma2 + patterns_comma1 + patterns
     default = ""
-    for pattern in patterns:
-        if pattern in line:
-            default_split1, default_split_2 = line.rsplit(pattern, maxsplit=1)
-            default = default_split_2
-            for break_pattern in [".\n", "\n", ". "]:
-                default = default.split(break_pattern)[0].strip()
-            if default + "." in default_split_2:
-                line = default_split1 + default_split_2.replace(default + ".", "")
-            else:
-                line = default_split1 + default_split_2.replace(default, "")
-            break
+    marker_pos = find_default_marker(line)
+    if marker_pos is not None:
+        marker, pos = marker_pos
+        end_pos = pos + len(marker)
+        default_split1, default_split_2 = line[:pos], line[end_pos:]
+        default = default_split_2
+        for break_pattern in [".\n", "\n", ". "]:
+            default = default.partition(break_pattern)[0].strip()
+        if default + "." in default_split_2:
+            line = default_split1 + default_split_2.replace(default + ".", "")
+        else:
+            line = default_split1 + default_split_2.replace(default, "")
     # Reverse lines merging
     lines = line.split("\n")
     lines = [line + "\n" for line in lines]
     return lines, default
+
+
+def find_default_marker(line: str) -> Optional[Tuple[str, int]]:
+    """Find the default value marker in a line.
+
+    Return the last occurrence of the marker with the highest priority (and
+    its position) or None if no marker is found. The markers are only searched
+    right before the occurrences of "efault" (contained in all markers).
+    """
+    best_priority, best_pos = len(DEFAULT_MARKERS), -1
+    pos_efault = line.find("efault")
+    while pos_efault != -1:
+        for pos in range(max(0, pos_efault - EFAULT_MAX_OFFSET), pos_efault):
+            match = DEFAULT_MARKERS_REGEX.match(line, pos)
+            if match is not None:
+                priority = DEFAULT_MARKERS_PRIORITY[match[0]]
+                if priority <= best_priority:
+                    best_priority, best_pos = priority, pos
+        pos_efault = line.find("efault", pos_efault + 1)
+    if best_pos == -1:
+        return None
+    return DEFAULT_MARKERS[best_priority], best_pos
@@ -1,9 +1,16 @@
 """Parse def lines (function signatures)."""
 
+import re
 from typing import List
 
 from docstripy.lines_routines import clean_comment
 
+# Tokens of interest to split a signature by comma: string literals (possibly
+# not terminated), brackets and commas. Other characters are skipped.
+SPLIT_TOKENS_REGEX = re.compile(
+    r""""(?:\\.|[^"\\])*(?:"|$)|'(?:\\.|[^'\\])*(?:'|$)|[()\[\]{},]"""
+)
+
 
 def parse_signature(lines: List[str]) -> tuple[str, List[str], List[dict]]:
     """Parse function signature ("def ...")."""
@@ -12,6 +19,8 @@ def parse_signature(lines: List[str]) -> tuple[str, List[str], List[dict]]:
     sign_line = " ".join(lines).strip()
     parenthesis1_split = sign_line.split("(", maxsplit=1)
     fn_name = parenthesis1_split[0].replace("def ", "").strip()
+    if fn_name.startswith("async "):
+        fn_name = fn_name[len("async ") :].strip()
     try:
         parenthesis2_split = parenthesis1_split[1].rsplit(")", maxsplit=1)
         if "->" in parenthesis2_split[1]:
@@ -69,37 +78,23 @@ def parse_signature_args(split: str) -> dict:
 
 
 def split_comma(line: str) -> List[str]:
-    """Parse by comma."""
+    """Parse by comma.
+
+    Only the commas outside of brackets and string literals are used.
+    """
     line = line.strip()
-    count_spec_chars = {
-        ("(", ")"): 0,
-        ("[", "]"): 0,
-        ("{", "}"): 0,
-    }
-    count_quote = {
-        '"': 0,
-        "'": 0,
-    }
     splits = []
-    current_split = ""
-    for char in line:
-        for spec_char in count_spec_chars:
-            if char == spec_char[0]:
-                count_spec_chars[spec_char] += 1
-            elif char == spec_char[1]:
-                count_spec_chars[spec_char] -= 1
-        for quote in count_quote:
-            if char == quote:
-                count_quote[quote] += 1
-        if (
-            char == ","
-            and all(count == 0 for count in count_spec_chars.values())
-            and all(count % 2 == 0 for count in count_quote.values())
-        ):
-            splits.append(current_split.strip())
-            current_split = ""
-        else:
-            current_split += char
-    if current_split.strip():
-        splits.append(current_split.strip())
+    depth = 0  # Depth of brackets
+    start = 0  # Start of the current split
+    for match in SPLIT_TOKENS_REGEX.finditer(line):
+        token = match[0]
+        if token in ("(", "[", "{"):
+            depth += 1
+        elif token in (")", "]", "}"):
+            depth -= 1
+        elif token == "," and depth == 0:
+            splits.append(line[start : match.start()].strip())
+            start = match.end()
+    if line[start:].strip():
+        splits.append(line[start:].strip())
     return splits
@@ -1,25 +1,54 @@
 """Parse sections."""
+
 from typing import Dict, List, Tuple
 
-from docstripy.google.parse_doc import (
-    parse_sections_ranges as parse_google_sections_ranges,
-)
-from docstripy.google.parse_doc import (
-    parse_wild_sections_ranges as parse_wild_sections_google_ranges,
-)
+from docstripy.google.parse_doc import KNOWN_SECTIONS as GOOGLE_KNOWN_SECTIONS
+from docstripy.google.parse_doc import SECTION_PREFIXES as GOOGLE_SECTION_PREFIXES
+from docstripy.google.parse_doc import is_define_section
 from docstripy.lines_routines import remove_indent
-from docstripy.numpy.parse_doc import (
-    parse_sections_ranges as parse_numpy_sections_ranges,
-)
-from docstripy.numpy.parse_doc import (
-    parse_wild_sections_ranges as parse_wild_sections_numpy_ranges,
-)
-from docstripy.rest.parse_doc import parse_sections_ranges as parse_rest_sections_ranges
+from docstripy.numpy.parse_doc import KNOWN_SECTIONS as NUMPY_KNOWN_SECTIONS
+from docstripy.numpy.parse_doc import SECTION_PREFIXES as NUMPY_SECTION_PREFIXES
+from docstripy.rest.parse_doc import SECTION_PREFIXES as REST_SECTION_PREFIXES
+
+# Header entry: (style, section name, header prefixes, prefixes of the
+# following lines of the section, only used to find the end of ReST sections)
+HeaderEntry = Tuple[str, str, Tuple[str, ...], Tuple[str, ...]]
+
+
+def build_header_table() -> Dict[str, List[HeaderEntry]]:
+    """Build the table of the section headers of all styles.
+
+    The headers are indexed by their first character so that each line of a
+    docstring is only compared to the headers it can match.
+    """
+    entries: List[HeaderEntry] = [
+        ("google", name, prefixes, ())
+        for name, prefixes in GOOGLE_SECTION_PREFIXES.items()
+    ]
+    entries += [
+        ("rest", name, prefixes, prefixes_continue)
+        for name, (prefixes, prefixes_continue) in REST_SECTION_PREFIXES.items()
+    ]
+    entries += [
+        ("numpy", name, prefixes, ())
+        for name, prefixes in NUMPY_SECTION_PREFIXES.items()
+    ]
+    header_table: Dict[str, List[HeaderEntry]] = {}
+    for entry in entries:
+        for first_char in sorted({prefix[0] for prefix in entry[2]}):
+            header_table.setdefault(first_char, []).append(entry)
+    return header_table
+
+
+HEADER_TABLE = build_header_table()
 
 
 def parse_sections_ranges(lines: List[str]) -> Tuple[Dict, str]:
     """Parse sections of a docstring and detect docstring style.
 
+    The lines are classified in a single pass against the section headers of
+    all the styles (see `HEADER_TABLE`).
+
     Parameters
     ----------
     lines : List[str]
@@ -34,41 +63,90 @@ def parse_sections_ranges(lines: List[str]) -> Tuple[Dict, str]:
         Style of the docstring (one of 'numpy', 'google' or 'rest').
     """
     lines = remove_indent(lines)
+    found_ranges, numpy_wild_headers, google_wild_headers = classify_lines(lines)
     sec_ranges = {"_title": [0, -1]}
-    parse_funcs = {
-        "google": parse_google_sections_ranges,
-        "rest": parse_rest_sections_ranges,
-        "numpy": parse_numpy_sections_ranges,
-    }
     style = "numpy"
     # NOTE: order google -> rest -> numpy (each section overrides
     # the previous one in case of conflict). The style is
     # determine in this order, overriding previous ones. Default numpy.
-    for style_name in ("google", "rest", "numpy"):
-        ranges = parse_funcs[style_name](lines)
-        ranges = clean_section_ranges(ranges)
+    for style_name, section_prefixes in (
+        ("google", GOOGLE_SECTION_PREFIXES),
+        ("rest", REST_SECTION_PREFIXES),
+        ("numpy", NUMPY_SECTION_PREFIXES),
+    ):
+        ranges = {
+            name: found_ranges[(style_name, name)]
+            for name in section_prefixes
+            if (style_name, name) in found_ranges
+        }
         if len(ranges) > 0:
             style = style_name
         sec_ranges.update(ranges)
-    if style == "numpy":  # Found numpy section(s) => numpy-doc style
-        sec_ranges.update(parse_wild_sections_numpy_ranges(lines))
-    else:
-        sec_ranges.update(parse_wild_sections_google_ranges(lines))
+    # Found numpy section(s) => numpy-doc style
+    wild_headers = numpy_wild_headers if style == "numpy" else google_wild_headers
+    for section_name, ind_header in wild_headers.items():
+        # The section starts at the first line starting with its name or at
+        # its header if the name is preceded by whitespace (e.g. a tab)
+        start = next(
+            (i for i in range(ind_header + 1) if lines[i].startswith(section_name)),
+            ind_header,
+        )
+        sec_ranges[section_name] = [start, -1]
     sec_ranges = delimit_section_ranges(sec_ranges, len(lines))
     return sec_ranges, style
 
 
-def clean_section_ranges(ranges: Dict) -> Dict:
-    """Clean section ranges.
+def classify_lines(
+    lines: List[str],
+) -> Tuple[Dict[Tuple[str, str], List[int]], Dict[str, int], Dict[str, int]]:
+    """Find the section headers of all styles in a single pass.
+
+    Parameters
+    ----------
+    lines : List[str]
+        Lines of the docstring (without indentation).
 
-    If a section is empty, remove it.
+    Returns
+    -------
+    found_ranges : Dict[Tuple[str, str], List[int]]
+        Ranges of the sections found for each (style, section name). The end
+        is only found for the ReST sections (-1 otherwise).
+    numpy_wild_headers : Dict[str, int]
+        Index of the first header of each numpy wild section.
+    google_wild_headers : Dict[str, int]
+        Index of the first header of each google wild section.
     """
-    items = list(ranges.items())
-    for name, rng in items:
-        # Remove empty section
-        if rng[0] == -1:
-            del ranges[name]
-    return ranges
+    found_ranges: Dict[Tuple[str, str], List[int]] = {}
+    # ReST sections whose end is not found yet
+    open_ranges: List[Tuple[List[int], Tuple[str, ...]]] = []
+    numpy_wild_headers: Dict[str, int] = {}
+    google_wild_headers: Dict[str, int] = {}
+    for i, line in enumerate(lines):
+        if open_ranges:
+            for rng, prefixes_continue in open_ranges:
+                if not line.startswith(prefixes_continue):
+                    rng[1] = i
+            open_ranges = [item for item in open_ranges if item[0][1] == -1]
+        dash_next = len(lines) > i + 1 and lines[i + 1].startswith("---")
+        for style, name, prefixes, prefixes_continue in HEADER_TABLE.get(line[:1], []):
+            if (
+                (style, name) not in found_ranges
+                and line.startswith(prefixes)
+                and (style != "numpy" or dash_next)
+            ):
+                rng = [i, -1]
+                found_ranges[(style, name)] = rng
+                if style == "rest":
+                    open_ranges.append((rng, prefixes_continue))
+        if dash_next and not line.startswith(" "):
+            section_name = line[:-1].strip()
+            if section_name.lower() not in NUMPY_KNOWN_SECTIONS:
+                numpy_wild_headers.setdefault(section_name, i)
+        if is_define_section(line):
+            section_name = line[:-2].strip()
+            if section_name.lower() not in GOOGLE_KNOWN_SECTIONS:
+                google_wild_headers.setdefault(section_name, i)
+    return found_ranges, numpy_wild_headers, google_wild_headers
 
 
 def delimit_section_ranges(ranges: Dict, last_ind: int) -> Dict:
@@ -1,5 +1,6 @@
 """Signature related functions."""
 
+from bisect import bisect_right
 from typing import List, Optional
 
 from docstripy.lines_routines import clean_leading_empty, find_indent
@@ -60,6 +61,10 @@ def find_range_matching(
 ) -> List[List[int]]:
     """Find the ranges in ranges_docstr that matches ranges_def.
 
+    The matched docstrings are removed from ranges_docstr. The docstrings
+    are indexed by start line (they do not overlap) so that the matching
+    is done in near-linear time.
+
     Parameters
     ----------
     ranges_def : List[List[int]]
@@ -76,39 +81,40 @@ def find_range_matching(
         Ranges of the docstrings that matches the ranges in ranges_def.
     """
     corresp_ranges_docstr = [[-1, -1] for _ in ranges_def]
-    # Check the above line
-    for i_def, range_def in enumerate(ranges_def):
-        for i_doc, range_docstr in enumerate(ranges_docstr):
-            if range_docstr[0] - range_def[1] == 0:
-                corresp_ranges_docstr[i_def] = range_docstr
-                del ranges_docstr[i_doc]
-                continue
-    # If not in the above line: check the above line again
-    for i_def, range_def in enumerate(ranges_def):
-        if corresp_ranges_docstr[i_def] == [-1, -1]:
-            for i_doc, range_docstr in enumerate(ranges_docstr):
-                if range_docstr[0] - range_def[1] == 1:
+    # Unmatched docstrings indexed by start line
+    docstr_by_start = {range_docstr[0]: range_docstr for range_docstr in ranges_docstr}
+    # Check the above line, then (if not found) the line before
+    for offset in (0, 1):
+        for i_def, range_def in enumerate(ranges_def):
+            if corresp_ranges_docstr[i_def] == [-1, -1]:
+                range_docstr = docstr_by_start.pop(range_def[1] + offset, None)
+                if range_docstr is not None:
                     corresp_ranges_docstr[i_def] = range_docstr
-                    del ranges_docstr[i_doc]
-                    continue
     # Case where the function is __init__ and the docstring can be
     # right under the class definition
-    for i_def, range_def in enumerate(ranges_def):
-        if (
-            lines
-            and corresp_ranges_docstr[i_def] == [-1, -1]
-            and "def __init__" in lines[range_def[0]]
-        ):
-            sorted_ranges = sorted(
-                [rang for rang in ranges_docstr if rang[1] <= range_def[0]],
-                key=lambda x: x[0],
-                reverse=True,
-            )
-            if sorted_ranges and are_lines_class_head(
-                lines[sorted_ranges[0][1] : range_def[0]]
+    if lines:
+        # Unmatched docstrings sorted by end line to find the last
+        # docstring before each __init__
+        sorted_ranges = sorted(docstr_by_start.values(), key=lambda x: x[1])
+        ends = [range_docstr[1] for range_docstr in sorted_ranges]
+        for i_def, range_def in enumerate(ranges_def):
+            if (
+                corresp_ranges_docstr[i_def] != [-1, -1]
+                or "def __init__" not in lines[range_def[0]]
+            ):
+                continue
+            i_doc = bisect_right(ends, range_def[0]) - 1
+            if i_doc >= 0 and are_lines_class_head(
+                lines[sorted_ranges[i_doc][1] : range_def[0]]
             ):
-                corresp_ranges_docstr[i_def] = sorted_ranges[0]
-                del ranges_docstr[ranges_docstr.index(sorted_ranges[0])]
+                corresp_ranges_docstr[i_def] = sorted_ranges[i_doc]
+                del docstr_by_start[sorted_ranges[i_doc][0]]
+                del sorted_ranges[i_doc], ends[i_doc]
+    ranges_docstr[:] = [
+        range_docstr
+        for range_docstr in ranges_docstr
+        if range_docstr[0] in docstr_by_start
+    ]
     return corresp_ranges_docstr
 
 
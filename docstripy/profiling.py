@@ -0,0 +1,282 @@
+"""Opt-in timers of the docstripy processing stages."""
+
+import functools
+import heapq
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+# Number of slowest files and docstrings reported
+N_SLOWEST = 10
+# Context returned by the timers when the profiling is disabled
+NULL_STAGE: ContextManager[None] = nullcontext()
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class StageProfiler:
+    """Timers and counters of the processing stages.
+
+    The stages can be nested (e.g. "line_break" is called during
+    "build_docstring"), so the times of the stages are not additive.
+    Only the slowest files and docstrings are kept.
+
+    Parameters
+    ----------
+    n_slowest : int, optional
+        Number of slowest files and docstrings kept. By default, 10.
+    trace : bool, optional
+        Whether to record a trace event for each timed stage and file
+        (see :meth:`trace_events`). By default, False.
+
+    Attributes
+    ----------
+    stages : Dict[str, List[float]]
+        Number of calls and total time in seconds of each stage.
+    files : List[Tuple[float, str]]
+        Heap of the (time, path) of the slowest files.
+    docstrings : List[Tuple[float, str, int, int]]
+        Heap of the (time, path, start line, end line) of the slowest
+        docstrings (time to parse and build them).
+    current_path : str
+        Path of the file being processed.
+    events : List[dict] or None
+        Trace events of the stages and files (None if not traced).
+    """
+
+    def __init__(self, n_slowest: int = N_SLOWEST, *, trace: bool = False) -> None:
+        self.n_slowest = n_slowest
+        self.start_time = time.perf_counter()
+        self.stages: Dict[str, List[float]] = {}
+        self.files: List[Tuple[float, str]] = []
+        self.docstrings: List[Tuple[float, str, int, int]] = []
+        self.current_path = ""
+        self.events: Optional[List[dict]] = [] if trace else None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.add_stage(name, 1, end - start)
+            self.add_event(name, "stage", start, end)
+
+    @contextmanager
+    def file(self, path: str) -> Iterator[None]:
+        """Time the processing of a file."""
+        self.current_path = path
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.add_slowest(self.files, (end - start, path))
+            self.add_event(os.path.basename(path), "file", start, end, path=path)
+            self.current_path = ""
+
+    def add_event(
+        self, name: str, category: str, start: float, end: float, **args: str
+    ) -> None:
+        """Add a complete trace event of the current process and thread (if traced)."""
+        if self.events is None:
+            return
+        self.events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                # Timestamps in microseconds of the (system-wide) monotonic clock
+                "ts": start * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+        )
+
+    def add_stage(self, name: str, n_calls: int, duration: float) -> None:
+        """Add calls and time to a stage."""
+        counters = self.stages.setdefault(name, [0, 0.0])
+        counters[0] += n_calls
+        counters[1] += duration
+
+    def add_docstring(self, range_docstr: List[int], duration: float) -> None:
+        """Add the time to parse and build a docstring of the current file."""
+        self.add_slowest(
+            self.docstrings,
+            (duration, self.current_path, range_docstr[0], range_docstr[1]),
+        )
+
+    def add_slowest(self, heap: list, item: tuple) -> None:
+        """Add an item to a heap of the slowest items."""
+        if len(heap) < self.n_slowest:
+            heapq.heappush(heap, item)
+        elif heap and item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def pop(self) -> dict:
+        """Return the raw counters and reset them (used by worker processes)."""
+        counters = {
+            "stages": self.stages,
+            "files": self.files,
+            "docstrings": self.docstrings,
+            "events": self.events,
+        }
+        self.stages = {}
+        self.files = []
+        self.docstrings = []
+        if self.events is not None:
+            self.events = []
+        return counters
+
+    def merge(self, counters: dict) -> None:
+        """Merge the raw counters of another profiler (see :meth:`pop`).
+
+        The docstrings without path (notebook cells processed by worker
+        processes) are assigned to the current file.
+        """
+        for name, (n_calls, duration) in counters["stages"].items():
+            self.add_stage(name, n_calls, duration)
+        for duration, path in counters["files"]:
+            self.add_slowest(self.files, (duration, path))
+        for duration, path, start, end in counters["docstrings"]:
+            self.add_slowest(
+                self.docstrings, (duration, path or self.current_path, start, end)
+            )
+        if self.events is not None and counters["events"]:
+            self.events.extend(counters["events"])
+
+    def trace_events(self) -> dict:
+        """Return the trace of the run in the Chrome trace event format.
+
+        The trace can be opened in chrome://tracing or https://ui.perfetto.dev.
+        Each process is named after its role (main process or worker).
+        """
+        events = self.events or []
+        main_pid = os.getpid()
+        metadata = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": "main" if pid == main_pid else f"worker {pid}"},
+            }
+            for pid in sorted({event["pid"] for event in events} | {main_pid})
+        ]
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def report(self) -> dict:
+        """Return the JSON report of the run."""
+        return {
+            "wall_time": time.perf_counter() - self.start_time,
+            "stages": {
+                name: {"calls": int(n_calls), "time": duration}
+                for name, (n_calls, duration) in sorted(
+                    self.stages.items(), key=lambda item: -item[1][1]
+                )
+            },
+            "slowest_files": [
+                {"path": path, "time": duration}
+                for duration, path in sorted(self.files, reverse=True)
+            ],
+            "slowest_docstrings": [
+                {"path": path, "lines": [start, end], "time": duration}
+                for duration, path, start, end in sorted(self.docstrings, reverse=True)
+            ],
+        }
+
+    def summary(self) -> str:
+        """Return the summary table of the run."""
+        report = self.report()
+        table = [f"{'Stage':<24}{'Calls':>10}{'Time (s)':>12}{'Mean (ms)':>12}"]
+        for name, stage in report["stages"].items():
+            mean = 1e3 * stage["time"] / max(stage["calls"], 1)
+            table.append(
+                f"{name:<24}{stage['calls']:>10}{stage['time']:>12.3f}{mean:>12.3f}"
+            )
+        table.append(f"Wall time: {report['wall_time']:.3f} s")
+        if report["slowest_files"]:
+            table.append("Slowest files:")
+            table.extend(
+                f"  {file['time']:.3f} s  {file['path']}"
+                for file in report["slowest_files"]
+            )
+        if report["slowest_docstrings"]:
+            table.append("Slowest docstrings:")
+            table.extend(
+                f"  {doc['time'] * 1e3:.3f} ms  {doc['path']}:"
+                f"{doc['lines'][0] + 1}-{doc['lines'][1]}"
+                for doc in report["slowest_docstrings"]
+            )
+        return "\n".join(table)
+
+
+# Profiler of the current process (None if the profiling is disabled)
+PROFILER: Optional[StageProfiler] = None
+
+
+def set_profiler(*, enabled: bool, trace: bool = False) -> None:
+    """Enable or disable the profiling (and tracing) in the current process."""
+    global PROFILER
+    PROFILER = StageProfiler(trace=trace) if enabled else None
+
+
+def stage(name: str) -> ContextManager[None]:
+    """Time a stage if the profiling is enabled (no-op otherwise)."""
+    if PROFILER is None:
+        return NULL_STAGE
+    return PROFILER.stage(name)
+
+
+def timed(func: F) -> F:
+    """Time all the calls of a function as a stage named after the function."""
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if PROFILER is None:
+            return func(*args, **kwargs)
+        with PROFILER.stage(func.__name__):
+            return func(*args, **kwargs)
+
+    return cast(F, wrapper)
+
+
+def file_stage(path: str) -> ContextManager[None]:
+    """Time a file if the profiling is enabled (no-op otherwise)."""
+    if PROFILER is None:
+        return NULL_STAGE
+    return PROFILER.file(path)
+
+
+def print_profile(json_path: str = "") -> None:
+    """Print the summary table and optionally write the JSON report."""
+    if PROFILER is None:
+        return
+    print(PROFILER.summary())
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as file:
+            json.dump(PROFILER.report(), file, indent=2)
+
+
+def write_trace(path: str) -> None:
+    """Write the trace events of the run (see :meth:`StageProfiler.trace_events`)."""
+    if PROFILER is None:
+        return
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(PROFILER.trace_events(), file)
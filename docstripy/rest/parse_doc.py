@@ -1,9 +1,21 @@
 """Parser for ReST style docstrings."""
 
 import re
-from typing import Dict, List
+from typing import List
 
-from docstripy.lines_routines import find_prefix, remove_indent
+from docstripy.lines_routines import remove_indent
+
+# Prefixes of the first line and of the following lines of each section
+SECTION_PREFIXES = {
+    "_parameters": ((":param", ":type"), (":param", ":type", "\n", " ")),
+    "_raises": ((":raises",), (":raises", "\n", " ")),
+    "_returns": ((":return", ":rtype"), (":return", ":rtype", "\n", " ")),
+    "_yields": ((":yield",), (":yield", ":rtype", "\n", " ")),
+    "_attributes": (
+        (":ivar", ":var", ":cvar"),
+        (":ivar", ":var", ":cvar", ":type", "\n", " "),
+    ),
+}
 
 
 def parse_params(
@@ -69,29 +81,3 @@ def parse_params(
         elif len(params_list) > 0:
             params_list[-1]["description"].extend(remove_indent([line]))
     return params_list
-
-
-def parse_sections_ranges(lines: List[str]) -> Dict:
-    """Parse reStructuredText sections to the docstring."""
-    params_start, params_end = find_prefix(
-        lines, (":param", ":type"), (":param", ":type", "\n", " ")
-    )
-    raises_start, raises_end = find_prefix(lines, (":raises",), (":raises", "\n", " "))
-    returns_start, returns_end = find_prefix(
-        lines, (":return", ":rtype"), (":return", ":rtype", "\n", " ")
-    )
-    yields_start, yields_end = find_prefix(
-        lines, (":yield",), (":yield", ":rtype", "\n", " ")
-    )
-    attr_start, attr_end = find_prefix(
-        lines,
-        (":ivar", ":var", ":cvar"),
-        (":ivar", ":var", ":cvar", ":type", "\n", " "),
-    )
-    return {
-        "_parameters": [params_start, params_end],
-        "_raises": [raises_start, raises_end],
-        "_returns": [returns_start, returns_end],
-        "_yields": [yields_start, yields_end],
-        "_attributes": [attr_start, attr_end],
-    }
@@ -0,0 +1,169 @@
+"""Persistent worker processing JSON-lines requests (`docstripy --worker`).
+
+Each line of the input is a JSON request with either the "path" of a python
+file or an inline "source", the docstring options of :class:`Config`
+("style", "max_len", "indent", "add_missing", "include_type" and "engine"),
+optional "lines" ranges ``[[start, end], ...]`` (1-indexed, end included) to
+only format the docstrings overlapping them and an optional "id" copied in
+the response. Each response is a JSON line:
+
+* ``{"id": ..., "ok": true, "source": ..., "changed": ..., "time": ...}``
+* ``{"id": ..., "ok": false, "error": {"type": ..., "message": ...},
+  "time": ...}``
+
+The files are only read: the new source is returned in the response. With
+several jobs, the requests are processed concurrently and the responses are
+written in the order of completion.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import Future
+from functools import partial
+from typing import Any, Dict, TextIO
+
+from docstripy.api import Config, format_source
+from docstripy.write import make_executor
+
+# Maximum number of requests processed or queued per job
+IN_FLIGHT_PER_JOB = 2
+# Keys of a request that are not docstring options
+REQUEST_KEYS = ("id", "path", "source", "lines")
+
+
+def process_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Process a request and return its response."""
+    start = time.perf_counter()
+    response: Dict[str, Any] = {"id": request.get("id")}
+    try:
+        if ("path" in request) == ("source" in request):
+            raise ValueError("A request must contain either 'path' or 'source'.")
+        if "path" in request:
+            with open(request["path"], encoding="utf-8") as file:
+                text = file.read()
+        else:
+            text = request["source"]
+        config = Config(
+            **{key: val for key, val in request.items() if key not in REQUEST_KEYS}
+        )
+        new_text = format_source(text, config, lines=request.get("lines"))
+    except Exception as err:
+        # Any error is returned so that the worker keeps running
+        response.update(ok=False, error=make_error(err))
+    else:
+        response.update(ok=True, source=new_text, changed=new_text != text)
+    response["time"] = time.perf_counter() - start
+    return response
+
+
+def parse_request(line: str) -> Dict[str, Any]:
+    """Parse a request line (raise a ValueError if it is not a JSON object)."""
+    request = json.loads(line)
+    if not isinstance(request, dict):
+        raise ValueError(f"A request must be a JSON object (found {line.strip()}).")
+    return request
+
+
+def write_response(response: Dict[str, Any], output: TextIO) -> None:
+    """Write a response line and flush it."""
+    output.write(json.dumps(response) + "\n")
+    output.flush()
+
+
+def run_worker(input_: TextIO, output: TextIO, *, jobs: int = 1) -> None:
+    """Process the requests read from an input until its end.
+
+    Parameters
+    ----------
+    input_ : TextIO
+        Input of the JSON-lines requests (blank lines are ignored).
+    output : TextIO
+        Output of the JSON-lines responses.
+    jobs : int, optional
+        Number of worker processes. If 1, the requests are processed in order
+        in the current process. Otherwise, at most 2 requests per job are
+        processed or queued at the same time and each response is written as
+        soon as its request is processed. By default, 1.
+    """
+    if jobs <= 1:
+        for line in input_:
+            if line.strip():
+                write_response(handle_line(line), output)
+        return
+    # Responses written by the main thread and the callbacks of the futures
+    lock = threading.Lock()
+    slots = threading.BoundedSemaphore(IN_FLIGHT_PER_JOB * jobs)
+    with make_executor(jobs) as executor:
+        for line in input_:
+            if not line.strip():
+                continue
+            try:
+                request = parse_request(line)
+            except ValueError as err:
+                with lock:
+                    write_response(make_parse_error(err), output)
+                continue
+            slots.acquire()
+            future = executor.submit(process_request, request)
+            future.add_done_callback(
+                partial(
+                    write_done,
+                    request_id=request.get("id"),
+                    output=output,
+                    lock=lock,
+                    slots=slots,
+                )
+            )
+
+
+def write_done(
+    future: Future,
+    *,
+    request_id: Any,
+    output: TextIO,
+    lock: threading.Lock,
+    slots: threading.BoundedSemaphore,
+) -> None:
+    """Write the response of a processed request as soon as it is done.
+
+    The response is written even while the main thread waits for the next
+    request line, then a slot is freed for a new request.
+    """
+    try:
+        response = future.result()
+    except Exception as err:
+        # Worker process failure (e.g. killed)
+        response = {
+            "id": request_id,
+            "ok": False,
+            "error": make_error(err),
+            "time": 0.0,
+        }
+    try:
+        with lock:
+            write_response(response, output)
+    finally:
+        slots.release()
+
+
+def handle_line(line: str) -> Dict[str, Any]:
+    """Process a request line in the current process."""
+    try:
+        request = parse_request(line)
+    except ValueError as err:
+        return make_parse_error(err)
+    return process_request(request)
+
+
+def make_parse_error(err: ValueError) -> Dict[str, Any]:
+    """Create the response of a request line that could not be parsed."""
+    return {"id": None, "ok": False, "error": make_error(err), "time": 0.0}
+
+
+def make_error(err: Exception) -> Dict[str, str]:
+    """Create the structured error of a response."""
+    message = str(err)
+    if err.__cause__ is not None:
+        message += f" {type(err.__cause__).__name__}: {err.__cause__}"
+    return {"type": type(err).__name__, "message": message}
@@ -1,147 +1,638 @@
 """Main functions for parsing and building docstrings."""
 
+import copy
+import filecmp
+import json
 import os
 import os.path as osp
-from typing import List
-
-import nbformat
+import shutil
+import tempfile
+import time
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    TypeVar,
+)
 
+from docstripy import cache, profiling
 from docstripy.build_doc.main_builder import build_docstring
+from docstripy.cache import FileCache, set_section_store
 from docstripy.difference import apply_diff
+from docstripy.file_parser import iter_blocks
+from docstripy.git_diff import get_changed_lines
 from docstripy.lines_routines import add_eol, add_indent, find_indent
-from docstripy.parse_doc.main_parser import parse_docstring
+from docstripy.memo import DOCSTRING_MEMO, set_memo_size
+from docstripy.parse_doc.main_parser import find_docstrings, parse_single_docstring
+from docstripy.profiling import set_profiler, stage, timed
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+T = TypeVar("T")
+R = TypeVar("R")
+# Minimum number of lines of the blocks processed by `write_file_py_stream`
+STREAM_BLOCK_LINES = 2000
+# Serialization of the notebooks (same as nbformat)
+NOTEBOOK_JSON_KWARGS: Dict[str, Any] = {
+    "indent": 1,
+    "sort_keys": True,
+    "separators": (",", ": "),
+    "ensure_ascii": False,
+}
+# Field of the output path replaced by the style
+STYLE_FIELD = "{style}"
+PARSING_ERRORS = (
+    IndexError,
+    ValueError,
+    KeyError,
+    ArithmeticError,
+    IndentationError,
+    NameError,
+    TypeError,
+)
 
 
 def generate_new_file(file_lines: List[str], docstr_config: dict) -> List[str]:
     """Generate new file with the updated docstrings."""
+    return generate_new_files(file_lines, [docstr_config])[0]
+
+
+@timed
+def generate_new_files(
+    file_lines: List[str],
+    docstr_configs: List[dict],
+    line_ranges: Optional[List[Tuple[int, int]]] = None,
+) -> List[List[str]]:
+    """Generate new files with the updated docstrings for several configurations.
+
+    The file is parsed only once and the parsed docstrings are built for each
+    configuration. The configurations must only differ by the building
+    options (style, line length, indentation and types). The built docstrings
+    are cached in memory (see :mod:`docstripy.memo`) so that the docstrings
+    repeated across definitions and files are only parsed and built once.
+
+    Parameters
+    ----------
+    file_lines : List[str]
+        Lines of the file.
+    docstr_configs : List[dict]
+        Docstring configurations.
+    line_ranges : List[Tuple[int, int]] or None, optional
+        If not None, only the docstrings whose definition or docstring
+        overlaps one of these ranges of lines (0-indexed, end excluded) are
+        updated. By default, None.
+
+    Returns
+    -------
+    files_new_lines : List[List[str]]
+        Lines of the new file for each configuration.
+    """
     try:
-        add_missing = docstr_config["add_missing"]
-        range_docstrs, sections_list, to_insert = parse_docstring(
+        add_missing = docstr_configs[0]["add_missing"]
+        range_docstrs, docstr_jobs, to_insert = find_docstrings(
             file_lines,
             add_missing=add_missing,
+            engine=docstr_configs[0].get("engine", "lines"),
         )
-    except (
-        IndexError,
-        ValueError,
-        KeyError,
-        ArithmeticError,
-        IndentationError,
-        NameError,
-        ValueError,
-        TypeError,
-    ) as err:
+    except PARSING_ERRORS as err:
         raise ValueError("Error found during docstring parsing.") from err
-    new_lines = []
-    for range_doc, sections in zip(range_docstrs, sections_list):
-        try:
-            indent_base = find_indent(file_lines[range_doc[0] : range_doc[1]])
-            # If a blank line found: look for the next non blank line to get indentation
-            i = 1
-            while indent_base == -1 and range_doc[1] + i <= len(file_lines):
-                indent_base = find_indent(file_lines[range_doc[0] : range_doc[1] + i])
-            docstring = build_docstring(
-                sections=sections,
-                docstr_config=docstr_config,
-                indent_base=indent_base,
+    range_docstrs, docstr_jobs, to_insert = filter_docstrings(
+        range_docstrs, docstr_jobs, to_insert, line_ranges
+    )
+    frozen_configs = [tuple(sorted(config.items())) for config in docstr_configs]
+    new_lines: List[List[str]] = [[] for _ in docstr_configs]
+    # Docstrings to build (not found in the in-memory cache): index, base
+    # indentation and (configuration index, cache key) of the missing builds
+    to_build: List[Tuple[int, int, List[Tuple[int, Hashable]]]] = []
+    for ind, range_doc in enumerate(range_docstrs):
+        lines_docstr, lines_def = docstr_jobs[ind]
+        indent_base = find_docstring_indent(file_lines, range_doc)
+        missing: List[Tuple[int, Hashable]] = []
+        for i_config, frozen_config in enumerate(frozen_configs):
+            key = (
+                None if lines_def is None else tuple(lines_def),
+                tuple(lines_docstr),
+                frozen_config,
+                indent_base,
             )
-        except (
-            IndexError,
-            ValueError,
-            KeyError,
-            ArithmeticError,
-            IndentationError,
-            NameError,
-            ValueError,
-            TypeError,
-        ) as err:
-            raise ValueError(
-                f"Error found at lines {range_doc[0]}-{range_doc[1]} "
-                "during docstring building. Please check above error."
-            ) from err
-        docstring = add_indent(docstring, indent_base)
-        new_lines.append("".join(docstring))
-    file_new_lines = apply_diff(
-        ranges=range_docstrs,
-        lines=new_lines,
-        old_lines=file_lines,
-        to_insert=to_insert,
+            docstring = DOCSTRING_MEMO.get(key)
+            if docstring is None:
+                missing.append((i_config, key))
+            new_lines[i_config].append(docstring or "")
+        if missing:
+            to_build.append((ind, indent_base, missing))
+    # Sections already parsed by previous runs (if the section store is enabled)
+    store = cache.SECTION_STORE
+    store_keys = []
+    stored_sections: Dict[str, dict] = {}
+    if store is not None and to_build:
+        with stage("section_store"):
+            store_keys = [store.get_key(*docstr_jobs[ind]) for ind, _, _ in to_build]
+            stored_sections = store.get_many(store_keys)
+    profiler = profiling.PROFILER
+    for i_build, (ind, indent_base, missing_builds) in enumerate(to_build):
+        start = time.perf_counter()
+        range_doc = range_docstrs[ind]
+        sections = stored_sections.get(store_keys[i_build]) if store_keys else None
+        if sections is None:
+            try:
+                sections = parse_single_docstring(*docstr_jobs[ind])
+            except PARSING_ERRORS as err:
+                raise ValueError("Error found during docstring parsing.") from err
+            if store is not None:
+                # Stored before building as the builders modify the sections
+                store.put(store_keys[i_build], sections)
+        for i_missing, (i_config, memo_key) in enumerate(missing_builds):
+            try:
+                with stage("build_docstring"):
+                    docstring_lines = build_docstring(
+                        # The builders modify the sections: copy them for all
+                        # the builds but the last one
+                        sections=(
+                            sections
+                            if i_missing == len(missing_builds) - 1
+                            else copy.deepcopy(sections)
+                        ),
+                        docstr_config=docstr_configs[i_config],
+                        indent_base=indent_base,
+                    )
+            except PARSING_ERRORS as err:
+                raise ValueError(
+                    f"Error found at lines {range_doc[0]}-{range_doc[1]} "
+                    "during docstring building. Please check above error."
+                ) from err
+            docstring = "".join(add_indent(docstring_lines, indent_base))
+            new_lines[i_config][ind] = docstring
+            DOCSTRING_MEMO.put(memo_key, docstring)
+        if profiler is not None:
+            profiler.add_docstring(range_doc, time.perf_counter() - start)
+    if store is not None:
+        with stage("section_store"):
+            store.flush()
+    with stage("apply_diff"):
+        return [
+            apply_diff(
+                ranges=range_docstrs,
+                lines=config_new_lines,
+                old_lines=file_lines,
+                to_insert=to_insert,
+            )
+            for config_new_lines in new_lines
+        ]
+
+
+def filter_docstrings(
+    range_docstrs: List[List[int]],
+    docstr_jobs: List[Tuple[List[str], Optional[List[str]]]],
+    to_insert: List[bool],
+    line_ranges: Optional[List[Tuple[int, int]]],
+) -> Tuple[List[List[int]], List[Tuple[List[str], Optional[List[str]]]], List[bool]]:
+    """Keep the docstrings whose definition or docstring overlaps a line range.
+
+    All the docstrings are kept if line_ranges is None.
+    """
+    if line_ranges is None:
+        return range_docstrs, docstr_jobs, to_insert
+    kept = []
+    for ind, range_doc in enumerate(range_docstrs):
+        lines_def = docstr_jobs[ind][1]
+        # The definition (or the class line) is just before the docstring
+        start = range_doc[0] - (1 if lines_def is None else len(lines_def))
+        end = range_doc[0] if to_insert[ind] else range_doc[1]
+        if any(
+            start < range_end and range_start < end
+            for range_start, range_end in line_ranges
+        ):
+            kept.append(ind)
+    return (
+        [range_docstrs[ind] for ind in kept],
+        [docstr_jobs[ind] for ind in kept],
+        [to_insert[ind] for ind in kept],
     )
-    return file_new_lines
 
 
+def make_line_ranges(lines: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Convert ranges of lines (1-indexed, end included) to 0-indexed ranges.
+
+    Raise a ValueError if a range does not start at line 1 or after, or ends
+    before its start.
+    """
+    line_ranges = []
+    for start, end in lines:
+        if start < 1 or end < start:
+            raise ValueError(
+                f"Invalid range of lines: {start}:{end} (expected 1 <= START <= END)."
+            )
+        line_ranges.append((start - 1, end))
+    return line_ranges
+
+
+def find_docstring_indent(file_lines: List[str], range_doc: List[int]) -> int:
+    """Find the base indentation of a docstring."""
+    indent_base = find_indent(file_lines[range_doc[0] : range_doc[1]])
+    # If a blank line found: look for the next non blank line to get indentation
+    i = 1
+    while indent_base == -1 and range_doc[1] + i <= len(file_lines):
+        indent_base = find_indent(file_lines[range_doc[0] : range_doc[1] + i])
+        i += 1
+    return indent_base
+
+
+@timed
 def write_file_py(
     in_path: str,
     out_path: str,
     *,
     overwrite: bool,
     docstr_config: dict,
-) -> None:
-    """Write new docstrings on a file."""
+    diff_args: Optional[List[str]] = None,
+    line_ranges: Optional[List[Tuple[int, int]]] = None,
+) -> bool:
+    """Write new docstrings on a file and return whether the content changed.
+
+    If line_ranges is not None, only the docstrings overlapping these ranges
+    of lines (0-indexed, end excluded) are updated. If diff_args is not None,
+    only the docstrings overlapping the lines changed in
+    `git diff <diff_args>` are updated.
+    """
     if out_path and not out_path.endswith(".py"):
         raise ValueError(f"Output file must be a .py file (found {out_path}).")
-    with open(in_path, encoding="utf-8") as file:
+    docstr_configs = split_styles(docstr_config)
+    out_paths = get_style_paths(out_path, docstr_configs, overwrite=overwrite)
+    if diff_args is not None:
+        line_ranges = get_changed_lines(in_path, diff_args)
+    with stage("read_file"), open(in_path, encoding="utf-8") as file:
         file_lines = file.readlines()
-    file_new_lines = generate_new_file(file_lines, docstr_config)
-    out_path = in_path if overwrite else out_path
-    if osp.dirname(out_path):
-        os.makedirs(osp.dirname(out_path), exist_ok=True)
-    with open(out_path, "w", encoding="utf-8") as file:
-        file.writelines(file_new_lines)
+    files_new_lines = generate_new_files(file_lines, docstr_configs, line_ranges)
+    changed = any(file_new_lines != file_lines for file_new_lines in files_new_lines)
+    with stage("write_file"):
+        if overwrite:
+            if changed:
+                write_file_atomic(in_path, "".join(files_new_lines[0]))
+        else:
+            for style_out_path, file_new_lines in zip(out_paths, files_new_lines):
+                write_file_if_different(style_out_path, "".join(file_new_lines))
+    return changed
 
 
+@timed
 def write_file_ipynb(
     in_path: str,
     out_path: str,
     *,
     overwrite: bool,
     docstr_config: dict,
-) -> None:
-    """Write new docstrings on a file."""
+    jobs: int = 1,
+) -> bool:
+    """Write new docstrings on a notebook and return whether the content changed.
+
+    Only the code cells are processed and only their source is modified: the
+    notebook is not validated and the outputs are written back as they are.
+    Notebooks left unchanged are not written again.
+
+    Parameters
+    ----------
+    in_path : str
+        Path of the notebook.
+    out_path : str
+        Path of the output notebook (ignored if overwrite is True).
+    overwrite : bool
+        Whether to overwrite the notebook or not.
+    docstr_config : dict
+        Docstring configuration.
+    jobs : int, optional
+        Number of worker processes used to process the code cells. If 1, the
+        cells are processed in the current process. By default, 1.
+
+    Returns
+    -------
+    changed : bool
+        Whether the content of the notebook changed.
+    """
     if out_path and not out_path.endswith(".ipynb"):
         raise ValueError(f"Output file must be a .ipynb file (found {out_path}).")
-    with open(in_path, encoding="utf-8") as file:
-        file_dict = nbformat.read(file, as_version=nbformat.NO_CONVERT)
-    for i_cell, cell in enumerate(file_dict["cells"]):
-        cell_lines = cell["source"].split("\n")
-        cell_lines = add_eol(cell_lines)
-        cell_new_lines = generate_new_file(cell_lines, docstr_config)
-        file_dict["cells"][i_cell]["source"] = "".join(cell_new_lines)
-    out_path = in_path if overwrite else out_path
-    if osp.dirname(out_path):
-        os.makedirs(osp.dirname(out_path), exist_ok=True)
-    with open(out_path, "w", encoding="utf-8") as file:
-        nbformat.write(file_dict, file)
+    docstr_configs = split_styles(docstr_config)
+    out_paths = get_style_paths(out_path, docstr_configs, overwrite=overwrite)
+    with stage("read_file"), open(in_path, encoding="utf-8") as file:
+        content = file.read()
+        file_dict = json.loads(content)
+    code_cells = [cell for cell in file_dict["cells"] if cell["cell_type"] == "code"]
+    # The sources are stored as a string or as a list of lines
+    old_values = [cell["source"] for cell in code_cells]
+    sources = [
+        value if isinstance(value, str) else "".join(value) for value in old_values
+    ]
+    cells_new_sources = map_jobs(
+        partial(generate_new_sources, docstr_configs=docstr_configs),
+        sources,
+        jobs=jobs,
+    )
+    contents = []
+    changed = False
+    for i_config in range(len(docstr_configs)):
+        new_sources = [
+            cell_new_sources[i_config] for cell_new_sources in cells_new_sources
+        ]
+        if new_sources == sources:
+            contents.append(content)
+            continue
+        changed = True
+        # Only patch the sources of the changed cells
+        for cell, old_value, source, new_source in zip(
+            code_cells, old_values, sources, new_sources
+        ):
+            if new_source == source:
+                cell["source"] = old_value
+            elif isinstance(old_value, str):
+                cell["source"] = new_source
+            else:
+                cell["source"] = new_source.splitlines(keepends=True)
+        new_content = json.dumps(file_dict, **NOTEBOOK_JSON_KWARGS)
+        if not new_content.endswith("\n"):
+            new_content += "\n"
+        contents.append(new_content)
+    with stage("write_file"):
+        if overwrite:
+            if changed:
+                write_file_atomic(in_path, contents[0])
+        else:
+            for style_out_path, new_content in zip(out_paths, contents):
+                write_file_if_different(style_out_path, new_content)
+    return changed
 
 
-def write_files_recursive(
+def generate_new_sources(source: str, docstr_configs: List[dict]) -> List[str]:
+    """Generate the new source of a notebook cell for each configuration."""
+    cell_lines = add_eol(source.split("\n"))
+    if source.endswith("\n"):
+        cell_lines.pop()  # Empty line after the last end of line
+    new_sources = []
+    for cell_new_lines in generate_new_files(cell_lines, docstr_configs):
+        new_source = "".join(cell_new_lines)
+        if not source.endswith("\n") and new_source.endswith("\n"):
+            # Remove the end of line added to the last line
+            new_source = new_source[:-1]
+        new_sources.append(new_source)
+    return new_sources
+
+
+def split_styles(docstr_config: dict) -> List[dict]:
+    """Split a configuration with comma separated styles (one per style)."""
+    return [
+        {**docstr_config, "style": style.strip()}
+        for style in docstr_config["style"].split(",")
+    ]
+
+
+def get_style_paths(
+    out_path: str,
+    docstr_configs: List[dict],
+    *,
+    overwrite: bool,
+) -> List[str]:
+    """Get the output path of each style by replacing "{style}" in the path.
+
+    Raise a ValueError if there are multiple styles and the output path does
+    not contain "{style}" (or the files are overwritten).
+    """
+    if len(docstr_configs) > 1 and (overwrite or STYLE_FIELD not in out_path):
+        raise ValueError(
+            "The output path must contain '{style}' when using multiple styles "
+            f"(found {out_path!r})."
+        )
+    return [out_path.replace(STYLE_FIELD, config["style"]) for config in docstr_configs]
+
+
+def write_file_if_different(path: str, content: str) -> None:
+    """Write a file unless it already exists with the same content."""
+    if osp.isfile(path):
+        with open(path, encoding="utf-8") as file:
+            if file.read() == content:
+                return
+    write_file_atomic(path, content)
+
+
+def write_file_atomic(path: str, content: str) -> None:
+    """Write a file atomically.
+
+    The content is written in a temporary file of the same directory that
+    replaces the file at the end, so that an interrupted run never leaves a
+    partially written file.
+    """
+    fd, tmp_path = make_temp_file(path)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(content)
+        replace_file(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def make_temp_file(path: str) -> Tuple[int, str]:
+    """Create a temporary file next to a file and return its descriptor and path."""
+    dir_path = osp.dirname(path)
+    if dir_path:
+        os.makedirs(dir_path, exist_ok=True)
+    return tempfile.mkstemp(
+        prefix=f".{osp.basename(path)}.",
+        suffix=".tmp",
+        dir=dir_path or ".",
+    )
+
+
+def replace_file(tmp_path: str, path: str) -> None:
+    """Replace a file by a temporary file, keeping the file permissions."""
+    if osp.exists(path):
+        shutil.copymode(path, tmp_path)
+    else:
+        # Permissions of a newly created file (mkstemp uses 0o600)
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+    os.replace(tmp_path, path)
+
+
+@timed
+def write_file_py_stream(
     in_path: str,
     out_path: str,
     *,
     overwrite: bool,
     docstr_config: dict,
-) -> None:
-    """Write new docstrings on all files in a folder."""
-    error_paths = []
-    write_func = {
-        ".py": write_file_py,
-        ".ipynb": write_file_ipynb,
-    }
-    for dir_path, _, file_names in os.walk(in_path):
-        for file_name in file_names:
-            if file_name.endswith(tuple(write_func.keys())):
-                ext = osp.splitext(file_name)[1]
-                file_path = osp.join(dir_path, file_name)
-                rel_path = osp.relpath(file_path, in_path)
-                file_out_path = osp.join(out_path, rel_path)
+    diff_args: Optional[List[str]] = None,
+    line_ranges: Optional[List[Tuple[int, int]]] = None,
+) -> bool:
+    """Write new docstrings on a file by blocks and return whether it changed.
+
+    The file is read lazily by blocks of top-level statements (see
+    :func:`docstripy.file_parser.iter_blocks`) and each new block is directly
+    written in a temporary file that replaces the output file at the end.
+    The memory used is bounded by the largest block instead of the file size.
+    The line_ranges and diff_args restrict the updated docstrings as in
+    :func:`write_file_py`.
+    """
+    if out_path and not out_path.endswith(".py"):
+        raise ValueError(f"Output file must be a .py file (found {out_path}).")
+    docstr_configs = split_styles(docstr_config)
+    out_paths = get_style_paths(out_path, docstr_configs, overwrite=overwrite)
+    if diff_args is not None:
+        line_ranges = get_changed_lines(in_path, diff_args)
+    if overwrite:
+        out_paths = [in_path]
+    tmp_paths: List[str] = []
+    tmp_files: List[TextIO] = []
+    changed = False
+    try:
+        for style_out_path in out_paths:
+            fd, tmp_path = make_temp_file(style_out_path)
+            tmp_paths.append(tmp_path)
+            tmp_files.append(os.fdopen(fd, "w", encoding="utf-8"))
+        with open(in_path, encoding="utf-8") as file:
+            block_start = 0
+            for block in iter_blocks(file, min_lines=STREAM_BLOCK_LINES):
                 try:
-                    write_func[ext](
-                        in_path=file_path,
-                        out_path=file_out_path,
-                        overwrite=overwrite,
-                        docstr_config=docstr_config,
+                    blocks_new_lines = generate_new_files(
+                        block,
+                        docstr_configs,
+                        # Ranges relative to the block
+                        line_ranges=(
+                            None
+                            if line_ranges is None
+                            else [
+                                (start - block_start, end - block_start)
+                                for start, end in line_ranges
+                            ]
+                        ),
                     )
-                except (IndexError, ValueError):
-                    error_paths.append(file_path)
+                except ValueError as err:
+                    raise ValueError(
+                        f"Error found in the block starting at line {block_start}."
+                    ) from err
+                with stage("write_file"):
+                    for tmp_file, block_new_lines in zip(tmp_files, blocks_new_lines):
+                        changed = changed or block_new_lines != block
+                        tmp_file.writelines(block_new_lines)
+                block_start += len(block)
+        for tmp_file in tmp_files:
+            tmp_file.close()
+        for tmp_path, style_out_path in zip(tmp_paths, out_paths):
+            if (overwrite and not changed) or (
+                not overwrite
+                and osp.isfile(style_out_path)
+                and filecmp.cmp(tmp_path, style_out_path, shallow=False)
+            ):
+                os.remove(tmp_path)
+            else:
+                replace_file(tmp_path, style_out_path)
+    except BaseException:
+        for tmp_file in tmp_files:
+            tmp_file.close()
+        for tmp_path in tmp_paths:
+            if osp.exists(tmp_path):
+                os.remove(tmp_path)
+        raise
+    return changed
+
+
+WRITE_FUNCS: Dict[str, Callable[..., bool]] = {
+    ".py": write_file_py,
+    ".ipynb": write_file_ipynb,
+}
+
+
+@timed
+def write_files_recursive(
+    in_path: str,
+    out_path: str,
+    *,
+    overwrite: bool,
+    docstr_config: dict,
+    jobs: int = 1,
+    cache_dir: str = "",
+    stream: bool = False,
+    paths: Optional[Set[str]] = None,
+    diff_args: Optional[List[str]] = None,
+) -> None:
+    """Write new docstrings on all files in a folder.
+
+    Parameters
+    ----------
+    in_path : str
+        Root directory of the files to process.
+    out_path : str
+        Root directory of the output files (ignored if overwrite is True).
+    overwrite : bool
+        Whether to overwrite the files or not.
+    docstr_config : dict
+        Docstring configuration.
+    jobs : int, optional
+        Number of worker processes. If 1, the files are processed in the
+        current process. By default, 1.
+    cache_dir : str, optional
+        Directory of the cache of unchanged files. Files found in the cache
+        are not processed again. If empty, the cache is disabled.
+        By default, "".
+    stream : bool, optional
+        Whether to process the .py files by blocks to bound the memory used
+        by large files (see :func:`write_file_py_stream`). By default, False.
+    paths : Set[str] or None, optional
+        If not None, only process these files (real paths) instead of all the
+        files of the folder (see :func:`docstripy.git_diff.get_changed_files`).
+        By default, None.
+    diff_args : List[str] or None, optional
+        If not None, only update the docstrings of the .py files overlapping
+        the lines changed in `git diff <diff_args>`. By default, None.
+    """
+    # Check the output path of the styles before processing the files
+    get_style_paths(out_path, split_styles(docstr_config), overwrite=overwrite)
+    tasks = list(find_file_tasks(in_path, out_path, paths))
+    file_cache = (
+        FileCache(cache_dir, docstr_config, stream=stream) if cache_dir else None
+    )
+    if file_cache is not None:
+        uncached_tasks = []
+        for file_path, file_out_path in tasks:
+            if not file_cache.is_unchanged(file_path):
+                uncached_tasks.append((file_path, file_out_path))
+            elif not overwrite:
+                for style_out_path in get_style_paths(
+                    file_out_path, split_styles(docstr_config), overwrite=overwrite
+                ):
+                    copy_file(file_path, style_out_path)
+        tasks = uncached_tasks
+    results = map_jobs(
+        partial(
+            write_file_task,
+            overwrite=overwrite,
+            docstr_config=docstr_config,
+            stream=stream,
+            diff_args=diff_args,
+        ),
+        tasks,
+        jobs=jobs,
+    )
+    if file_cache is not None:
+        for (file_path, _), status in zip(tasks, results):
+            # Files partially processed may change when fully processed
+            if status == "unchanged" and diff_args is None:
+                file_cache.add_unchanged(file_path)
+        file_cache.save()
+        print(f"Cache: {file_cache.hits} hit(s), {file_cache.misses} miss(es).")
+    error_paths = [
+        file_path for (file_path, _), status in zip(tasks, results) if status == "error"
+    ]
     if error_paths:
         err_message = "Error when parsing file(s):\n"
         err_message += "\n".join(error_paths)
@@ -149,3 +640,137 @@ def write_files_recursive(
             "\nRun `docstripy` on those files individually to get error lines."
         )
         print(err_message)
+
+
+def map_jobs(func: Callable[[T], R], items: List[T], jobs: int) -> List[R]:
+    """Apply a function on items with worker processes if jobs > 1.
+
+    The results are returned in the order of the items.
+    """
+    if jobs <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    profiler = profiling.PROFILER
+    with make_executor(min(jobs, len(items))) as executor:
+        chunksize = max(1, len(items) // (jobs * 8))
+        if profiler is None:
+            return list(executor.map(func, items, chunksize=chunksize))
+        # Send the timers of the workers back with the results
+        results = []
+        for result, counters in executor.map(
+            partial(run_profiled, func), items, chunksize=chunksize
+        ):
+            profiler.merge(counters)
+            results.append(result)
+        return results
+
+
+def make_executor(max_workers: int) -> "ProcessPoolExecutor":
+    """Create worker processes with the caches and profiling of the current one."""
+    # Imported here as most runs use a single process (slow import)
+    from concurrent.futures import ProcessPoolExecutor
+
+    profiler = profiling.PROFILER
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=partial(
+            init_worker,
+            profile=profiler is not None,
+            trace=profiler is not None and profiler.events is not None,
+        ),
+        initargs=(
+            DOCSTRING_MEMO.max_size,
+            "" if cache.SECTION_STORE is None else cache.SECTION_STORE.cache_dir,
+        ),
+    )
+
+
+def init_worker(
+    memo_size: int,
+    store_dir: str,
+    *,
+    profile: bool = False,
+    trace: bool = False,
+) -> None:
+    """Initialize the docstring caches and the profiling of a worker process."""
+    set_memo_size(memo_size)
+    set_section_store(store_dir)
+    set_profiler(enabled=profile, trace=trace)
+
+
+def run_profiled(func: Callable[[T], R], item: T) -> Tuple[R, dict]:
+    """Apply a function in a worker process and return the result and timers."""
+    result = func(item)
+    return result, profiling.PROFILER.pop() if profiling.PROFILER else {}
+
+
+def find_file_tasks(
+    in_path: str,
+    out_path: str,
+    paths: Optional[Set[str]] = None,
+) -> Iterator[Tuple[str, str]]:
+    """Find the (input, output) paths of all files to process in a folder.
+
+    If paths is not None, only the files of the folder in paths (real paths)
+    are processed and the folder is not walked. Like :func:`os.walk`, no file
+    is found if in_path is a file.
+    """
+    if paths is not None:
+        if not osp.isdir(in_path):
+            return
+        real_in_path = osp.realpath(in_path)
+        for path in sorted(paths):
+            rel_path = osp.relpath(path, real_in_path)
+            if path.endswith(tuple(WRITE_FUNCS.keys())) and not rel_path.startswith(
+                os.pardir
+            ):
+                yield osp.join(in_path, rel_path), osp.join(out_path, rel_path)
+        return
+    for dir_path, _, file_names in os.walk(in_path):
+        for file_name in file_names:
+            if file_name.endswith(tuple(WRITE_FUNCS.keys())):
+                file_path = osp.join(dir_path, file_name)
+                rel_path = osp.relpath(file_path, in_path)
+                yield file_path, osp.join(out_path, rel_path)
+
+
+def write_file_task(
+    task: Tuple[str, str],
+    *,
+    overwrite: bool,
+    docstr_config: dict,
+    stream: bool = False,
+    diff_args: Optional[List[str]] = None,
+) -> str:
+    """Write new docstrings on a single file and return the status of the file.
+
+    Run in the worker processes when processing a folder in parallel.
+    The status is one of "changed", "unchanged" or "error". If stream is True,
+    the .py files are processed by blocks. If diff_args is not None, only the
+    docstrings of the .py files overlapping the changed lines are updated.
+    """
+    file_path, file_out_path = task
+    ext = osp.splitext(file_path)[1]
+    write_func: Callable[..., bool] = (
+        write_file_py_stream if stream and ext == ".py" else WRITE_FUNCS[ext]
+    )
+    kwargs = {"diff_args": diff_args} if ext == ".py" else {}
+    try:
+        with profiling.file_stage(file_path):
+            changed = write_func(
+                in_path=file_path,
+                out_path=file_out_path,
+                overwrite=overwrite,
+                docstr_config=docstr_config,
+                **kwargs,
+            )
+    except (IndexError, KeyError, OSError, ValueError):
+        # Also unreadable files and notebooks missing keys (e.g. "cells")
+        return "error"
+    return "changed" if changed else "unchanged"
+
+
+def copy_file(in_path: str, out_path: str) -> None:
+    """Copy a file left unchanged by docstripy to the output path."""
+    with open(in_path, encoding="utf-8") as file:
+        content = file.read()
+    write_file_if_different(out_path, content)
@@ -0,0 +1,67 @@
+"""Test the library API."""
+
+import pytest_check as check
+
+from docstripy import Config, format_many, format_source
+from docstripy.write import generate_new_file
+
+
+def test_config() -> None:
+    """Test the checks, hash and conversions of the configuration."""
+    config = Config(style="google", max_len=88)
+    check.equal(hash(config), hash(Config(style="google", max_len=88)))
+    check.not_equal(config, Config(style="rest", max_len=88))
+    check.equal(Config.from_dict(config.to_dict()), config)
+    check.equal(config.docstr_configs, [config.to_dict()])
+    with check.raises(ValueError):
+        Config(style="unknown")
+    with check.raises(ValueError):
+        Config(engine="unknown")
+
+
+def test_format_source() -> None:
+    """Test formatting python sources in memory."""
+    config = Config(style="rest", max_len=88)
+    with open("tests/files/test1.py", encoding="utf-8") as file:
+        text = file.read()
+    new_text = format_source(text, config)
+    with open("tests/files/test1.py", encoding="utf-8") as file:
+        lines = file.readlines()
+    check.equal(new_text, "".join(generate_new_file(lines, config.to_dict())))
+    # Last line without end of line
+    check.equal(
+        format_source("def func(a):\n    return a", config),
+        'def func(a):\n    """Func function."""\n    return a',
+    )
+    check.equal(format_many([text, ""], config, jobs=2), [new_text, ""])
+    with check.raises(ValueError):
+        format_source("def func(:\n", Config(engine="ast"))
+
+
+def test_format_source_lines() -> None:
+    """Test formatting only the docstrings overlapping ranges of lines."""
+    config = Config(style="google", max_len=88)
+    with open("tests/files/test1.py", encoding="utf-8") as file:
+        text = file.read()
+    full_text = format_source(text, config)
+    new_text = format_source(text, config, lines=[(9, 9)])
+    # Only the docstring of `factorial` (lines 9-24) is formatted
+    split = "\ndef fibonacci"
+    check.equal(new_text.split(split)[0], full_text.split(split)[0])
+    check.equal(new_text.split(split)[1], text.split(split)[1])
+    check.not_equal(full_text.split(split)[1], text.split(split)[1])
+    # A definition line selects its missing docstring
+    check.equal(
+        format_source(
+            "def f(a):\n    return a\n\n\ndef g(b):\n    return b\n",
+            config,
+            lines=[(5, 5)],
+        ),
+        'def f(a):\n    return a\n\n\ndef g(b):\n    """G function."""\n'
+        "    return b\n",
+    )
+    check.equal(format_source(text, config, lines=[(1, 200)]), full_text)
+    check.equal(format_source(text, config, lines=[]), text)
+    for invalid_range in [(0, 3), (5, 4)]:
+        with check.raises(ValueError):
+            format_source(text, config, lines=[invalid_range])
@@ -0,0 +1,90 @@
+"""Test the formatting daemon and its client."""
+
+import os
+import shutil
+import socket
+import threading
+from http.server import HTTPServer
+
+import pytest
+import pytest_check as check
+
+from docstripy import daemon
+from docstripy.api import Config, format_source
+from docstripy.daemon import (
+    DaemonHandler,
+    format_with_daemon,
+    make_config_headers,
+    parse_config_headers,
+    write_file_py_daemon,
+)
+
+
+def test_config_headers() -> None:
+    """Test the conversion of the configuration to headers and back."""
+    config = Config(style="google", max_len=70, add_missing=False)
+    headers = make_config_headers(config.to_dict())
+    check.equal(headers["X-Add-Missing"], "0")
+    check.equal(parse_config_headers(headers), config)
+    check.equal(parse_config_headers({}), Config())
+    for header, value in [("X-Indent", "a"), ("X-Include-Type", "yes")]:
+        with check.raises(ValueError):
+            parse_config_headers({header: value})
+
+
+def test_daemon(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test formatting sources with a running daemon."""
+    server = HTTPServer(("localhost", 0), DaemonHandler)
+    url = f"http://localhost:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        config = Config(style="rest", max_len=70)
+        with open("tests/files/test1.py", encoding="utf-8") as file:
+            text = file.read()
+        new_text = format_source(text, config)
+        check.equal(format_with_daemon(text, config.to_dict(), url), new_text)
+        # Unchanged source
+        check.equal(format_with_daemon(new_text, config.to_dict(), url), new_text)
+        with check.raises(ValueError):
+            format_with_daemon(
+                "def func(:\n", {**config.to_dict(), "engine": "ast"}, url
+            )
+
+        # Unexpected errors are reported instead of closing the connection
+        def fail(_text: str, _config: Config) -> str:
+            raise KeyError("unexpected")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(daemon, "format_source", fail)
+            with pytest.raises(ValueError, match="KeyError: 'unexpected'"):
+                format_with_daemon(text, config.to_dict(), url)
+        out_path = "tests/tmp/daemon/{style}.py"
+        changed = write_file_py_daemon(
+            "tests/files/test1.py",
+            out_path,
+            overwrite=False,
+            docstr_config={**config.to_dict(), "style": "rest,numpy"},
+            url=url,
+        )
+        check.is_true(changed)
+        with open("tests/tmp/daemon/rest.py", encoding="utf-8") as file:
+            check.equal(file.read(), new_text)
+        if os.path.exists("tests/tmp"):
+            shutil.rmtree("tests/tmp")
+    finally:
+        server.shutdown()
+        server.server_close()
+    # Daemon not running
+    check.is_none(format_with_daemon(text, config.to_dict(), url))
+
+
+def test_daemon_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a daemon that does not respond in time is not reachable."""
+    monkeypatch.setattr(daemon, "DAEMON_TIMEOUT", 0.2)
+    # Connections accepted by the system but never answered
+    with socket.socket() as server:
+        server.bind(("localhost", 0))
+        server.listen()
+        url = f"http://localhost:{server.getsockname()[1]}"
+        check.is_none(format_with_daemon("x = 1\n", Config().to_dict(), url))
@@ -1,9 +1,11 @@
 """Test file writting."""
 
+import time
+
 import pytest
 import pytest_check as check
 
-from docstripy.difference import apply_diff
+from docstripy.difference import apply_diff, split_line
 
 
 def test_apply_diff() -> None:
@@ -41,3 +43,30 @@ def test_apply_diff() -> None:
 
     with pytest.raises(ValueError, match="Found overlapping docstring line ranges."):
         apply_diff([[7, 23], [15, 32]], text, lines)
+
+    # Insertion and overwrite of the same range: insertion first
+    new_lines = apply_diff([[8, 9], [8, 9]], text[::-1], lines, to_insert=[False, True])
+    check.equal(new_lines[8], '    r"""New function."""\n')
+    check.equal(new_lines[9:12], split_line(text[1]))
+    check.equal(new_lines[12], lines[9])
+
+
+def test_apply_diff_scaling() -> None:
+    """Test that apply_diff runs in linear time with many docstrings."""
+
+    def run_apply_diff(n_funcs: int) -> float:
+        old_lines = ["def func():\n", '    """Old."""\n', "    return\n"] * n_funcs
+        ranges = [[3 * i + 1, 3 * i + 2] for i in range(n_funcs)]
+        lines = ['    """New."""\n'] * n_funcs
+        start = time.perf_counter()
+        new_lines = apply_diff(ranges, lines, old_lines)
+        duration = time.perf_counter() - start
+        check.equal(len(new_lines), len(old_lines))
+        check.equal(new_lines[-2], '    """New."""\n')
+        return duration
+
+    # Best of 3 runs to be robust to the noise
+    duration_small = min(run_apply_diff(2_000) for _ in range(3))
+    duration_large = min(run_apply_diff(20_000) for _ in range(3))
+    # 10 times more functions: 10 times longer if linear, 100 if quadratic
+    check.less(duration_large, 40 * duration_small)
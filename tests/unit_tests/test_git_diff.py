@@ -0,0 +1,150 @@
+"""Test the processing of the files and lines changed in git."""
+
+import os
+import os.path as osp
+import shutil
+import subprocess
+import sys
+from typing import List
+
+import pytest_check as check
+
+from docstripy.git_diff import get_changed_files, get_changed_lines, get_diff_args
+from docstripy.main import main
+from docstripy.write import write_files_recursive
+
+DOCSTR_CONFIG = {
+    "style": "google",
+    "max_len": 88,
+    "indent": 4,
+    "add_missing": True,
+    "include_type": True,
+}
+
+
+def git(*args: str) -> None:
+    """Run a git command in the test repository."""
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@test", *args],
+        cwd="tests/tmp/repo",
+        check=True,
+        capture_output=True,
+    )
+
+
+def make_repo() -> List[str]:
+    """Create a test repository and change the first docstring of test1.py.
+
+    Return the new lines of test1.py.
+    """
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
+    os.makedirs("tests/tmp/repo/pkg")
+    for name in ["test1", "test2"]:
+        shutil.copy(f"tests/files/{name}.py", f"tests/tmp/repo/pkg/{name}.py")
+    git("init")
+    git("add", ".")
+    git("commit", "-m", "Initial commit")
+    with open("tests/tmp/repo/pkg/test1.py", encoding="utf-8") as file:
+        lines = file.readlines()
+    lines[8] = lines[8].replace("Return factorial", "Return the factorial")
+    with open("tests/tmp/repo/pkg/test1.py", "w", encoding="utf-8") as file:
+        file.writelines(lines)
+    return lines
+
+
+def test_git_diff() -> None:
+    """Test the files and lines changed since a commit or staged."""
+    lines = make_repo()
+    # Add an untracked file
+    with open("tests/tmp/repo/pkg/new.py", "w", encoding="utf-8") as file:
+        file.write("def new(a):\n    return a\n")
+
+    check.is_none(get_diff_args("", staged=False))
+    diff_args = get_diff_args("HEAD", staged=False)
+    paths = get_changed_files("tests/tmp/repo/pkg", diff_args)  # type: ignore
+    check.equal({osp.basename(path) for path in paths}, {"test1.py", "new.py"})
+    check.equal(
+        get_changed_lines("tests/tmp/repo/pkg/test1.py", diff_args),  # type: ignore
+        [(8, 9)],
+    )
+    check.is_none(
+        get_changed_lines("tests/tmp/repo/pkg/new.py", diff_args)  # type: ignore
+    )
+    write_files_recursive(
+        "tests/tmp/repo/pkg",
+        "tests/tmp/out",
+        overwrite=False,
+        docstr_config=DOCSTR_CONFIG,
+        paths=paths,
+        diff_args=diff_args,
+    )
+    check.equal(sorted(os.listdir("tests/tmp/out")), ["new.py", "test1.py"])
+    with open("tests/tmp/out/test1.py", encoding="utf-8") as file:
+        new_lines = file.readlines()
+    # Only the changed docstring is updated
+    check.equal(new_lines[8], '    """Return the factorial of n.\n')
+    check.not_equal(new_lines[8:25], lines[8:25])
+    check.equal(new_lines[-20:], lines[-20:])
+    # Staged files
+    git("add", "pkg/new.py")
+    paths = get_changed_files(
+        "tests/tmp/repo/pkg",
+        get_diff_args("", staged=True),  # type: ignore
+    )
+    check.equal({osp.basename(path) for path in paths}, {"new.py"})
+    with check.raises(ValueError):
+        get_changed_files("tests/tmp/repo", ["unknown_ref"])
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
+
+
+def test_staged_changed_lines() -> None:
+    """Test the changed lines of a staged file that has unstaged changes."""
+    make_repo()
+    git("add", "pkg/test1.py")
+    # Unstaged lines inserted before the staged change
+    with open("tests/tmp/repo/pkg/test1.py", encoding="utf-8") as file:
+        lines = file.readlines()
+    with open("tests/tmp/repo/pkg/test1.py", "w", encoding="utf-8") as file:
+        file.writelines(["import os\n", "import sys\n", *lines])
+    # Lines of the working tree file (that is formatted)
+    check.equal(
+        get_changed_lines("tests/tmp/repo/pkg/test1.py", ["--cached"]),
+        [(0, 2), (10, 11)],
+    )
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
+
+
+def test_main_single_file() -> None:
+    """Test the command line on a single changed or staged file."""
+    old_argv = sys.argv.copy()
+    make_repo()
+    for i, (name, git_args, changed) in enumerate(
+        [
+            ("test1", ["--changed_since", "HEAD"], True),
+            ("test2", ["--changed_since", "HEAD"], False),
+            ("test1", ["--staged"], False),
+        ]
+    ):
+        out_path = f"tests/tmp/out{i}/{name}.py"
+        sys.argv = [
+            "docstripy",
+            f"tests/tmp/repo/pkg/{name}.py",
+            "-o",
+            out_path,
+            *git_args,
+        ]
+        main()
+        check.equal(osp.isfile(out_path), changed, f"Error with {sys.argv}")
+    git("add", "pkg/test1.py")
+    sys.argv = ["docstripy", "tests/tmp/repo/pkg/test1.py", "-w", "--staged"]
+    main()
+    with open("tests/tmp/repo/pkg/test1.py", encoding="utf-8") as file:
+        new_text = file.read()
+    with open("tests/tmp/out0/test1.py", encoding="utf-8") as file:
+        check.equal(new_text, file.read())
+    sys.argv = old_argv
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
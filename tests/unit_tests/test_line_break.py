@@ -50,3 +50,15 @@ def test_line_break() -> None:
             bytes(expected_lines[i], encoding="utf-8"),
             f"Error with line {i}",
         )
+
+
+def test_line_break_long() -> None:
+    """Test line break on short lines and on a very long line."""
+    lines = ["A short line.\n", "\n", "Another one. With two sentences.\n"]
+    check.equal(line_break(lines=lines, max_line_length=50), lines)
+    # More output lines than the recursion limit
+    words = [f"word{i}" for i in range(20_000)]
+    lines = line_break(lines=[" ".join(words) + ".\n"], max_line_length=50)
+    check.greater(len(lines), 2_000)
+    check.is_true(all(len(line) <= 51 for line in lines))
+    check.equal("".join(lines).split(), words[:-1] + [words[-1] + "."])
@@ -1,5 +1,6 @@
 """Test entry points of docstripy."""
 
+import json
 import os
 import shutil
 import sys
@@ -8,8 +9,17 @@ import nbformat
 import pytest
 import pytest_check as check
 
+from docstripy import Config, cache, format_source, write
+from docstripy.cache import close_section_store, set_section_store
 from docstripy.main import main, parse_args
-from docstripy.write import write_file_ipynb, write_file_py, write_files_recursive
+from docstripy.memo import DOCSTRING_MEMO
+from docstripy.write import (
+    generate_new_file,
+    write_file_ipynb,
+    write_file_py,
+    write_file_py_stream,
+    write_files_recursive,
+)
 
 
 def test_main() -> None:
@@ -132,6 +142,457 @@ def test_errors(capfd: pytest.CaptureFixture) -> None:
     sys.argv = ["docstripy", "tests/files"]
     with pytest.raises(ValueError, match="You must specify an output path.*"):
         parse_args()
+    sys.argv = ["docstripy", "tests/files", "-w", "--lines", "1:5"]
+    with pytest.raises(ValueError, match="`--lines` requires a single .py file.*"):
+        parse_args()
+    sys.argv = ["docstripy", "tests/files/test1.py", "-w", "--lines", "5:1"]
+    with pytest.raises(SystemExit):
+        parse_args()
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
+    sys.argv = old_argv
+
+
+def test_file_errors(capfd: pytest.CaptureFixture) -> None:
+    """Test that unreadable files and invalid notebooks are reported."""
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
+    os.makedirs("tests/tmp/errors")
+    with open("tests/tmp/errors/no_cells.ipynb", "w", encoding="utf-8") as file:
+        json.dump({"metadata": {}}, file)
+    os.symlink("missing.py", "tests/tmp/errors/broken.py")
+    shutil.copy("tests/files/test1.py", "tests/tmp/errors/test1.py")
+    for jobs in (1, 2):
+        write_files_recursive(
+            "tests/tmp/errors",
+            f"tests/tmp/out{jobs}",
+            overwrite=False,
+            docstr_config={
+                "style": "numpy",
+                "max_len": 88,
+                "indent": 2,
+                "add_missing": True,
+                "include_type": True,
+            },
+            jobs=jobs,
+        )
+        out, _ = capfd.readouterr()
+        check.is_true("tests/tmp/errors/no_cells.ipynb" in out)
+        check.is_true("tests/tmp/errors/broken.py" in out)
+        check.is_true(os.path.isfile(f"tests/tmp/out{jobs}/test1.py"))
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
+
+
+def test_parallel(capfd: pytest.CaptureFixture) -> None:
+    """Test processing a directory with multiple processes."""
+    docstr_config = {
+        "style": "google",
+        "max_len": 88,
+        "indent": 4,
+        "add_missing": True,
+        "include_type": True,
+    }
     if os.path.exists("tests/tmp"):
         shutil.rmtree("tests/tmp")
+    write_files_recursive(
+        "tests/files",
+        "tests/tmp/serial",
+        overwrite=False,
+        docstr_config=docstr_config,
+    )
+    write_files_recursive(
+        "tests/files",
+        "tests/tmp/parallel",
+        overwrite=False,
+        docstr_config=docstr_config,
+        jobs=2,
+    )
+    for file_name in os.listdir("tests/tmp/serial"):
+        with open(f"tests/tmp/serial/{file_name}", encoding="utf-8") as file:
+            serial_content = file.read()
+        with open(f"tests/tmp/parallel/{file_name}", encoding="utf-8") as file:
+            parallel_content = file.read()
+        check.equal(serial_content, parallel_content, f"Error with {file_name}")
+    # Errors are reported by the main process
+    for jobs in (1, 2):
+        write_files_recursive(
+            "tests/wrong_files",
+            "tests/tmp/wrong",
+            overwrite=False,
+            docstr_config=docstr_config,
+            jobs=jobs,
+        )
+    out, _ = capfd.readouterr()
+    serial_out, parallel_out = out.split("Error when parsing file(s):\n")[1:]
+    check.is_true("tests/wrong_files/file1.py\n" in serial_out)
+    check.equal(serial_out, parallel_out)
+    old_argv = sys.argv.copy()
+    sys.argv = ["docstripy", "tests/files", "-o", "tests/tmp/auto", "-j", "auto"]
+    check.equal(parse_args()["jobs"], os.cpu_count())
+    sys.argv = ["docstripy", "tests/files", "-o", "tests/tmp/auto", "-j", "0"]
+    with pytest.raises(SystemExit):
+        parse_args()
     sys.argv = old_argv
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
+
+
+def test_cache(capfd: pytest.CaptureFixture, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test skipping the unchanged files with the cache."""
+    docstr_config = {
+        "style": "numpy",
+        "max_len": 88,
+        "indent": 4,
+        "add_missing": True,
+        "include_type": True,
+    }
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
+    os.makedirs("tests/tmp/src")
+    shutil.copyfile("tests/files/test1.py", "tests/tmp/src/test1.py")
+    for _ in range(3):
+        write_files_recursive(
+            "tests/tmp/src",
+            "",
+            overwrite=True,
+            docstr_config=docstr_config,
+            cache_dir="tests/tmp/cache",
+        )
+    out, _ = capfd.readouterr()
+    # First run formats the file, second finds it unchanged, third skips it
+    check.equal(
+        out.splitlines(),
+        [
+            "Cache: 0 hit(s), 1 miss(es).",
+            "Cache: 0 hit(s), 1 miss(es).",
+            "Cache: 1 hit(s), 0 miss(es).",
+        ],
+    )
+    # Touching the file does not invalidate the cache
+    os.utime("tests/tmp/src/test1.py", ns=(0, 0))
+    write_files_recursive(
+        "tests/tmp/src",
+        "tests/tmp/out",
+        overwrite=False,
+        docstr_config=docstr_config,
+        cache_dir="tests/tmp/cache",
+    )
+    out, _ = capfd.readouterr()
+    check.equal(out, "Cache: 1 hit(s), 0 miss(es).\n")
+    check.is_true(os.path.exists("tests/tmp/out/test1.py"))
+    # Changing the configuration invalidates the cache
+    write_files_recursive(
+        "tests/tmp/src",
+        "",
+        overwrite=True,
+        docstr_config={**docstr_config, "style": "google"},
+        cache_dir="tests/tmp/cache",
+    )
+    out, _ = capfd.readouterr()
+    check.equal(out, "Cache: 0 hit(s), 1 miss(es).\n")
+    # The stream mode and the code of docstripy also invalidate the cache
+    for stream, code_version in [
+        (False, "0.1+a"),
+        (True, "0.1+a"),
+        (True, "0.1+a"),
+        (True, "0.1+b"),
+    ]:
+        monkeypatch.setattr(cache, "get_code_version", lambda: code_version)
+        write_files_recursive(
+            "tests/tmp/src",
+            "",
+            overwrite=True,
+            docstr_config={**docstr_config, "style": "google"},
+            cache_dir="tests/tmp/cache",
+            stream=stream,
+        )
+    out, _ = capfd.readouterr()
+    check.equal(
+        out.splitlines(),
+        [
+            "Cache: 0 hit(s), 1 miss(es).",
+            "Cache: 0 hit(s), 1 miss(es).",
+            "Cache: 1 hit(s), 0 miss(es).",
+            "Cache: 0 hit(s), 1 miss(es).",
+        ],
+    )
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
+
+
+def test_section_store() -> None:
+    """Test reusing the parsed sections with another configuration."""
+    docstr_config = {
+        "style": "numpy",
+        "max_len": 88,
+        "indent": 4,
+        "add_missing": True,
+        "include_type": True,
+    }
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
+    with open("tests/files/test4.py", encoding="utf-8") as file:
+        lines = file.readlines()
+    expected = {
+        style: generate_new_file(lines, {**docstr_config, "style": style})
+        for style in ("numpy", "google", "rest")
+    }
+    DOCSTRING_MEMO.clear()
+    set_section_store("tests/tmp/cache")
+    try:
+        store = cache.SECTION_STORE
+        assert store is not None
+        for i_run, style in enumerate(("numpy", "google", "rest")):
+            new_lines = generate_new_file(lines, {**docstr_config, "style": style})
+            check.equal(new_lines, expected[style], style)
+            check.equal((store.hits, store.misses), (3 * i_run, 3))
+    finally:
+        close_section_store()
+    # The sections are kept on disk
+    set_section_store("tests/tmp/cache")
+    try:
+        store = cache.SECTION_STORE
+        assert store is not None
+        DOCSTRING_MEMO.clear()
+        generate_new_file(lines, {**docstr_config, "max_len": 60})
+        check.equal((store.hits, store.misses), (3, 0))
+    finally:
+        close_section_store()
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
+
+
+def test_multi_style() -> None:
+    """Test writing multiple styles from a single parsing."""
+    docstr_config = {
+        "style": "numpy,google,rest",
+        "max_len": 88,
+        "indent": 4,
+        "add_missing": True,
+        "include_type": True,
+    }
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
+    for jobs in (1, 2):
+        write_files_recursive(
+            "tests/files",
+            f"tests/tmp/multi{jobs}/{{style}}",
+            overwrite=False,
+            docstr_config=docstr_config,
+            jobs=jobs,
+        )
+    for style in ("numpy", "google", "rest"):
+        write_files_recursive(
+            "tests/files",
+            f"tests/tmp/{style}",
+            overwrite=False,
+            docstr_config={**docstr_config, "style": style},
+        )
+        for file_name in os.listdir(f"tests/tmp/{style}"):
+            with open(f"tests/tmp/{style}/{file_name}", encoding="utf-8") as file:
+                content = file.read()
+            for jobs in (1, 2):
+                path = f"tests/tmp/multi{jobs}/{style}/{file_name}"
+                with open(path, encoding="utf-8") as file:
+                    check.equal(file.read(), content, f"Error with {path}")
+    # Output path without "{style}" or overwriting
+    with pytest.raises(ValueError, match="The output path must contain.*"):
+        write_file_py(
+            "tests/files/test1.py",
+            "tests/tmp/test1.py",
+            overwrite=False,
+            docstr_config=docstr_config,
+        )
+    old_argv = sys.argv.copy()
+    sys.argv = ["docstripy", "tests/files", "-w", "-s", "numpy,google"]
+    with pytest.raises(ValueError, match="The output path must contain.*"):
+        parse_args()
+    sys.argv = old_argv
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
+
+
+def test_stream(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test processing the files by blocks."""
+    docstr_config = {
+        "style": "numpy,google",
+        "max_len": 88,
+        "indent": 4,
+        "add_missing": True,
+        "include_type": True,
+    }
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
+    # Small blocks to process the test files with multiple blocks
+    monkeypatch.setattr(write, "STREAM_BLOCK_LINES", 10)
+    for file_name in ("test1.py", "test2.py", "test4.py", "class.py"):
+        write_file_py(
+            f"tests/files/{file_name}",
+            f"tests/tmp/{{style}}/{file_name}",
+            overwrite=False,
+            docstr_config=docstr_config,
+        )
+        changed = write_file_py_stream(
+            f"tests/files/{file_name}",
+            f"tests/tmp/stream_{{style}}/{file_name}",
+            overwrite=False,
+            docstr_config=docstr_config,
+        )
+        check.is_true(changed)
+        for style in ("numpy", "google"):
+            with open(f"tests/tmp/{style}/{file_name}", encoding="utf-8") as file:
+                content = file.read()
+            path = f"tests/tmp/stream_{style}/{file_name}"
+            with open(path, encoding="utf-8") as file:
+                check.equal(file.read(), content, f"Error with {path}")
+    # Overwriting an unchanged file does not rewrite it
+    os.utime("tests/tmp/numpy/test1.py", ns=(0, 0))
+    changed = write_file_py_stream(
+        "tests/tmp/numpy/test1.py",
+        "",
+        overwrite=True,
+        docstr_config={**docstr_config, "style": "numpy"},
+    )
+    check.is_false(changed)
+    check.equal(os.stat("tests/tmp/numpy/test1.py").st_mtime_ns, 0)
+    # Errors do not leave temporary files
+    with pytest.raises(ValueError, match="Error found in the block.*"):
+        write_file_py_stream(
+            "tests/wrong_files/file1.py",
+            "tests/tmp/wrong/{style}/file1.py",
+            overwrite=False,
+            docstr_config=docstr_config,
+        )
+    check.equal(os.listdir("tests/tmp/wrong/numpy"), [])
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
+
+
+def test_notebook_cells() -> None:
+    """Test that only the sources of the code cells are modified."""
+    docstr_config = {
+        "style": "numpy",
+        "max_len": 88,
+        "indent": 4,
+        "add_missing": True,
+        "include_type": True,
+    }
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
+    os.makedirs("tests/tmp")
+    with open("tests/files/notebook.ipynb", encoding="utf-8") as file:
+        file_dict = json.load(file)
+    markdown_cell = {
+        "cell_type": "markdown",
+        "metadata": {},
+        "source": ["def func(x):\n", "    return x"],
+    }
+    file_dict["cells"].insert(1, markdown_cell)
+    file_dict["cells"][0]["outputs"] = [
+        {"name": "stdout", "output_type": "stream", "text": ["Hello\n"]}
+    ]
+    with open("tests/tmp/notebook.ipynb", "w", encoding="utf-8") as file:
+        json.dump(file_dict, file, indent=2)
+    for jobs in (1, 2):
+        changed = write_file_ipynb(
+            "tests/tmp/notebook.ipynb",
+            f"tests/tmp/out{jobs}.ipynb",
+            overwrite=False,
+            docstr_config=docstr_config,
+            jobs=jobs,
+        )
+        check.is_true(changed)
+    with open("tests/tmp/out1.ipynb", encoding="utf-8") as file:
+        content = file.read()
+    with open("tests/tmp/out2.ipynb", encoding="utf-8") as file:
+        check.equal(file.read(), content)
+    new_cells = json.loads(content)["cells"]
+    check.equal(new_cells[1], markdown_cell)
+    check.equal(new_cells[0]["outputs"], file_dict["cells"][0]["outputs"])
+    check.not_equal(new_cells[0]["source"], file_dict["cells"][0]["source"])
+    # Unchanged notebook: not modified (even its formatting)
+    os.utime("tests/tmp/out1.ipynb", ns=(0, 0))
+    changed = write_file_ipynb(
+        "tests/tmp/out1.ipynb", "", overwrite=True, docstr_config=docstr_config
+    )
+    check.is_false(changed)
+    check.equal(os.stat("tests/tmp/out1.ipynb").st_mtime_ns, 0)
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
+
+
+def test_write_only_changes() -> None:
+    """Test that files are only rewritten when their content changes."""
+    docstr_config = {
+        "style": "numpy",
+        "max_len": 88,
+        "indent": 4,
+        "add_missing": True,
+        "include_type": True,
+    }
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
+    os.makedirs("tests/tmp")
+    shutil.copyfile("tests/files/test1.py", "tests/tmp/test1.py")
+    os.chmod("tests/tmp/test1.py", 0o640)
+    changed = write_file_py(
+        "tests/tmp/test1.py", "", overwrite=True, docstr_config=docstr_config
+    )
+    check.is_true(changed)
+    # Permissions are kept and no temporary file is left
+    check.equal(os.stat("tests/tmp/test1.py").st_mode & 0o777, 0o640)
+    check.equal(os.listdir("tests/tmp"), ["test1.py"])
+    os.utime("tests/tmp/test1.py", ns=(0, 0))
+    changed = write_file_py(
+        "tests/tmp/test1.py", "", overwrite=True, docstr_config=docstr_config
+    )
+    check.is_false(changed)
+    check.equal(os.stat("tests/tmp/test1.py").st_mtime_ns, 0)
+    # Same for an existing output file
+    write_file_py(
+        "tests/tmp/test1.py",
+        "tests/tmp/out/test1.py",
+        overwrite=False,
+        docstr_config=docstr_config,
+    )
+    os.utime("tests/tmp/out/test1.py", ns=(0, 0))
+    write_file_py(
+        "tests/tmp/test1.py",
+        "tests/tmp/out/test1.py",
+        overwrite=False,
+        docstr_config=docstr_config,
+    )
+    check.equal(os.stat("tests/tmp/out/test1.py").st_mtime_ns, 0)
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
+
+
+def test_lines() -> None:
+    """Test updating only the docstrings overlapping ranges of lines."""
+    old_argv = sys.argv.copy()
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
+    with open("tests/files/test1.py", encoding="utf-8") as file:
+        text = file.read()
+    expected = format_source(
+        text, Config(style="google", max_len=88), lines=[(9, 10), (54, 54)]
+    )
+    for stream in (False, True):
+        sys.argv = [
+            "docstripy",
+            "tests/files/test1.py",
+            "-o",
+            "tests/tmp/test1.py",
+            "-s",
+            "google",
+            "--lines",
+            "9:10",
+            "--lines=54:54",
+        ] + (["--stream"] if stream else [])
+        main()
+        with open("tests/tmp/test1.py", encoding="utf-8") as file:
+            check.equal(file.read(), expected, f"Error with stream={stream}")
+    sys.argv = old_argv
+    if os.path.exists("tests/tmp"):
+        shutil.rmtree("tests/tmp")
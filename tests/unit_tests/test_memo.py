@@ -0,0 +1,70 @@
+"""Test in-memory cache of the built docstrings."""
+
+import pytest_check as check
+
+from docstripy.memo import DOCSTRING_MEMO, LRUMemo
+from docstripy.write import generate_new_file
+
+
+def test_lru_memo() -> None:
+    """Test eviction and counters of the LRU cache."""
+    memo = LRUMemo(max_size=2)
+    check.is_none(memo.get("a"))
+    memo.put("a", "doc a")
+    memo.put("b", "doc b")
+    check.equal(memo.get("a"), "doc a")
+    # "b" is the least recently used entry
+    memo.put("c", "doc c")
+    check.is_none(memo.get("b"))
+    check.equal(memo.get("c"), "doc c")
+    check.equal(memo.stats()["size"], 2)
+    check.equal((memo.hits, memo.misses), (2, 2))
+    check.equal(memo.hit_rate, 0.5)
+    check.greater(memo.n_bytes, 0)
+    memo.resize(1)
+    check.equal(list(memo.entries), ["c"])
+    memo.resize(0)
+    memo.put("d", "doc d")
+    check.equal((len(memo.entries), memo.n_bytes), (0, 0))
+    memo.clear()
+    check.equal(memo.hit_rate, 0.0)
+
+
+def test_generate_new_file_memo() -> None:
+    """Test that repeated docstrings are built once."""
+    docstr_config = {
+        "style": "numpy",
+        "max_len": 88,
+        "indent": 4,
+        "add_missing": True,
+        "include_type": True,
+    }
+    lines = [
+        "class A:\n",
+        "    def forward(self, x: int) -> int:\n",
+        '        """Forward.\n',
+        "\n",
+        "        Parameters\n",
+        "        ----------\n",
+        "        x : int\n",
+        "            Input.\n",
+        '        """\n',
+        "        return x\n",
+        "\n",
+    ]
+    DOCSTRING_MEMO.clear()
+    new_lines = generate_new_file(lines, docstr_config)
+    check.equal(DOCSTRING_MEMO.misses, 1)
+    new_lines_repeated = generate_new_file(lines[1:] * 3, docstr_config)
+    check.equal(new_lines_repeated, new_lines[1:] * 3)
+    check.equal((DOCSTRING_MEMO.hits, DOCSTRING_MEMO.misses), (3, 1))
+    # Other configuration: no hit
+    generate_new_file(lines, {**docstr_config, "style": "google"})
+    check.equal(DOCSTRING_MEMO.hits, 3)
+    # The cached docstrings are not modified by the next builds
+    check.equal(generate_new_file(lines, docstr_config), new_lines)
+    # Missing docstring followed by blank lines
+    new_lines = generate_new_file(
+        ["def func(a):\n", "\n", "\n", "    return a\n"], docstr_config
+    )
+    check.equal(new_lines[1], '    """Func function."""\n')
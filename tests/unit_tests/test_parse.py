@@ -2,10 +2,128 @@
 
 import pytest_check as check
 
+from docstripy.file_parser import iter_blocks, parse_ranges, parse_ranges_ast
 from docstripy.google.parse_doc import is_define_section
 from docstripy.parse_doc.main_parser import parse_docstring
 
 
+def test_parse_ranges() -> None:
+    """Test docstring and definition ranges scanner."""
+    expected_ranges = {
+        "test1": (
+            [[8, 24], [32, 33], [41, 43], [44, 47], [54, 58]],
+            [[7, 8], [31, 32], [53, 54], [61, 62]],
+        ),
+        "test2": (
+            [[8, 15], [23, 41], [49, 70], [78, 79]],
+            [[7, 8], [22, 23], [48, 49], [77, 78]],
+        ),
+        "class": ([[8, 15], [24, 31]], [[19, 20], [32, 33]]),
+    }
+    for file_name, (ranges_docstr, ranges_def) in expected_ranges.items():
+        with open(f"tests/files/{file_name}.py", encoding="utf-8") as file:
+            lines = file.readlines()
+        check.equal(parse_ranges(lines), (ranges_docstr, ranges_def), file_name)
+    # Multi-line definition, docstring containing quotes and comments,
+    # quotes in the code and last line without end of line
+    lines = [
+        'x = """Not a docstring"""\n',
+        "def func(\n",
+        "    a: int,  # Comment:\n",
+        ") -> None:\n",
+        '    r"""Title.\n',
+        "\n",
+        "    Some 'quotes' and a # sign.\n",
+        '    """  # Comment\n',
+        "    def inner():",
+    ]
+    check.equal(parse_ranges(lines), ([[4, 8]], [[1, 4], [8, 9]]))
+    check.equal(parse_ranges([]), ([], []))
+
+
+def test_parse_ranges_ast() -> None:
+    """Test AST definition and docstring ranges parser."""
+    lines = [
+        "class A:\n",
+        '    """Class A.\n',
+        "\n",
+        "    # Not a comment\n",
+        '    """\n',
+        "\n",
+        "    x = 1\n",
+        "\n",
+        "    def __init__(\n",
+        "        self, a: int = 0  # Comment:\n",
+        "    ) -> None:\n",
+        "        self.a = a\n",
+        "\n",
+        "    async def run(self):\n",
+        "        '''Run.'''\n",
+        "\n",
+        "    def one_line(self): return 1\n",
+        "\n",
+        "    def two(self): '''Two.'''\n",
+        "\n",
+        "\n",
+        "def func():\n",
+        "    'Single quotes.'\n",
+        "\n",
+        "\n",
+        "def func2(a):\n",
+        "    return a",
+    ]
+    check.equal(
+        parse_ranges_ast(lines),
+        ([[8, 11], [13, 14], [25, 26]], [[1, 5], [14, 15], [-1, -1]], []),
+    )
+    # __init__ with a docstring
+    lines[11:11] = ['        """Init."""\n']
+    check.equal(
+        parse_ranges_ast(lines),
+        ([[8, 11], [14, 15], [26, 27]], [[11, 12], [15, 16], [-1, -1]], [[1, 5]]),
+    )
+    with check.raises(ValueError):
+        parse_ranges_ast(["def func(:\n"])
+
+
+def test_iter_blocks() -> None:
+    """Test splitting lines by blocks of top-level statements."""
+    lines = [
+        "import os\n",
+        "x = '''\n",
+        "def not_a_block():\n",
+        "'''\n",
+        "y = (\n",
+        "1)\n",
+        "z = 1 + \\\n",
+        "2  # comment (\n",
+        "@decorator\n",
+        "def func():\n",
+        '    """Doc."""\n',
+        "if x:\n",
+        "    pass\n",
+        "else:\n",
+        "    pass\n",
+        "s = '('",
+    ]
+    blocks = list(iter_blocks(iter(lines), min_lines=1))
+    check.equal(
+        blocks,
+        [
+            lines[0:1],
+            lines[1:4],
+            lines[4:6],
+            lines[6:8],
+            lines[8:11],
+            lines[11:15],
+            lines[15:],
+        ],
+    )
+    blocks = list(iter_blocks(lines, min_lines=5))
+    check.equal(blocks, [lines[0:6], lines[6:11], lines[11:]])
+    check.equal(list(iter_blocks([], min_lines=1)), [])
+
+
 def test_parse_docstring() -> None:
     """Test docstring file parser."""
     with open("tests/files/test1.py", encoding="utf-8") as file:
@@ -124,6 +242,16 @@ def test_parse_docstring() -> None:
     ranges_docstr, _, to_insert = parse_docstring(lines_test5, add_missing=False)
     check.equal(ranges_docstr, [[8, 12], [16, 20]])
     check.equal(to_insert, [False, False])
+    for file_name in ["test1", "test2", "test4", "test5"]:
+        with open(f"tests/files/{file_name}.py", encoding="utf-8") as file:
+            lines = file.readlines()
+        check.equal(
+            parse_docstring(lines, engine="ast"),
+            parse_docstring(lines),
+            f"Error with file {file_name}.",
+        )
+    with check.raises(ValueError):
+        parse_docstring(lines_test5, engine="unknown")
 
 
 def test_define_google_section() -> None:
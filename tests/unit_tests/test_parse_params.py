@@ -3,7 +3,7 @@
 import pytest_check as check
 
 from docstripy.lines_routines import remove_indent
-from docstripy.parse_doc.parse_params import parse_params_all
+from docstripy.parse_doc.parse_params import extract_default_value, parse_params_all
 
 
 def test_params() -> None:
@@ -75,3 +75,19 @@ def test_params() -> None:
         },
     ]
     check.equal(params, expected_dict)
+
+
+def test_extract_default_value() -> None:
+    """Test default value extraction."""
+    lines, default = extract_default_value(["A number, by default 1.\n"])
+    check.equal((lines, default), (["A number\n", "\n"], "1"))
+    # Markers with a comma first, then last occurrence
+    lines, default = extract_default_value(
+        ["Default: 2. Use the default is 3. By default, 4.\n"]
+    )
+    check.equal(default, "4")
+    lines, default = extract_default_value(["Default: 2. Or default: 3.\n"])
+    check.equal(default, "3")
+    check.equal(lines, ["Default: 2. Or \n", "\n"])
+    lines, default = extract_default_value(["No default value.\n"])
+    check.equal((lines, default), (["No default value.\n", "\n"], ""))
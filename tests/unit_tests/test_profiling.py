@@ -0,0 +1,89 @@
+"""Test timers of the processing stages."""
+
+import pytest_check as check
+
+from docstripy import profiling
+from docstripy.memo import DOCSTRING_MEMO
+from docstripy.profiling import StageProfiler, set_profiler
+from docstripy.write import generate_new_file
+
+
+def test_stage_profiler() -> None:
+    """Test counters, slowest items and merge of the profiler."""
+    profiler = StageProfiler(n_slowest=2)
+    with profiler.stage("parse"):
+        pass
+    with profiler.stage("parse"):
+        pass
+    with profiler.file("a.py"):
+        profiler.add_docstring([1, 3], 0.5)
+        profiler.add_docstring([4, 5], 0.1)
+        profiler.add_docstring([6, 9], 0.3)
+    check.equal(profiler.stages["parse"][0], 2)
+    check.equal(profiler.current_path, "")
+    # Counters of a worker process
+    worker_profiler = StageProfiler(n_slowest=2)
+    worker_profiler.add_stage("parse", 3, 1.0)
+    worker_profiler.add_slowest(worker_profiler.files, (2.0, "b.py"))
+    profiler.merge(worker_profiler.pop())
+    check.equal(worker_profiler.stages, {})
+    report = profiler.report()
+    check.equal(report["stages"]["parse"]["calls"], 5)
+    check.equal([file["path"] for file in report["slowest_files"]], ["b.py", "a.py"])
+    check.equal(
+        [doc["lines"] for doc in report["slowest_docstrings"]], [[1, 3], [6, 9]]
+    )
+    check.is_in("Slowest docstrings:", profiler.summary())
+
+
+def test_generate_new_file_profile() -> None:
+    """Test the stages timed when generating a file."""
+    docstr_config = {
+        "style": "numpy",
+        "max_len": 88,
+        "indent": 4,
+        "add_missing": True,
+        "include_type": True,
+    }
+    lines = ["def func(a: int) -> int:\n", '    """Func."""\n', "    return a\n"]
+    DOCSTRING_MEMO.clear()
+    set_profiler(enabled=True)
+    try:
+        generate_new_file(lines, docstr_config)
+        stages = profiling.PROFILER.stages  # type: ignore
+    finally:
+        set_profiler(enabled=False)
+    for name in ["parse_ranges", "parse_all", "build_docstring", "apply_diff"]:
+        check.is_in(name, stages)
+    check.is_none(profiling.PROFILER)
+
+
+def test_trace_events() -> None:
+    """Test the Chrome trace events of the stages and files."""
+    profiler = StageProfiler(trace=True)
+    with profiler.file("dir/a.py"), profiler.stage("parse"):
+        pass
+    worker_profiler = StageProfiler(trace=True)
+    with worker_profiler.stage("build"):
+        pass
+    counters = worker_profiler.pop()
+    for event in counters["events"]:
+        event["pid"] = -1  # Another process
+    profiler.merge(counters)
+    trace = profiler.trace_events()
+    events = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    check.equal([event["name"] for event in events], ["parse", "a.py", "build"])
+    check.equal(events[1]["args"], {"path": "dir/a.py"})
+    # The file span contains the stage span
+    check.less_equal(events[1]["ts"], events[0]["ts"])
+    check.greater_equal(
+        events[1]["ts"] + events[1]["dur"], events[0]["ts"] + events[0]["dur"]
+    )
+    process_names = [
+        event["args"]["name"]
+        for event in trace["traceEvents"]
+        if event["name"] == "process_name"
+    ]
+    check.equal(process_names, ["worker -1", "main"])
+    # Not traced
+    check.is_none(StageProfiler().events)
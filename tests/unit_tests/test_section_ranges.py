@@ -3,6 +3,7 @@
 import pytest_check as check
 
 from docstripy.parse_doc.section_ranges import parse_sections_ranges
+from docstripy.write import generate_new_file
 
 
 def test_parse_section_ranges() -> None:
@@ -48,3 +49,52 @@ def test_parse_section_ranges() -> None:
     ranges, style = parse_sections_ranges(sections_nothing)
     check.equal(style, "numpy")  # default
     check.equal(ranges, {"_title": [0, 1]})
+
+    # Mixed styles: google -> rest -> numpy override order
+    sections_mixed = [
+        "Title.\n",
+        "\n",
+        "Args:\n",
+        "    x: A number.\n",
+        ":raises ValueError: Error.\n",
+        ":rtype: int\n",
+        "Returns\n",
+        "-------\n",
+        "int\n",
+        "Raises:\n",
+        "    Nothing.\n",
+    ]
+    ranges, style = parse_sections_ranges(sections_mixed)
+    check.equal(style, "numpy")
+    check.equal(
+        ranges,
+        {
+            "_title": [0, 2],
+            "_parameters": [2, 4],
+            "_raises": [4, 5],
+            "_returns": [6, 11],
+        },
+    )
+    check.equal(list(ranges), ["_title", "_parameters", "_raises", "_returns"])
+
+
+def test_wild_header_with_tab() -> None:
+    """Test wild section headers whose name is preceded by a tab."""
+    sections_numpy = ["Title.\n", "\n", "\tFoo\n", "---\n", "Some text.\n"]
+    ranges, style = parse_sections_ranges(sections_numpy)
+    check.equal(style, "numpy")
+    check.equal(ranges, {"_title": [0, 2], "Foo": [2, 5]})
+    # Indented docstring of a function (numpy wild header)
+    lines = ["def f(a):\n", '    """Title.\n', "\n", "    \tFoo\n", "    ---\n"]
+    lines += ["    Some text.\n", '    """\n']
+    new_lines = generate_new_file(
+        lines,
+        {
+            "style": "numpy",
+            "max_len": 88,
+            "indent": 4,
+            "add_missing": False,
+            "include_type": True,
+        },
+    )
+    check.equal(new_lines[3:5], ["    Foo\n", "    ---\n"])
@@ -1,8 +1,13 @@
 """Test signature line parsing."""
 
+import ast
+import random
+from typing import List
+
 import pytest_check as check
 
 from docstripy.parse_doc.parse_signature import parse_signature
+from docstripy.parse_doc.signature import find_range_matching
 
 
 def test_parse_signature() -> None:
@@ -61,3 +66,114 @@ def test_parse_signature() -> None:
         },
     ]
     check.equal(args, expected_args)
+
+
+def test_find_range_matching() -> None:
+    """Test matching of definition and docstring ranges."""
+    lines = [
+        "class A:\n",
+        '    """Class A."""\n',
+        "    x = 1\n",
+        "\n",
+        "    def __init__(self):\n",
+        "        pass\n",
+        "\n",
+        "    def method(self):\n",
+        "\n",
+        '        """Method."""\n',
+        "\n",
+        "def func():\n",
+        '    """Func."""\n',
+    ]
+    ranges_docstr = [[1, 2], [9, 10], [12, 13]]
+    corresp_ranges_docstr = find_range_matching(
+        ranges_def=[[4, 5], [7, 8], [11, 12]],
+        ranges_docstr=ranges_docstr,
+        lines=lines,
+    )
+    check.equal(corresp_ranges_docstr, [[1, 2], [9, 10], [12, 13]])
+    check.equal(ranges_docstr, [])
+    # Many functions: each function has its own docstring
+    n_funcs = 20_000
+    ranges_docstr = [[3 * i + 1, 3 * i + 2] for i in range(n_funcs)]
+    ranges_def = [[3 * i, 3 * i + 1] for i in range(n_funcs)]
+    corresp_ranges_docstr = find_range_matching(
+        ranges_def=ranges_def,
+        ranges_docstr=ranges_docstr.copy(),
+        lines=["def func():\n", '    """Func."""\n', "\n"] * n_funcs,
+    )
+    check.equal(corresp_ranges_docstr, ranges_docstr)
+
+
+def random_expr(rng: random.Random, depth: int = 0) -> str:
+    """Random python expression without colons and comments."""
+    choice = rng.randint(0, 6 if depth < 3 else 2)
+    if choice == 0:
+        return str(rng.randint(0, 100))
+    if choice == 1:
+        return rng.choice(["None", "True", "x.y", "-1.5"])
+    if choice == 2:
+        content = "".join(rng.choice("ab ,()[]{}=\"'\\") for _ in range(5))
+        return repr(content)
+    # At least 2 elements in tuples (parentheses are not part of the nodes)
+    n_elems = rng.randint(2 if choice == 3 else 1, 3)
+    elems = [random_expr(rng, depth + 1) for _ in range(n_elems)]
+    opener, closer = ["()", "[]", "{}", "f()"][choice - 3][:-1], ")]})"[choice - 3]
+    return opener + ", ".join(elems) + closer
+
+
+def random_type(rng: random.Random, depth: int = 0) -> str:
+    """Random python type annotation."""
+    if depth > 2 or rng.random() < 0.5:
+        return rng.choice(["int", "str", "List[int]", "Literal['a, b]', \"[\"]"])
+    elems = [random_type(rng, depth + 1) for _ in range(rng.randint(1, 3))]
+    return rng.choice(["Dict", "Union", "Tuple"]) + "[" + ", ".join(elems) + "]"
+
+
+def test_parse_signature_fuzz() -> None:
+    """Compare signature parsing with the abstract syntax tree."""
+    rng = random.Random(0)
+    for _ in range(300):
+        args_str: List[str] = []
+        for i_arg in range(rng.randint(0, 6)):
+            arg_str = f"arg{i_arg}"
+            if rng.random() < 0.5:
+                arg_str += ": " + random_type(rng)
+            if rng.random() < 0.5 or "=" in "".join(args_str):
+                arg_str += " = " + random_expr(rng)
+            args_str.append(arg_str)
+        return_str = random_type(rng)
+        def_line = f"def func({', '.join(args_str)}) -> {return_str}:"
+        _, rtypes, args = parse_signature([def_line + "\n"])
+        func_node = ast.parse(def_line + " pass").body[0]
+        assert isinstance(func_node, ast.FunctionDef)
+        expected_args = []
+        n_no_default = len(func_node.args.args) - len(func_node.args.defaults)
+        for i_arg, arg in enumerate(func_node.args.args):
+            default = ""
+            if i_arg >= n_no_default:
+                default_node = func_node.args.defaults[i_arg - n_no_default]
+                default = ast.get_source_segment(def_line, default_node) or ""
+            arg_type = ""
+            if arg.annotation is not None:
+                arg_type = ast.get_source_segment(def_line, arg.annotation) or ""
+            expected_args.append(
+                {
+                    "name": arg.arg,
+                    "type": arg_type,
+                    "default": default,
+                    "optional": default != "",
+                }
+            )
+        check.equal(args, expected_args, def_line)
+        returns = func_node.returns
+        if return_str.startswith("Tuple["):
+            assert isinstance(returns, ast.Subscript)
+            slice_node = returns.slice
+            if type(slice_node).__name__ == "Index":  # python 3.8
+                slice_node = slice_node.value  # type: ignore
+            elts = getattr(slice_node, "elts", [slice_node])
+            expected_rtypes = [ast.get_source_segment(def_line, elt) for elt in elts]
+        else:
+            expected_rtypes = [return_str]
+        check.equal(rtypes, expected_rtypes, def_line)
@@ -0,0 +1,50 @@
+"""Test the modules loaded by the command line interface.
+
+The import time itself is measured by `benchmarks/bench_startup.py`.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest_check as check
+
+# Modules only needed by other modes or other styles than a single file
+# formatted in google style
+LAZY_MODULES = [
+    "concurrent.futures",
+    "dataclasses",
+    "docstripy.api",
+    "docstripy.daemon",
+    "docstripy.numpy.build_doc",
+    "docstripy.rest.build_doc",
+    "docstripy.worker",
+    "http.server",
+    "importlib.metadata",
+    "nbformat",
+    "sqlite3",
+    "urllib.request",
+]
+
+
+def test_lazy_imports(tmp_path: Path) -> None:
+    """Test that formatting a .py file does not load the unused modules."""
+    out_path = tmp_path / "test1.py"
+    code = (
+        "import sys\n"
+        "from docstripy.main import main\n"
+        "sys.argv = ['docstripy', 'tests/files/test1.py', '-o', "
+        f"{str(out_path)!r}, '-s', 'google']\n"
+        "main()\n"
+        "print('\\n'.join(sys.modules))\n"
+    )
+    modules = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.splitlines()
+    check.is_in("docstripy.google.build_doc", modules)
+    check.is_true(out_path.is_file())
+    for module in LAZY_MODULES:
+        check.is_not_in(module, modules)
@@ -0,0 +1,99 @@
+"""Test the JSON-lines worker."""
+
+import io
+import json
+import time
+from typing import Any, Iterator
+
+import pytest
+import pytest_check as check
+
+from docstripy import worker
+from docstripy.api import Config, format_source
+from docstripy.worker import run_worker
+
+
+def test_run_worker() -> None:
+    """Test the responses of the worker to valid and invalid requests."""
+    with open("tests/files/test1.py", encoding="utf-8") as file:
+        text = file.read()
+    requests = [
+        {"id": 1, "path": "tests/files/test1.py", "style": "rest", "max_len": 70},
+        {"id": 2, "source": "def func(a):\n    return a\n"},
+        {"id": 3, "source": "x = 1\n", "style": "unknown"},
+        {"id": 4, "source": "x = 1\n", "path": "tests/files/test1.py"},
+        {"id": 5, "source": "x = 1\n", "unknown": 0},
+        {"id": 6, "path": "tests/files/unknown.py"},
+        {"id": 7, "source": "def func(a):\n    return a\n", "lines": [[2, 2]]},
+    ]
+    lines = [json.dumps(request) + "\n" for request in requests]
+    lines.insert(2, "not json\n")
+    lines.insert(3, "\n")
+    for jobs in [1, 2]:
+        output = io.StringIO()
+        run_worker(io.StringIO("".join(lines)), output, jobs=jobs)
+        responses = [json.loads(line) for line in output.getvalue().splitlines()]
+        check.equal(len(responses), 8)
+        responses_dict = {response["id"]: response for response in responses}
+        check.equal(
+            responses_dict[1]["source"],
+            format_source(text, Config(style="rest", max_len=70)),
+        )
+        check.is_true(responses_dict[1]["changed"])
+        check.equal(
+            responses_dict[2]["source"],
+            'def func(a):\n    """Func function."""\n    return a\n',
+        )
+        check.equal(responses_dict[None]["error"]["type"], "JSONDecodeError")
+        for i in range(3, 7):
+            check.is_false(responses_dict[i]["ok"], f"Error with request {i}.")
+        check.equal(responses_dict[6]["error"]["type"], "FileNotFoundError")
+        # Line outside the definition and its missing docstring
+        check.is_false(responses_dict[7]["changed"])
+        if jobs == 1:
+            # Responses in the order of the requests
+            check.equal([response["id"] for response in responses][:3], [1, 2, None])
+
+
+class OpenInput(io.StringIO):
+    """Input that stays open until the responses of its requests are written."""
+
+    def __init__(self, text: str, output: io.StringIO) -> None:
+        super().__init__(text)
+        self.output = output
+        self.answered = False
+
+    def __iter__(self) -> Iterator[str]:  # type: ignore
+        """Yield the request lines, then wait for their responses."""
+        lines = self.getvalue().splitlines(keepends=True)
+        yield from lines
+        deadline = time.monotonic() + 10
+        while not self.answered and time.monotonic() < deadline:
+            self.answered = len(self.output.getvalue().splitlines()) == len(lines)
+            time.sleep(0.01)
+
+
+def test_open_input() -> None:
+    """Test that the responses are written while the input is still open."""
+    requests = [{"id": i, "source": "def func(a):\n    return a\n"} for i in range(2)]
+    output = io.StringIO()
+    input_ = OpenInput("".join(json.dumps(req) + "\n" for req in requests), output)
+    run_worker(input_, output, jobs=2)
+    check.is_true(input_.answered)
+    responses = [json.loads(line) for line in output.getvalue().splitlines()]
+    check.equal(sorted(response["id"] for response in responses), [0, 1])
+
+
+def test_unexpected_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that an unexpected error is returned and the worker keeps running."""
+
+    def fail(_text: str, _config: Config, **_kwargs: Any) -> str:
+        raise KeyError("unexpected")
+
+    monkeypatch.setattr(worker, "format_source", fail)
+    lines = [json.dumps({"id": i, "source": "x = 1\n"}) + "\n" for i in range(2)]
+    output = io.StringIO()
+    run_worker(io.StringIO("".join(lines)), output, jobs=1)
+    responses = [json.loads(line) for line in output.getvalue().splitlines()]
+    check.equal([response["id"] for response in responses], [0, 1])
+    check.equal(responses[0]["error"], {"type": "KeyError", "message": "'unexpected'"})